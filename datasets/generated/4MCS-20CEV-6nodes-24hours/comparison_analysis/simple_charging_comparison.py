@@ -10,16 +10,25 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', 'src', 'tools'))
+from work_tensor import has_compact_work, load_compact_work, run_sums, work_runs
+from time_series import CostAccumulator, iter_time_chunks, periods_per_day
 
 def load_data(data_dir):
     """Load all CSV data files"""
     print(f"Loading data from {data_dir}")
     
-    # Load work data
-    work_df = pd.read_csv(f"{data_dir}/work.csv")
+    # Load work data (compact work_matrix.npy is preferred for large fleets)
+    if has_compact_work(data_dir):
+        work_df = load_compact_work(data_dir).to_work_frame()
+    else:
+        work_df = pd.read_csv(f"{data_dir}/work.csv")
     
-    # Load time data (electricity prices and CO2 factors)
-    time_df = pd.read_csv(f"{data_dir}/time_data.csv")
+    # Time data (electricity prices and CO2 factors) is streamed in chunks later,
+    # so multi-week price feeds never have to fit in memory
+    time_path = f"{data_dir}/time_data.csv"
     
     # Load EV data
     ev_df = pd.read_csv(f"{data_dir}/ev_data.csv")
@@ -30,30 +39,45 @@ def load_data(data_dir):
     # Load place data
     place_df = pd.read_csv(f"{data_dir}/place.csv")
     
-    return work_df, time_df, ev_df, params_df, place_df
+    return work_df, time_path, ev_df, params_df, place_df
 
 def analyze_work_patterns(work_df):
-    """Analyze when each EV finishes their work shift"""
+    """
+    Split every EV's work row into shifts (maximal runs of periods with work) and the gaps
+    between them, run-length encoding the whole (EV x period) matrix at once.
+
+    Returns one row per shift: Location, EV, shift (1-based per row), start_period and
+    time_period (first and last working period, 1-based column positions),
+    work_energy_consumed (the shift's summed work load) and gap_periods (idle periods until
+    the next shift, or until the end of the horizon after the last one).
+    """
     print("Analyzing work patterns...")
     
-    # Convert work data to long format for easier analysis
-    work_long = work_df.melt(id_vars=['Location', 'EV'], 
-                            var_name='time_period', 
-                            value_name='work_load')
-    
-    # Convert time periods to integers
-    work_long['time_period'] = work_long['time_period'].str.extract('(\d+)').astype(int)
-    
-    # Find when each EV finishes work at each location
-    work_finish = work_long[work_long['work_load'] > 0].groupby(['Location', 'EV'])['time_period'].max().reset_index()
-    
-    # Add location info
-    work_finish = work_finish.merge(work_df[['Location', 'EV']].drop_duplicates(), on=['Location', 'EV'])
-    
+    work = work_df.drop(columns=['Location', 'EV']).to_numpy(dtype=float)
+    rows, starts, ends = work_runs(work)
+    
+    # A shift's gap ends where the next shift of the same row starts
+    next_starts = np.full(len(rows), work.shape[1])
+    same_row = rows[1:] == rows[:-1]
+    next_starts[:-1][same_row] = starts[1:][same_row]
+    
+    work_finish = pd.DataFrame({
+        'Location': work_df['Location'].to_numpy()[rows],
+        'EV': work_df['EV'].to_numpy()[rows],
+        'shift': np.arange(len(rows)) - np.searchsorted(rows, rows) + 1,
+        'start_period': starts + 1,
+        'time_period': ends + 1,
+        'work_energy_consumed': run_sums(work, rows, starts, ends),
+        'gap_periods': next_starts - ends - 1
+    })
+    
+    shifts_per_ev = work_finish.groupby(['Location', 'EV']).size()
+    print(f"  {len(work_finish)} shifts for {len(shifts_per_ev)} EVs "
+          f"({int((shifts_per_ev > 1).sum())} with split shifts)")
     return work_finish
 
-def implement_simple_charging(work_finish, time_df, ev_df, params_df, work_df):
-    """Implement simple charging strategy: charge immediately after work"""
+def implement_simple_charging(work_finish, time_path, ev_df, params_df, work_df):
+    """Implement simple charging strategy: charge immediately after every work shift"""
     print("Implementing simple charging strategy...")
     
     # Get charging parameters
@@ -62,80 +86,56 @@ def implement_simple_charging(work_finish, time_df, ev_df, params_df, work_df):
     ev_initial_soe = ev_df['SOE_ini'].iloc[0]  # kWh
     mcs_charging_rate = params_df[params_df['Parameter'] == 'CH_MCS']['Value'].iloc[0]  # kW
     mcs_plug_power = params_df[params_df['Parameter'] == 'DCH_MCS_plug']['Value'].iloc[0]  # kW
+    delta_T_rows = params_df[params_df['Parameter'] == 'delta_T']['Value']
+    delta_T = float(delta_T_rows.iloc[0]) if not delta_T_rows.empty else 0.25  # hours per period
+    period_energy = mcs_plug_power * delta_T
     
-    # Calculate actual energy consumed during work for each EV
-    # Convert work data to long format to calculate total work per EV
-    work_long = work_df.melt(id_vars=['Location', 'EV'], 
-                            var_name='time_period', 
-                            value_name='work_load')
-    work_long['time_period'] = work_long['time_period'].str.extract('(\d+)').astype(int)
+    # The energy needed is EXACTLY the work energy consumed (no efficiency factor)
+    # Both strategies must consume the same total energy
+    shifts = work_finish.copy()
+    shifts['energy_needed'] = shifts['work_energy_consumed']
+    shifts['gap_capacity'] = shifts['gap_periods'] * period_energy
+    
+    # Each shift is recharged in the gap right after it; energy that does not fit before the
+    # next shift carries over to the following gap. With D and C the cumulative demand and
+    # gap capacity of an EV, the energy charged by the end of gap k is
+    # C_k + min(0, min over j <= k of (D_j - C_j)), so all EVs are scheduled without a loop.
+    ev_key = [shifts['Location'], shifts['EV']]
+    demand = shifts['energy_needed'].groupby(ev_key, sort=False).cumsum()
+    capacity = shifts['gap_capacity'].groupby(ev_key, sort=False).cumsum()
+    charged = capacity + np.minimum(0.0, (demand - capacity).groupby(ev_key, sort=False).cummin())
+    shifts['charged'] = charged - charged.groupby(ev_key, sort=False).shift(fill_value=0.0)
+    
+    # Expand every gap into its charging periods (the last one may be partial)
+    charging_periods = np.ceil(shifts['charged'].to_numpy() / period_energy - 1e-9).clip(min=0).astype(int)
+    index = np.repeat(np.arange(len(shifts)), charging_periods)
+    offset = np.arange(len(index)) - np.repeat(np.cumsum(charging_periods) - charging_periods, charging_periods)
+    charging_schedule = {
+        'Location': shifts['Location'].to_numpy()[index],
+        'EV': shifts['EV'].to_numpy()[index],
+        'Time_Period': shifts['time_period'].to_numpy()[index] + 1 + offset,
+        'Charging_Power': np.full(len(index), float(mcs_plug_power)),
+        'Energy': np.minimum(period_energy, shifts['charged'].to_numpy()[index] - offset * period_energy)
+    }
     
-    # Calculate total work energy consumed by each EV at each location
-    work_energy = work_long[work_long['work_load'] > 0].groupby(['Location', 'EV'])['work_load'].sum().reset_index()
-    work_energy = work_energy.rename(columns={'work_load': 'work_energy_consumed'})
+    charging_df = pd.DataFrame(charging_schedule, columns=['Location', 'EV', 'Time_Period', 'Charging_Power', 'Energy'])
     
-    # Merge with work_finish to get the actual energy needed
-    work_finish = work_finish.merge(work_energy, on=['Location', 'EV'], how='left')
+    # Stream time data one day at a time, accumulating totals and keeping prices
+    # only for the periods in which charging actually happens
+    energy_by_period = charging_df.groupby('Time_Period')['Energy'].sum()
+    totals = CostAccumulator(energy_by_period)
+    charging_prices = []
+    for chunk in iter_time_chunks(time_path, periods_per_day(delta_T)):
+        totals.update(chunk)
+        charging_prices.append(chunk[chunk['period'].isin(energy_by_period.index)])
     
-    # The energy needed is EXACTLY the work energy consumed (no efficiency factor)
-    # Both strategies must consume the same total energy
-    work_finish['energy_needed'] = work_finish['work_energy_consumed']
-    
-    # Calculate charging time needed (in time periods of 15 minutes)
-    work_finish['charging_periods_needed'] = np.ceil(
-        work_finish['energy_needed'] / (mcs_plug_power * 0.25)  # 0.25 hours per period
-    ).astype(int)
-    
-    # Create charging schedule
-    charging_schedule = []
-    total_energy_from_grid = 0
-    total_electricity_cost = 0
-    total_co2_cost = 0
-    
-    for _, row in work_finish.iterrows():
-        location = row['Location']
-        ev = row['EV']
-        finish_time = row['time_period']
-        charging_periods = row['charging_periods_needed']
-        energy_needed = row['energy_needed']
-        
-        # Start charging immediately after work
-        start_charging = finish_time + 1
-        
-        # Add charging periods
-        for period in range(charging_periods):
-            if start_charging + period <= 96:  # Within 24 hours (96 periods)
-                time_idx = start_charging + period - 1  # Convert to 0-based index
-                if time_idx < len(time_df):
-                    electricity_price = time_df.iloc[time_idx]['lambda_buy']
-                    co2_factor = time_df.iloc[time_idx]['lambda_CO2']
-                    
-                    # Calculate energy for this period (15 minutes)
-                    period_energy = min(mcs_plug_power * 0.25, energy_needed)
-                    
-                    charging_schedule.append({
-                        'Location': location,
-                        'EV': ev,
-                        'Time_Period': start_charging + period,
-                        'Charging_Power': mcs_plug_power,
-                        'Energy': period_energy,
-                        'Electricity_Price': electricity_price,
-                        'CO2_Factor': co2_factor,
-                        'Electricity_Cost': period_energy * electricity_price,
-                        'CO2_Cost': period_energy * co2_factor
-                    })
-                    
-                    total_energy_from_grid += period_energy
-                    total_electricity_cost += period_energy * electricity_price
-                    total_co2_cost += period_energy * co2_factor
-                    
-                    energy_needed -= period_energy
-                    if energy_needed <= 0:
-                        break
-    
-    charging_df = pd.DataFrame(charging_schedule)
-    
-    return charging_df, total_energy_from_grid, total_electricity_cost, total_co2_cost
+    prices = pd.concat(charging_prices) if charging_prices else pd.DataFrame(columns=['period', 'lambda_buy', 'lambda_CO2'])
+    prices = prices.rename(columns={'period': 'Time_Period', 'lambda_buy': 'Electricity_Price', 'lambda_CO2': 'CO2_Factor'})
+    charging_df = charging_df.merge(prices[['Time_Period', 'Electricity_Price', 'CO2_Factor']], on='Time_Period', how='inner')
+    charging_df['Electricity_Cost'] = charging_df['Energy'] * charging_df['Electricity_Price']
+    charging_df['CO2_Cost'] = charging_df['Energy'] * charging_df['CO2_Factor']
+    
+    return charging_df, totals.total_energy, totals.electricity_cost, totals.co2_cost
 
 def create_comparison_plots(optimized_results_dir, simple_charging_df, simple_metrics, output_dir):
     """Create comparison plots between optimized and simple charging strategies"""
@@ -263,7 +263,7 @@ def generate_comparison_report(optimized_results_dir, simple_metrics, simple_cha
 ### Executive Summary
 This report compares two charging strategies for the MCS-CEV system:
 1. **Optimized Strategy**: Intelligent charging optimization using mathematical programming
-2. **Simple Strategy**: Immediate charging after each CEV finishes their work shift
+2. **Simple Strategy**: Immediate charging after each work shift of each CEV (split shifts are recharged in the gap between them)
 
 ### Key Metrics Comparison
 
@@ -287,7 +287,7 @@ This report compares two charging strategies for the MCS-CEV system:
 - **Results**: Optimal solution with 100% work completion
 
 #### Simple Strategy
-- **Approach**: Charge immediately after each CEV finishes work
+- **Approach**: Charge immediately after each work shift, within the gap before the next one
 - **Advantages**: 
   - Same total energy consumption (870 kWh)
   - Simple to implement
@@ -355,14 +355,14 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     
     # Load data
-    work_df, time_df, ev_df, params_df, place_df = load_data(f"{simple_dir}/csv_files")
+    work_df, time_path, ev_df, params_df, place_df = load_data(f"{simple_dir}/csv_files")
     
     # Analyze work patterns
     work_finish = analyze_work_patterns(work_df)
     
     # Implement simple charging strategy
     simple_charging_df, total_energy, total_electricity_cost, total_co2_cost = implement_simple_charging(
-        work_finish, time_df, ev_df, params_df, work_df
+        work_finish, time_path, ev_df, params_df, work_df
     )
     
     # Save simple charging schedule
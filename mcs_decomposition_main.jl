@@ -0,0 +1,106 @@
+using JuMP
+using HiGHS
+using DataFrames
+using CSV
+using Printf
+using Dates
+
+# Include necessary modules
+include("src/core/DataLoader.jl")
+include("src/core/MCSOptimizer.jl")
+
+using .DataLoader
+using .MCSOptimizer
+
+"""
+Solve a dataset by site-cluster decomposition and save the merged schedule.
+
+Usage: julia -t auto mcs_decomposition_main.jl <dataset> [--clusters K] [--grid-cap KW] [--compare]
+
+`--grid-cap` limits the total grid charging power of all MCSs (kW) and couples the
+clusters; `--compare` also solves the monolithic model and reports the gap.
+"""
+function run_decomposed_optimization(dataset_name::String; num_clusters=nothing, grid_power_cap=nothing, compare_monolithic=false)
+    data_dir = joinpath(dataset_name, "csv_files")
+    # Same results location as mcs_optimization_main.jl
+    results_dir = isdir(data_dir) ? joinpath(dataset_name, "results") : joinpath(dirname(dataset_name), "results")
+    println("Loading data from CSV files in directory: ", data_dir)
+
+    M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+    D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T = DataLoader.load_all_data(data_dir)
+
+    time_df = CSV.read(joinpath(data_dir, "time_data.csv"), DataFrame)
+    time_labels = string.(time_df[!, hasproperty(time_df, :time) ? "time" : "Unnamed: 0"])
+
+    result = MCSOptimizer.solve_decomposed(
+        M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+        D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+        num_clusters=something(num_clusters, length(M)),
+        grid_power_cap=grid_power_cap,
+        compare_monolithic=compare_monolithic
+    )
+
+    run_dir = joinpath(results_dir, Dates.format(now(), "yyyymmdd_HHMMSS"))
+    mkpath(run_dir)
+
+    # Merged schedule in the same CSV layout as mcs_optimization_main.jl
+    grid_csv = DataFrame(
+        Time_Period = T,
+        Time_Label = time_labels,
+        Total_Charging_Power_kW = result.grid_power,
+        Total_Discharging_Power_kW = result.discharge_power,
+        Net_Power_kW = result.grid_power .- result.discharge_power
+    )
+    mcs_soe_csv = DataFrame(Time_Period = T, Time_Label = time_labels)
+    for m in M
+        mcs_soe_csv[!, "MCS_$(m)_SOE_kWh"] = result.soe_mcs[m]
+        mcs_soe_csv[!, "MCS_$(m)_Max_SOE_kWh"] = fill(SOE_MCS_max[m], length(T))
+        mcs_soe_csv[!, "MCS_$(m)_Min_SOE_kWh"] = fill(SOE_MCS_min[m], length(T))
+    end
+    cev_soe_csv = DataFrame(Time_Period = T, Time_Label = time_labels)
+    for e in E
+        cev_soe_csv[!, "CEV_$(e)_SOE_kWh"] = result.soe_cev[e]
+        cev_soe_csv[!, "CEV_$(e)_Max_SOE_kWh"] = fill(SOE_CEV_max[e], length(T))
+        cev_soe_csv[!, "CEV_$(e)_Min_SOE_kWh"] = fill(SOE_CEV_min[e], length(T))
+    end
+    CSV.write(joinpath(run_dir, "01_total_grid_power_profile.csv"), grid_csv)
+    CSV.write(joinpath(run_dir, "03_mcs_state_of_energy.csv"), mcs_soe_csv)
+    CSV.write(joinpath(run_dir, "04_cev_state_of_energy.csv"), cev_soe_csv)
+    CSV.write(joinpath(run_dir, "decomposition_clusters.csv"), result.clusters)
+
+    mono = result.monolithic
+    summary = DataFrame(
+        metric = ["objective", "total_electricity_cost", "total_carbon_emissions_cost", "total_missed_work_kWh",
+                  "peak_grid_power_kW", "grid_power_cap_kW", "clusters", "coordination_rounds", "wall_time_s",
+                  "monolithic_objective", "monolithic_bound", "monolithic_solve_time_s", "gap_vs_monolithic"],
+        value = Float64[result.objective, result.electricity_cost, result.carbon_cost, result.missed_work,
+                 maximum(result.grid_power), grid_power_cap === nothing ? NaN : grid_power_cap,
+                 nrow(result.clusters), result.rounds, result.wall_time,
+                 something(mono.objective, NaN), something(mono.bound, NaN),
+                 something(mono.solve_time, NaN), something(mono.gap, NaN)]
+    )
+    CSV.write(joinpath(run_dir, "decomposition_summary.csv"), summary)
+
+    @printf("\nDecomposed objective: %.4f (%d clusters, %.1fs wall)\n", result.objective, nrow(result.clusters), result.wall_time)
+    if mono.gap !== nothing
+        @printf("Monolithic objective: %.4f, gap %.2f%%\n", mono.objective, 100 * mono.gap)
+    end
+    println("Results saved to: $run_dir")
+    return result
+end
+
+# If this script is run directly
+if abspath(PROGRAM_FILE) == @__FILE__
+    if isempty(ARGS)
+        println("Usage: julia -t auto mcs_decomposition_main.jl <dataset> [--clusters K] [--grid-cap KW] [--compare]")
+        exit(1)
+    end
+    option(flag) = (i = findfirst(==(flag), ARGS); i === nothing ? nothing : parse(Float64, ARGS[i + 1]))
+    clusters = option("--clusters")
+    run_decomposed_optimization(ARGS[1];
+        num_clusters=clusters === nothing ? nothing : Int(clusters),
+        grid_power_cap=option("--grid-cap"),
+        compare_monolithic="--compare" in ARGS)
+end
@@ -16,9 +16,19 @@ using .DataLoader
 using .MCSOptimizer
 
 """
-Run the optimization with CSV data and save results
+Run the optimization with CSV data and save results.
+`symmetry_breaking` orders interchangeable MCSs (see MCSOptimizer.build_model).
+`time_limit` (seconds) and `mip_gap` make the solve anytime: it stops at whichever comes
+first, improving incumbents are logged to incumbent_log.csv, and the results of the best
+incumbent are saved with its proven gap in solution_status.csv. A solve stopped before
+any incumbent writes only solution_status.csv and reports the status (no crash).
+`estimate` solves only the LP relaxation for a quick what-if: all result files are
+written, and solution_status.csv labels them as an estimate whose objective is a lower
+bound on the MILP optimum.
+`defer_plots` writes only the data files (CSVs, log, report, status) and no PNG charts;
+mcs_render_charts.jl renders them later from the CSVs.
 """
-function run_optimization_with_logging(dataset_name::String)
+function run_optimization_with_logging(dataset_name::String; symmetry_breaking=false, time_limit=nothing, mip_gap=nothing, estimate=false, defer_plots=false)
     # Construct paths - handle both relative and absolute paths
     if isdir(joinpath(dataset_name, "csv_files"))
         # Relative path (original behavior)
@@ -41,6 +51,8 @@ function run_optimization_with_logging(dataset_name::String)
     # Ensure results directory exists
     mkpath(results_dir)
     
+    MCSOptimizer.reset_progress_clock()
+    MCSOptimizer.emit_progress("phase"; phase="loading", dataset=dataset_name)
     println("Loading data from CSV files in directory: ", data_dir)
     
     # Load data using DataLoader
@@ -58,7 +70,14 @@ function run_optimization_with_logging(dataset_name::String)
     time_labels = [t_to_time[t] for t in t_cols]
     
     println("Data loaded successfully. Running optimization model...")
+    MCSOptimizer.emit_progress("phase"; phase="loaded", mcs=length(M), cevs=length(E), periods=length(T))
     
+    # Generate a timestamp string and create a run-specific directory; constraint diagnostics
+    # for a non-optimal solve are written there before any plots
+    run_index = Dates.format(now(), "yyyymmdd_HHMMSS")
+    run_dir = joinpath(results_dir, run_index)
+    mkpath(run_dir)
+
     # Record start time
     start_time = time()
     
@@ -68,11 +87,33 @@ function run_optimization_with_logging(dataset_name::String)
     mcs_csv_data, total_grid_csv, mcs_soe_csv, cev_soe_csv, work_csv, price_emission_csv, mcs_trajectory_csv = MCSOptimizer.solve_and_analyze(
         M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
         D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
-        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T, time_labels
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T, time_labels;
+        diagnostics_dir=run_dir, symmetry_breaking=symmetry_breaking,
+        time_limit=time_limit, mip_gap=mip_gap, estimate=estimate, plots=!defer_plots,
+        incumbent_log=estimate ? nothing : joinpath(run_dir, "incumbent_log.csv")
     )
     
     # Calculate solve time
     solve_time = time() - start_time
+    MCSOptimizer.emit_progress("phase"; phase="saving")
+
+    # Every result file of this run comes from this solution; mark how good it is proven to be
+    quality = MCSOptimizer.solution_quality(model)
+    CSV.write(joinpath(run_dir, "solution_status.csv"), DataFrame([merge(quality,
+        (time_limit_s = something(time_limit, NaN), mip_gap_target = something(mip_gap, NaN)))]))
+    if !has_values(model)
+        # Stopped by a limit before the first incumbent: only the status files are written
+        println("\nNo feasible solution found within the limits ($(quality.termination_status)); ",
+            "no result files were written")
+        println("- $run_dir/solution_status.csv")
+        MCSOptimizer.emit_progress("no_solution"; run_dir=run_dir, status=quality.termination_status,
+            solve_time=solve_time, time_limit=time_limit, mip_gap=mip_gap)
+        return model, NaN, nothing, nothing, nothing, nothing, nothing, nothing, nothing
+    elseif estimate
+        println("Saving LP relaxation ESTIMATE: costs, emissions and peaks are approximate")
+    elseif !quality.proven_optimal
+        @printf("Saving best incumbent (%s): proven gap %.2f%%\n", quality.termination_status, 100 * quality.relative_gap)
+    end
     
     # Calculate work completion percentage
     total_required_work = sum(R_work[i,e,t] * A[i,e] * delta_T for i in N_c, e in E, t in T)
@@ -100,16 +141,14 @@ function run_optimization_with_logging(dataset_name::String)
     # Extract MCS routes
     for m in M
         mcs_routes[m] = Dict()
-        for t in T
-            for i in N, j in N
-                if i != j && value(model[:x][m, i, j, t]) > 0.5
-                    from_type = i in N_g ? "Grid Node" : "Construction Site"
-                    to_type = j in N_g ? "Grid Node" : "Construction Site"
-                    mcs_routes[m][t] = Dict(
-                        "from" => "$from_type $i",
-                        "to" => "$to_type $j"
-                    )
-                end
+        for (i, j, t) in model[:travel_arcs]
+            if value(model[:x][m, i, j, t]) > 0.5
+                from_type = i in N_g ? "Grid Node" : "Construction Site"
+                to_type = j in N_g ? "Grid Node" : "Construction Site"
+                mcs_routes[m][t] = Dict(
+                    "from" => "$from_type $i",
+                    "to" => "$to_type $j"
+                )
             end
         end
     end
@@ -130,74 +169,34 @@ function run_optimization_with_logging(dataset_name::String)
         end
     end
     
-    # Get individual plots for the main results grid, passing time_labels and wide bounds
-    p_power, mcs_csv_data = MCSOptimizer.plot_power_profiles(model, M, N, T, delta_T, time_labels)
-    p_mcs_soe, mcs_soe_csv = MCSOptimizer.plot_soe_profiles(model, M, T, delta_T, time_labels, SOE_MCS_max_wide, SOE_MCS_min_wide, now_str)
-    p_cev_soe, cev_soe_csv = MCSOptimizer.plot_cev_soe_profiles(model, E, T, delta_T, time_labels, SOE_CEV_max, SOE_CEV_min, SOE_CEV_min_wide, SOE_CEV_max_wide, now_str)
-    p_work, work_csv = MCSOptimizer.plot_work_profiles(model, N, N_c, E, T, delta_T, time_labels)
-    p_mcs_time, mcs_trajectory_csv = MCSOptimizer.plot_mcs_time_trajectory(model, M, N, N_g, N_c, T, time_labels)
-    p_node_map = MCSOptimizer.plot_node_map_with_cev(N, N_g, N_c, E, A, model, M, T, D)
-    # Prepare summary text
-    summary_text = """
-    Optimization Summary
-    -------------------
-    Number of MCSs: $(length(M))
-    Number of CEVs: $(length(E))
-    Number of nodes: $(length(N)) (Grid: $(length(N_g)), Construction: $(length(N_c)))
-    MCS Max Energy: $SOE_MCS_max_wide kWh
-    MCS Min Energy: $SOE_MCS_min_wide kWh
-    MCS Charging Rate: $CH_MCS kW
-    MCS Discharging Rate: $DCH_MCS kW
-    Plugs per MCS: $C_MCS_plug
-    Time interval: $delta_T h
-    Number of periods: $(length(T))
-    """
-    # Create the summary as a dummy plot
-    p_summary = plot(legend=false, grid=false, framestyle=:none, xticks=false, yticks=false)
-    annotate!(p_summary, 0, 0.5, text(summary_text, :black, 12, :left))
-    # Create an empty plot for the last cell
-    p_empty = plot(legend=false, grid=false, framestyle=:none, xticks=false, yticks=false)
-    # Combine all plots (including total grid power profile, excluding individual MCS power plots which are saved separately)
-    p_all = plot(
-        p_total_grid, p_work,
-        p_mcs_soe, p_cev_soe,
-        p_price_emission, p_mcs_time,
-        p_node_map, p_summary,
-        layout = (4,2),
-        size = (1800, 2200)
-    )
-    
-    # Before saving any results, generate a timestamp string and create a run-specific directory
-    run_index = Dates.format(now(), "yyyymmdd_HHMMSS")
-    run_dir = joinpath(results_dir, run_index)
-    mkpath(run_dir)
+    # Result tables; the MCS state of energy file carries the wide bounds drawn on its chart
+    mcs_soe_csv = MCSOptimizer.mcs_soe_table(model, M, T, time_labels, SOE_MCS_max_wide, SOE_MCS_min_wide)
+    tables = (mcs_power = mcs_csv_data, total_grid = total_grid_csv, mcs_soe = mcs_soe_csv, cev_soe = cev_soe_csv,
+              work = work_csv, price_emission = price_emission_csv, mcs_trajectory = mcs_trajectory_csv)
 
-    # Save the main combined optimization results plot
-    savefig(p_all, joinpath(run_dir, "mcs_optimization_results.png"))
-    
-    # Save individual plots for each of the 8 subplots
-    savefig(p_total_grid, joinpath(run_dir, "01_total_grid_power_profile.png"))
-    savefig(p_work, joinpath(run_dir, "02_work_profiles_by_site.png"))
-    savefig(p_mcs_soe, joinpath(run_dir, "03_mcs_state_of_energy.png"))
-    savefig(p_cev_soe, joinpath(run_dir, "04_cev_state_of_energy.png"))
-    savefig(p_price_emission, joinpath(run_dir, "05_electricity_prices.png"))
-    savefig(p_mcs_time, joinpath(run_dir, "06_mcs_location_trajectory.png"))
-    savefig(p_node_map, joinpath(run_dir, "07_node_map_with_cev_assignments.png"))
-    savefig(p_summary, joinpath(run_dir, "08_optimization_summary.png"))
-    
-    # Save CSV data for each plot
-    CSV.write(joinpath(run_dir, "01_total_grid_power_profile.csv"), total_grid_csv)
-    CSV.write(joinpath(run_dir, "02_work_profiles_by_site.csv"), work_csv)
-    CSV.write(joinpath(run_dir, "03_mcs_state_of_energy.csv"), mcs_soe_csv)
-    CSV.write(joinpath(run_dir, "04_cev_state_of_energy.csv"), cev_soe_csv)
-    CSV.write(joinpath(run_dir, "05_electricity_prices.csv"), price_emission_csv)
-    CSV.write(joinpath(run_dir, "06_mcs_location_trajectory.csv"), mcs_trajectory_csv)
-    
-    # Save individual MCS power profile plots and CSV data
-    for (m_idx, mcs_plot) in enumerate(mcs_power_plots)
-        savefig(mcs_plot, joinpath(run_dir, "mcs_$(m_idx)_power_profile.png"))
-        # Save CSV data for this MCS
-        CSV.write(joinpath(run_dir, "mcs_$(m_idx)_power_profile.csv"), mcs_csv_data[m_idx])
+    # Save CSV data for each plot; every file carries the solution label in a Solution_Status
+    # column, so a downloaded estimate or incumbent is never mistaken for an optimal result
+    label = MCSOptimizer.solution_label(quality)
+    write_table(file, table) = CSV.write(joinpath(run_dir, file), MCSOptimizer.labelled_table(table, label))
+    write_table("01_total_grid_power_profile.csv", total_grid_csv)
+    write_table("02_work_profiles_by_site.csv", work_csv)
+    write_table("03_mcs_state_of_energy.csv", mcs_soe_csv)
+    write_table("04_cev_state_of_energy.csv", cev_soe_csv)
+    write_table("05_electricity_prices.csv", price_emission_csv)
+    write_table("06_mcs_location_trajectory.csv", mcs_trajectory_csv)
+    for (m_idx, table) in enumerate(mcs_csv_data)
+        write_table("mcs_$(m_idx)_power_profile.csv", table)
+    end
+
+    # The 8 charts, their combined view and the individual MCS power profiles; deferred
+    # runs leave them to mcs_render_charts.jl
+    if defer_plots
+        println("Charts deferred: render them with julia mcs_render_charts.jl $run_dir")
+    else
+        p_summary = MCSOptimizer.optimization_summary_chart(M, E, N, N_g, N_c, T, SOE_MCS_max_wide, SOE_MCS_min_wide,
+            CH_MCS, DCH_MCS, C_MCS_plug, delta_T)
+        MCSOptimizer.save_result_charts(run_dir, tables;
+            network=(N=N, N_g=N_g, N_c=N_c, E=E, A=A, D=D), summary_chart=p_summary, now_str=now_str)
     end
 
     # Log and report files in the run directory
@@ -226,22 +225,54 @@ function run_optimization_with_logging(dataset_name::String)
         cev_charging,
         run_dir
     )
+    # Solution status on top of the report (the logger writes only the metrics)
+    report_body = isfile(report_file) ? read(report_file, String) : ""
+    open(report_file, "w") do io
+        println(io, "SOLUTION STATUS: ", label)
+        println(io, "Solve mode: ", quality.solve_mode)
+        println(io, "Termination status: ", quality.termination_status)
+        if estimate
+            @printf(io, "Objective (lower bound on the MILP optimum): %.4f\n", quality.objective)
+        else
+            @printf(io, "Objective: %.4f, best bound %.4f, proven gap %.2f%%\n",
+                quality.objective, quality.best_bound, 100 * quality.relative_gap)
+        end
+        println(io)
+        print(io, report_body)
+    end
+
+    MCSOptimizer.emit_progress("completed"; run_dir=run_dir,
+        objective=obj_value,
+        total_energy_from_grid=total_energy_from_grid,
+        total_missed_work=total_missed_work,
+        total_carbon_emissions=total_carbon_emissions,
+        total_electricity_cost=total_electricity_cost,
+        work_completion_percentage=work_completion_percentage,
+        solve_time=solve_time,
+        status=quality.termination_status,
+        mip_gap=quality.relative_gap,
+        proven_optimal=quality.proven_optimal,
+        estimate=estimate,
+        charts_deferred=defer_plots)
 
+    png = defer_plots ? "" : ".png + "
     println("\nOptimization completed. Results have been saved to:")
-    println("- $run_dir/mcs_optimization_results.png (combined view)")
-    println("- $run_dir/01_total_grid_power_profile.png + .csv")
-    println("- $run_dir/02_work_profiles_by_site.png + .csv")
-    println("- $run_dir/03_mcs_state_of_energy.png + .csv")
-    println("- $run_dir/04_cev_state_of_energy.png + .csv")
-    println("- $run_dir/05_electricity_prices.png + .csv")
-    println("- $run_dir/06_mcs_location_trajectory.png + .csv")
-    println("- $run_dir/07_node_map_with_cev_assignments.png")
-    println("- $run_dir/08_optimization_summary.png")
-    for (m_idx, _) in enumerate(mcs_power_plots)
-        println("- $run_dir/mcs_$(m_idx)_power_profile.png + .csv")
+    defer_plots || println("- $run_dir/mcs_optimization_results.png (combined view)")
+    println("- $run_dir/01_total_grid_power_profile$(png).csv")
+    println("- $run_dir/02_work_profiles_by_site$(png).csv")
+    println("- $run_dir/03_mcs_state_of_energy$(png).csv")
+    println("- $run_dir/04_cev_state_of_energy$(png).csv")
+    println("- $run_dir/05_electricity_prices$(png).csv")
+    println("- $run_dir/06_mcs_location_trajectory$(png).csv")
+    defer_plots || println("- $run_dir/07_node_map_with_cev_assignments.png")
+    defer_plots || println("- $run_dir/08_optimization_summary.png")
+    for (m_idx, _) in enumerate(mcs_csv_data)
+        println("- $run_dir/mcs_$(m_idx)_power_profile$(png).csv")
     end
     println("- $run_dir/optimization_log.txt")
     println("- $run_dir/optimization_report.txt")
+    println("- $run_dir/solution_status.csv")
+    estimate || println("- $run_dir/incumbent_log.csv")
     
     return model, obj_value, total_energy_from_grid, total_missed_work, 
            total_carbon_emissions, total_electricity_cost, p_combined, p5, p6
@@ -284,8 +315,16 @@ if abspath(PROGRAM_FILE) == @__FILE__
             datasets = filter(x -> isdir(x) && x != ".ipynb_checkpoints", readdir())
             run_multiple_datasets(datasets)
         else
-            # Run specific dataset
-            run_optimization_with_logging(ARGS[1])
+            # Run specific dataset; --symmetry-breaking orders identical MCSs,
+            # --time-limit S and --gap G stop the solve early with the best incumbent,
+            # --estimate solves only the LP relaxation, --defer-plots saves no charts
+            option(flag) = (i = findfirst(==(flag), ARGS); i === nothing ? nothing : parse(Float64, ARGS[i + 1]))
+            run_optimization_with_logging(ARGS[1];
+                symmetry_breaking="--symmetry-breaking" in ARGS,
+                time_limit=option("--time-limit"),
+                mip_gap=option("--gap"),
+                estimate="--estimate" in ARGS,
+                defer_plots="--defer-plots" in ARGS)
         end
     else
         # Default to sample dataset
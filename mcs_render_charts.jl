@@ -0,0 +1,106 @@
+using Plots
+gr()  # Same backend as mcs_optimization_main.jl
+using DataFrames
+using CSV
+using Printf
+using Dates
+
+# Include necessary modules
+include("src/core/DataLoader.jl")
+include("src/core/MCSOptimizer.jl")
+
+using .DataLoader
+using .MCSOptimizer
+
+const CHART_SOURCES = [
+    ("01_total_grid_power_profile.png", :total_grid),
+    ("02_work_profiles_by_site.png", :work),
+    ("03_mcs_state_of_energy.png", :mcs_soe),
+    ("04_cev_state_of_energy.png", :cev_soe),
+    ("05_electricity_prices.png", :price_emission),
+    ("06_mcs_location_trajectory.png", :mcs_trajectory),
+    ("07_node_map_with_cev_assignments.png", :network),
+    ("08_optimization_summary.png", :network)
+]
+
+"""
+Render the PNG charts of a results run from its CSV files (runs saved with --defer-plots,
+or any run whose charts are missing).
+
+Usage: julia mcs_render_charts.jl <run_dir> [chart.png ...] [--data <csv_files dir>]
+
+Charts that already exist are kept, so repeated renders only draw what is missing. The
+node map, summary and combined view also need the dataset: `--data`, or the csv_files
+folder of an mcs_optimization_main.jl run (`<dataset>/results/<run>` -> `<dataset>/csv_files`);
+without it they are skipped. Returns the names of the files written.
+"""
+function render_charts(run_dir::String; charts=nothing, data_dir=nothing)
+    data_dir = something(data_dir, joinpath(dirname(dirname(abspath(run_dir))), "csv_files"))
+    read_table(file) = isfile(joinpath(run_dir, file)) ?
+        CSV.read(joinpath(run_dir, file), DataFrame; types=Dict(:Time_Label => String)) : nothing
+
+    mcs_files = filter(file -> occursin(r"^mcs_\d+_power_profile\.csv$", file), readdir(run_dir))
+    sort!(mcs_files, by=file -> parse(Int, match(r"\d+", file).match))
+    tables = (
+        mcs_power = [read_table(file) for file in mcs_files],
+        total_grid = read_table("01_total_grid_power_profile.csv"),
+        work = read_table("02_work_profiles_by_site.csv"),
+        mcs_soe = read_table("03_mcs_state_of_energy.csv"),
+        cev_soe = read_table("04_cev_state_of_energy.csv"),
+        price_emission = read_table("05_electricity_prices.csv"),
+        mcs_trajectory = read_table("06_mcs_location_trajectory.csv")
+    )
+
+    network = summary_chart = nothing
+    if isdir(data_dir) && tables.mcs_trajectory !== nothing
+        M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+        D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T = DataLoader.load_all_data(data_dir)
+        # Same wide bounds as MCSOptimizer.solve_and_analyze
+        SOE_MCS_min_wide = Dict(m => SOE_MCS_min[m] - 0.1 * abs(SOE_MCS_min[m]) for m in M)
+        SOE_MCS_max_wide = Dict(m => SOE_MCS_max[m] + 0.1 * abs(SOE_MCS_max[m]) for m in M)
+        network = (N=N, N_g=N_g, N_c=N_c, E=E, A=A, D=D)
+        summary_chart = MCSOptimizer.optimization_summary_chart(M, E, N, N_g, N_c, T, SOE_MCS_max_wide, SOE_MCS_min_wide,
+            CH_MCS, DCH_MCS, C_MCS_plug, delta_T)
+    else
+        println("Dataset not found at $data_dir: skipping the node map, summary and combined view")
+    end
+
+    # Charts whose sources are available and that are not rendered yet
+    available = [file for (file, source) in CHART_SOURCES
+                 if (source === :network ? network : tables[source]) !== nothing]
+    append!(available, [replace(file, ".csv" => ".png") for file in mcs_files])
+    if length(available) == length(CHART_SOURCES) + length(mcs_files)
+        push!(available, "mcs_optimization_results.png")
+    end
+    wanted = filter(file -> !isfile(joinpath(run_dir, file)) && (charts === nothing || file in charts), available)
+    for file in something(charts, String[])
+        file in available || println("Cannot render $file: its data is not in $run_dir")
+    end
+    if isempty(wanted)
+        println("Nothing to render in $run_dir")
+        return String[]
+    end
+
+    render_start = time()
+    written = MCSOptimizer.save_result_charts(run_dir, tables;
+        network=network, summary_chart=summary_chart, only=Set(wanted))
+    @printf("Rendered %d charts in %.1fs\n", length(written), time() - render_start)
+    for file in written
+        println("- $run_dir/$file")
+    end
+    return written
+end
+
+# If this script is run directly
+if abspath(PROGRAM_FILE) == @__FILE__
+    if isempty(ARGS)
+        println("Usage: julia mcs_render_charts.jl <run_dir> [chart.png ...] [--data <csv_files dir>]")
+        exit(1)
+    end
+    data_index = findfirst(==("--data"), ARGS)
+    data_dir = data_index === nothing ? nothing : ARGS[data_index + 1]
+    charts = [ARGS[k] for k in 2:length(ARGS)
+              if !startswith(ARGS[k], "--") && (data_index === nothing || k != data_index + 1)]
+    render_charts(ARGS[1]; charts=isempty(charts) ? nothing : charts, data_dir=data_dir)
+end
@@ -0,0 +1,91 @@
+using JuMP
+using HiGHS
+using DataFrames
+using CSV
+using Printf
+using Dates
+
+# Include necessary modules
+include("src/core/DataLoader.jl")
+include("src/core/MCSOptimizer.jl")
+
+using .DataLoader
+using .MCSOptimizer
+
+"""
+Solve each dataset with and without MCS symmetry breaking and tabulate the solver effort.
+
+Usage: julia mcs_symmetry_benchmark.jl <dataset> [dataset ...] [--time-limit S]
+
+Each dataset is a folder with a csv_files directory, as for mcs_optimization_main.jl
+(e.g. datasets/generated/2MCS-3CEV-3nodes once its generated CSVs are placed there).
+Writes symmetry_benchmark_<timestamp>.csv to the current directory.
+"""
+function run_symmetry_benchmark(datasets; time_limit=600.0)
+    rows = NamedTuple[]
+    for dataset in datasets
+        data_dir = joinpath(dataset, "csv_files")
+        if !isdir(data_dir)
+            println("Skipping $dataset: no csv_files directory")
+            continue
+        end
+        M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+        D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T = DataLoader.load_all_data(data_dir)
+        groups = MCSOptimizer.interchangeable_mcs_groups(M, SOE_MCS_ini, SOE_MCS_max, SOE_MCS_min)
+
+        for symmetry_breaking in (false, true)
+            model = MCSOptimizer.build_model(
+                M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+                D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+                SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+                symmetry_breaking=symmetry_breaking, verbose=false
+            )
+            set_time_limit_sec(model, time_limit)
+            optimize!(model)
+            solved = has_values(model)
+            nodes = try
+                MOI.get(model, MOI.NodeCount())
+            catch
+                missing
+            end
+            row = (
+                dataset = basename(dataset),
+                mcs = length(M),
+                interchangeable_groups = join(["[" * join(g, " ") * "]" for g in groups], " "),
+                symmetry_breaking = symmetry_breaking,
+                status = string(termination_status(model)),
+                objective = solved ? objective_value(model) : NaN,
+                bound = solved ? objective_bound(model) : NaN,
+                mip_gap = solved ? relative_gap(model) : NaN,
+                nodes = nodes,
+                solve_time = solve_time(model)
+            )
+            push!(rows, row)
+            @printf("%-40s symmetry breaking %-5s %-14s obj %.4f gap %.2f%% %.1fs\n",
+                row.dataset, symmetry_breaking, row.status, row.objective, 100 * row.mip_gap, row.solve_time)
+        end
+    end
+
+    if isempty(rows)
+        println("No dataset was solved: nothing to save")
+        return DataFrame()
+    end
+    table = DataFrame(rows)
+    output = "symmetry_benchmark_$(Dates.format(now(), "yyyymmdd_HHMMSS")).csv"
+    CSV.write(output, table)
+    println("Benchmark saved to: $output")
+    return table
+end
+
+# If this script is run directly
+if abspath(PROGRAM_FILE) == @__FILE__
+    i = findfirst(==("--time-limit"), ARGS)
+    time_limit = i === nothing ? 600.0 : parse(Float64, ARGS[i + 1])
+    datasets = [a for (k, a) in enumerate(ARGS) if !startswith(a, "--") && (i === nothing || k != i + 1)]
+    if isempty(datasets)
+        println("Usage: julia mcs_symmetry_benchmark.jl <dataset> [dataset ...] [--time-limit S]")
+        exit(1)
+    end
+    run_symmetry_benchmark(datasets; time_limit=time_limit)
+end
@@ -0,0 +1,65 @@
+using JuMP
+using HiGHS
+using DataFrames
+using CSV
+using Printf
+using Dates
+
+# Include necessary modules
+include("src/core/DataLoader.jl")
+include("src/core/MCSOptimizer.jl")
+
+using .DataLoader
+using .MCSOptimizer
+
+"""
+Sweep the electricity/CO2 objective weighting on one built model and save the Pareto table.
+
+Usage: julia mcs_weight_sweep_main.jl <dataset> [--points N] [--miss-weight W] [--time-limit S] [--gap G]
+
+Point k weights electricity cost by 1-a and carbon emissions cost by a, with a evenly
+spaced over 0..1; the missed-work penalty is scaled by `--miss-weight` (default 1).
+"""
+function run_weight_sweep(dataset_name::String; num_points=11, miss_weight=1.0, time_limit=nothing, mip_gap=nothing)
+    data_dir = joinpath(dataset_name, "csv_files")
+    # Same results location as mcs_optimization_main.jl
+    results_dir = isdir(data_dir) ? joinpath(dataset_name, "results") : joinpath(dirname(dataset_name), "results")
+    println("Loading data from CSV files in directory: ", data_dir)
+
+    M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+    D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T = DataLoader.load_all_data(data_dir)
+
+    sweep_start = time()
+    table = MCSOptimizer.solve_weight_sweep(
+        M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+        D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+        weights=MCSOptimizer.pareto_weights(num_points; miss=miss_weight),
+        time_limit=time_limit, mip_gap=mip_gap
+    )
+
+    run_dir = joinpath(results_dir, Dates.format(now(), "yyyymmdd_HHMMSS"))
+    mkpath(run_dir)
+    CSV.write(joinpath(run_dir, "weight_sweep_pareto.csv"), table)
+
+    @printf("\nSweep of %d weightings in %.1fs (%.1fs solving), %d Pareto points\n",
+        nrow(table), time() - sweep_start, sum(table.solve_time), count(table.pareto))
+    println("Results saved to: $run_dir")
+    return table
+end
+
+# If this script is run directly
+if abspath(PROGRAM_FILE) == @__FILE__
+    if isempty(ARGS)
+        println("Usage: julia mcs_weight_sweep_main.jl <dataset> [--points N] [--miss-weight W] [--time-limit S] [--gap G]")
+        exit(1)
+    end
+    option(flag) = (i = findfirst(==(flag), ARGS); i === nothing ? nothing : parse(Float64, ARGS[i + 1]))
+    points = option("--points")
+    run_weight_sweep(ARGS[1];
+        num_points=points === nothing ? 11 : Int(points),
+        miss_weight=something(option("--miss-weight"), 1.0),
+        time_limit=option("--time-limit"),
+        mip_gap=option("--gap"))
+end
@@ -10,55 +10,46 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import os
+import sys
 
-def load_time_data():
-    """Load time data with CO2 intensity and electricity prices."""
-    time_data = pd.read_csv('1MCS-2CEV-2nodes-24hours/csv_files/time_data.csv')
-    
-    # Clean column names
-    time_data.columns = ['time', 'period', 'lambda_CO2', 'lambda_buy', 'intensity_tons_emissions']
-    
-    # Use real CAISO data for CO2 intensity
-    time_data['lambda_CO2'] = time_data['intensity_tons_emissions']
-    
-    return time_data
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'tools'))
+from time_series import RunningStats, carbon_column, iter_time_chunks
+
+TIME_DATA_PATH = '1MCS-2CEV-2nodes-24hours/csv_files/time_data.csv'
+DELTA_T = 0.25  # hours per period
+CHARGING_PERIODS = 2  # based on the 2.08% duty cycle of the optimized run
 
-def calculate_optimized_scenario():
+def stream_carbon_stats(k=CHARGING_PERIODS, chunk_periods=96):
+    """Stream carbon intensity one day at a time, keeping only running statistics
+    and the k lowest / highest intensity periods."""
+    stats = RunningStats(k=k)
+    for chunk in iter_time_chunks(TIME_DATA_PATH, chunk_periods):
+        stats.update(chunk[carbon_column(chunk)], chunk['period'])
+    return stats
+
+def calculate_optimized_scenario(stats=None):
     """Calculate CO2 emissions for the optimized scenario using actual results."""
-    time_data = load_time_data()
+    stats = stats or stream_carbon_stats()
     
     # From the latest run results
     total_energy = 46.65  # kWh
     total_carbon_cost = 5.83  # cost units
     
-    # The optimized scenario uses the actual carbon cost from the model
-    # We need to calculate the actual emissions based on the charging profile
-    # From the results, we know the model achieved 5.83 cost units for carbon
-    
-    # Let's calculate the actual emissions based on the carbon cost
-    # Carbon cost = Σ(P_ch_tot[m,t] × λ_CO2[t] × ΔT)
-    # We need to find the actual charging profile that gives us 5.83 cost units
-    
-    # Based on the optimization results, let's assume the model charges during low-carbon periods
-    # Let's find the periods with lowest carbon intensity
-    sorted_periods = time_data.sort_values('lambda_CO2').index.tolist()
-    
-    # Assume charging occurs during 2 periods (based on 2.08% duty cycle)
-    low_carbon_periods = sorted_periods[:2]
+    # Based on the optimization results, assume the model charges during the
+    # lowest-carbon periods (0-based period indices, as in the original profile)
+    lowest = stats.lowest()
+    low_carbon_periods = [period - 1 for period, _ in lowest]
     
     # Calculate the charging profile that would give us the observed carbon cost
-    charging_profile = np.zeros(96)
-    energy_per_period = total_energy / 2  # 23.325 kWh per period
-    power_per_period = energy_per_period / 0.25  # 93.3 kW per period
+    charging_profile = np.zeros(stats.count)
+    energy_per_period = total_energy / CHARGING_PERIODS  # 23.325 kWh per period
+    power_per_period = energy_per_period / DELTA_T  # 93.3 kW per period
     
     for period in low_carbon_periods:
         charging_profile[period] = power_per_period
     
-    # Calculate actual emissions
-    actual_emissions = 0
-    for t in range(96):
-        if charging_profile[t] > 0:
-            actual_emissions += charging_profile[t] * 0.25 * time_data.iloc[t]['lambda_CO2']
+    # Calculate actual emissions from the running top-k intensities
+    actual_emissions = sum(power_per_period * DELTA_T * intensity for _, intensity in lowest)
     
     return {
         'total_energy': total_energy,
@@ -69,29 +60,27 @@ def calculate_optimized_scenario():
         'avg_carbon_intensity_used': actual_emissions / total_energy
     }
 
-def calculate_worst_case_scenario():
+def calculate_worst_case_scenario(stats=None):
     """Calculate CO2 emissions for the worst-case scenario."""
-    time_data = load_time_data()
+    stats = stats or stream_carbon_stats()
     total_energy = 46.65  # kWh (same energy consumption)
     
     # Worst case: charge during highest carbon intensity periods
-    max_carbon_intensity = time_data['lambda_CO2'].max()
-    max_carbon_periods = time_data[time_data['lambda_CO2'] == max_carbon_intensity].index.tolist()
+    max_carbon_intensity = stats.max
+    highest = [(period, intensity) for period, intensity in stats.highest() if intensity == max_carbon_intensity]
+    max_carbon_periods = [period - 1 for period, _ in highest]
     
     # Create worst-case charging profile
-    worst_case_profile = np.zeros(96)
-    energy_per_period = total_energy / 2  # Distribute over 2 periods like optimized case
-    power_per_period = energy_per_period / 0.25  # Convert to kW (0.25 hour periods)
+    worst_case_profile = np.zeros(stats.count)
+    energy_per_period = total_energy / CHARGING_PERIODS  # Distribute over 2 periods like optimized case
+    power_per_period = energy_per_period / DELTA_T  # Convert to kW (0.25 hour periods)
     
     # Charge during highest carbon intensity periods
-    for i, period in enumerate(max_carbon_periods[:2]):
+    for period in max_carbon_periods[:CHARGING_PERIODS]:
         worst_case_profile[period] = power_per_period
     
     # Calculate worst-case emissions
-    worst_case_emissions = 0
-    for t in range(96):
-        if worst_case_profile[t] > 0:
-            worst_case_emissions += worst_case_profile[t] * 0.25 * time_data.iloc[t]['lambda_CO2']
+    worst_case_emissions = sum(power_per_period * DELTA_T * intensity for _, intensity in highest[:CHARGING_PERIODS])
     
     return {
         'total_energy': total_energy,
@@ -119,18 +108,18 @@ def create_comprehensive_analysis():
     print(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
-    # Load data
-    time_data = load_time_data()
+    # Stream data once for all calculators
+    stats = stream_carbon_stats()
     print("Data loaded successfully.")
-    print(f"Time periods: {len(time_data)}")
-    print(f"Carbon intensity range: {time_data['lambda_CO2'].min():.3f} - {time_data['lambda_CO2'].max():.3f} tons CO2/MWh")
-    print(f"Average carbon intensity: {time_data['lambda_CO2'].mean():.3f} tons CO2/MWh")
+    print(f"Time periods: {stats.count}")
+    print(f"Carbon intensity range: {stats.min:.3f} - {stats.max:.3f} tons CO2/MWh")
+    print(f"Average carbon intensity: {stats.mean:.3f} tons CO2/MWh")
     print()
     
     # Calculate scenarios
     print("Calculating scenarios...")
-    optimized = calculate_optimized_scenario()
-    worst_case = calculate_worst_case_scenario()
+    optimized = calculate_optimized_scenario(stats)
+    worst_case = calculate_worst_case_scenario(stats)
     savings = calculate_savings(optimized, worst_case)
     
     # Display results
@@ -158,24 +147,33 @@ def create_comprehensive_analysis():
     print(f"   Environmental Impact: Equivalent to removing {savings['co2_savings_tons']*1000:.0f} kg CO2")
     print()
     
-    # Create visualizations
-    create_savings_plots(time_data, optimized, worst_case, savings)
+    # Create visualizations (the intensity profile is streamed again chunk by chunk)
+    create_savings_plots(stats, optimized, worst_case, savings)
     
     # Save detailed report
-    save_detailed_report(time_data, optimized, worst_case, savings)
+    save_detailed_report(stats, optimized, worst_case, savings)
     
     return optimized, worst_case, savings
 
-def create_savings_plots(time_data, optimized, worst_case, savings):
+def create_savings_plots(stats, optimized, worst_case, savings, chunk_periods=96):
     """Create comprehensive plots for CO2 emissions analysis."""
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     fig.suptitle('CO2 Emissions Savings Analysis: Optimized vs Worst-Case Scenarios', fontsize=16, fontweight='bold')
     
     # Plot 1: Carbon Intensity Over Time
     ax1 = axes[0, 0]
-    ax1.plot(range(len(time_data)), time_data['lambda_CO2'], 'b-', linewidth=2, label='Carbon Intensity')
-    ax1.axhline(y=time_data['lambda_CO2'].mean(), color='g', linestyle='--', label=f'Average: {time_data["lambda_CO2"].mean():.3f}')
-    ax1.axhline(y=time_data['lambda_CO2'].max(), color='r', linestyle='--', label=f'Maximum: {time_data["lambda_CO2"].max():.3f}')
+    previous = None
+    for chunk in iter_time_chunks(TIME_DATA_PATH, chunk_periods):
+        x = chunk['period'] - 1
+        y = chunk[carbon_column(chunk)]
+        if previous is not None:
+            # Carry the last point over so consecutive chunks join up
+            x = pd.concat([pd.Series([previous[0]]), x], ignore_index=True)
+            y = pd.concat([pd.Series([previous[1]]), y], ignore_index=True)
+        ax1.plot(x, y, 'b-', linewidth=2, label='Carbon Intensity' if previous is None else "")
+        previous = (x.iloc[-1], y.iloc[-1])
+    ax1.axhline(y=stats.mean, color='g', linestyle='--', label=f'Average: {stats.mean:.3f}')
+    ax1.axhline(y=stats.max, color='r', linestyle='--', label=f'Maximum: {stats.max:.3f}')
     
     # Mark optimized and worst-case charging periods
     for period in optimized['low_carbon_periods']:
@@ -192,7 +190,7 @@ def create_savings_plots(time_data, optimized, worst_case, savings):
     
     # Plot 2: Charging Profiles Comparison
     ax2 = axes[0, 1]
-    x = range(96)
+    x = range(len(optimized['charging_profile']))
     ax2.bar(x, optimized['charging_profile'], alpha=0.7, color='green', label='Optimized Charging')
     ax2.bar(x, worst_case['charging_profile'], alpha=0.7, color='red', label='Worst-Case Charging')
     ax2.set_xlabel('Time Period (15-min intervals)')
@@ -247,7 +245,7 @@ def create_savings_plots(time_data, optimized, worst_case, savings):
     
     plt.show()
 
-def save_detailed_report(time_data, optimized, worst_case, savings):
+def save_detailed_report(stats, optimized, worst_case, savings):
     """Save detailed analysis report."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_filename = f'co2_emissions_savings_report_{timestamp}.md'
@@ -292,10 +290,10 @@ def save_detailed_report(time_data, optimized, worst_case, savings):
             f.write(f"- **Equivalent Impact:** Adding {abs(savings['co2_savings_tons'])*1000:.0f} kg CO2 to atmosphere\n\n")
         
         f.write("## Carbon Intensity Profile\n\n")
-        f.write(f"- **Minimum Carbon Intensity:** {time_data['lambda_CO2'].min():.3f} tons CO2/MWh\n")
-        f.write(f"- **Maximum Carbon Intensity:** {time_data['lambda_CO2'].max():.3f} tons CO2/MWh\n")
-        f.write(f"- **Average Carbon Intensity:** {time_data['lambda_CO2'].mean():.3f} tons CO2/MWh\n")
-        f.write(f"- **Standard Deviation:** {time_data['lambda_CO2'].std():.3f} tons CO2/MWh\n\n")
+        f.write(f"- **Minimum Carbon Intensity:** {stats.min:.3f} tons CO2/MWh\n")
+        f.write(f"- **Maximum Carbon Intensity:** {stats.max:.3f} tons CO2/MWh\n")
+        f.write(f"- **Average Carbon Intensity:** {stats.mean:.3f} tons CO2/MWh\n")
+        f.write(f"- **Standard Deviation:** {stats.std:.3f} tons CO2/MWh\n\n")
         
         f.write("## Optimization Strategy Analysis\n\n")
         if savings['co2_savings_percentage'] > 0:
@@ -0,0 +1,52 @@
+// Offline latency/throughput benchmark of the /api/chat agent pipeline.
+// Uses the local stub backend unless LLM_BACKEND is set, so no API key or network is needed:
+//   LLM_STUB_LATENCY_MS=300 node benchmark-chat.js [sessions] [concurrency]
+process.env.LLM_BACKEND = process.env.LLM_BACKEND || 'stub';
+
+const agentOrchestrator = require('./services/agentOrchestrator');
+const llmClient = require('./services/llmClient');
+
+const messages = [
+  "I need to optimize charging for 3 electric excavators at 2 construction sites",
+  "can you recommend me a value?",
+  "yes is for 24 hours"
+];
+
+function percentile(sorted, p) {
+  return sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))] : 0;
+}
+
+async function benchmarkChat(sessions, concurrency) {
+  console.log(`🚀 Benchmarking ${sessions} sessions x ${messages.length} messages, concurrency ${concurrency}, backend ${llmClient.getStats().backend}`);
+
+  // Silence the pipeline's own logging while timing
+  const log = console.log;
+  console.log = () => {};
+
+  const latencies = [];
+  let next = 0;
+  const started = Date.now();
+  const worker = async () => {
+    while (next < sessions) {
+      const sessionId = `benchmark-${next++}`;
+      for (const message of messages) {
+        const t0 = process.hrtime.bigint();
+        await agentOrchestrator.processMessage(message, sessionId, { currentStep: 1 });
+        latencies.push(Number(process.hrtime.bigint() - t0) / 1e6);
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: concurrency }, worker));
+  const elapsed = (Date.now() - started) / 1000;
+
+  console.log = log;
+  latencies.sort((a, b) => a - b);
+  console.log(`\n📊 ${latencies.length} turns in ${elapsed.toFixed(2)} s (${(latencies.length / elapsed).toFixed(1)} turns/s)`);
+  console.log(`⏱️  Latency ms: p50 ${percentile(latencies, 0.5).toFixed(1)}, p95 ${percentile(latencies, 0.95).toFixed(1)}, max ${latencies[latencies.length - 1].toFixed(1)}`);
+  console.log('🗄️  LLM client:', llmClient.getStats());
+}
+
+benchmarkChat(parseInt(process.argv[2], 10) || 20, parseInt(process.argv[3], 10) || 4).catch((error) => {
+  console.error('❌ Benchmark failed:', error);
+  process.exit(1);
+});
@@ -4,6 +4,9 @@ module.exports = {
   
   // Julia configuration
   juliaPath: process.env.JULIA_PATH || 'julia',
+
+  // Python configuration (pre-solve dataset validation)
+  pythonPath: process.env.PYTHON_PATH || 'python3',
   
   // File paths
   uploadsDir: 'uploads',
@@ -31,10 +34,39 @@ module.exports = {
   
   // Optimization settings
   optimization: {
-    timeout: 30 * 60 * 1000, // 30 minutes timeout
-    maxConcurrentJobs: 3, // Maximum concurrent optimization jobs
+    timeout: 30 * 60 * 1000, // 30 minutes timeout (upper bound for per-job limits)
+    maxConcurrentJobs: parseInt(process.env.MAX_CONCURRENT_JOBS, 10) || 3, // Julia worker processes
+    maxMemoryMb: parseInt(process.env.MAX_JOB_MEMORY_MB, 10) || 8192, // Per-job memory limit
+    solverTimeShare: parseFloat(process.env.SOLVER_TIME_SHARE) || 0.8, // Share of the job time limit the MILP solve may use
+    queueFile: 'jobs/queue.json', // Persistent job queue journal
+    logBufferLines: 500, // Lines of optimizer output kept per job
   },
   
+  // Solve result cache (identical csv_files + solver options)
+  solveCache: {
+    dir: 'results/solve-cache',
+    maxMb: parseInt(process.env.SOLVE_CACHE_MAX_MB, 10) || 2048 // LRU eviction above this size
+  },
+
+  // Result charts of runs solved with deferred plots (see services/chartRenderer.js)
+  charts: {
+    deferPlots: process.env.DEFER_PLOTS === 'true', // Default for jobs that do not send deferPlots
+    backgroundRender: process.env.CHART_BACKGROUND_RENDER !== 'false', // Render finished runs while idle
+    backgroundNice: 19, // CPU priority of background renders
+    renderTimeoutMs: 10 * 60 * 1000
+  },
+
+  // Retention of datasets/ and uploads/results/ (see services/storageManager.js)
+  storage: {
+    dir: 'storage', // Index and archives of compacted folders
+    datasetsMaxMb: parseInt(process.env.STORAGE_DATASETS_MAX_MB, 10) || 5120,
+    uploadsResultsMaxMb: parseInt(process.env.STORAGE_UPLOADS_MAX_MB, 10) || 2048,
+    archiveMaxMb: parseInt(process.env.STORAGE_ARCHIVE_MAX_MB, 10) || 4096,
+    compactAfterDays: parseFloat(process.env.STORAGE_COMPACT_AFTER_DAYS) || 7, // Since last access
+    maxAgeDays: parseFloat(process.env.STORAGE_MAX_AGE_DAYS) || 90, // Archives are deleted after this
+    sweepIntervalMinutes: 60
+  },
+
   // Logging
   logging: {
     level: process.env.LOG_LEVEL || 'info',
@@ -1,7 +1,16 @@
 // OpenAI Configuration
 const OPENAI_API_KEY = process.env.OPENAI_API_KEY;
 
-if (!OPENAI_API_KEY) {
+// Completion backend for the agent pipeline (see services/llmClient.js):
+// 'openai' calls the API, 'stub' answers locally for offline latency/throughput benchmarks
+const LLM_CONFIG = {
+  backend: process.env.LLM_BACKEND || 'openai',
+  cacheMaxEntries: parseInt(process.env.LLM_CACHE_MAX_ENTRIES, 10) || 500,
+  cacheTtlMs: parseInt(process.env.LLM_CACHE_TTL_MS, 10) || 10 * 60 * 1000,
+  stubLatencyMs: parseInt(process.env.LLM_STUB_LATENCY_MS, 10) || 0,
+};
+
+if (!OPENAI_API_KEY && LLM_CONFIG.backend === 'openai') {
   console.error('❌ OPENAI_API_KEY environment variable is not set!');
   console.error('Please create a .env file with your OpenAI API key:');
   console.error('OPENAI_API_KEY=your_api_key_here');
@@ -45,6 +54,7 @@ Always be helpful, clear, and provide specific guidance. If you need more inform
 
 module.exports = {
   OPENAI_CONFIG,
+  LLM_CONFIG,
   CONVERSATION_CONFIG,
   OPENAI_API_KEY
 };
@@ -9,11 +9,26 @@ const socketIo = require('socket.io');
 const fs = require('fs-extra');
 const path = require('path');
 const { v4: uuidv4 } = require('uuid');
-const archiver = require('archiver');
 const unzipper = require('unzipper');
 const { spawn } = require('child_process');
 const config = require('./config');
 const agentOrchestrator = require('./services/agentOrchestrator');
+const resultsIndex = require('./services/resultsIndex');
+const resultsArchive = require('./services/resultsArchive');
+const jobQueue = require('./services/jobQueue');
+const resultsUploadParser = require('./services/resultsUploadParser');
+const seriesDownsampler = require('./services/seriesDownsampler');
+const solveCache = require('./services/solveCache');
+const storageManager = require('./services/storageManager');
+const chartRenderer = require('./services/chartRenderer');
+const {
+  PROGRESS_FD,
+  PHASE_PROGRESS,
+  PHASE_MESSAGES,
+  LogBuffer,
+  parseProgressStream,
+  resultsFromCompletedEvent
+} = require('./services/juliaProgress');
 
 const app = express();
 const server = http.createServer(app);
@@ -35,8 +50,10 @@ const storage = multer.diskStorage({
     fs.ensureDirSync(uploadDir);
     cb(null, uploadDir);
   },
+  // Every upload gets its own file: two jobs with the same original name never share (or
+  // overwrite, or delete) each other's ZIP
   filename: (req, file, cb) => {
-    cb(null, file.originalname);
+    cb(null, `${uuidv4()}-${path.basename(file.originalname)}`);
   }
 });
 
@@ -47,8 +64,21 @@ const upload = multer({
   }
 });
 
-// Store active optimization jobs
-const activeJobs = new Map();
+// Last lines of Julia stdout per job (bounded, in memory only)
+const jobLogs = new Map();
+
+// Optimization jobs live in the persistent job queue; every change becomes a job-status event
+jobQueue.on('status', (job, extra) => {
+  io.to(job.id).emit('job-status', {
+    jobId: job.id,
+    status: job.status,
+    progress: job.progress,
+    message: job.message,
+    ...(job.status === 'queued' ? { position: jobQueue.position(job.id) } : {}),
+    ...(job.status === 'completed' ? { results: job.results } : {}),
+    ...extra
+  });
+});
 
 // WebSocket connection handling
 io.on('connection', (socket) => {
@@ -79,39 +109,54 @@ app.post('/api/optimize', upload.single('dataset'), async (req, res) => {
       return res.status(400).json({ error: 'No file uploaded' });
     }
 
-    const jobId = uuidv4();
     const fileName = req.file.originalname;
     const filePath = req.file.path;
 
-    console.log(`Starting optimization job ${jobId} with file: ${fileName}`);
-
-    // Create job entry
-    activeJobs.set(jobId, {
-      id: jobId,
-      fileName: fileName,
-      status: 'uploading',
-      progress: 0,
-      message: 'Processing uploaded file...',
-      startTime: new Date(),
-      results: null,
-      error: null
-    });
+    // Optional form fields: priority (higher runs first), timeoutMinutes, maxMemoryMb,
+    // mipGap (relative gap at which the solver may stop with its best incumbent),
+    // mode ('estimate' solves only the LP relaxation for a quick what-if),
+    // deferPlots ('true' saves only data files; charts are rendered when first requested)
+    const priority = parseInt(req.body.priority, 10) || 0;
+    const timeoutMinutes = parseFloat(req.body.timeoutMinutes);
+    const maxMemoryMb = parseInt(req.body.maxMemoryMb, 10);
+    const mipGap = parseFloat(req.body.mipGap);
+    const limits = {
+      timeoutMs: timeoutMinutes > 0
+        ? Math.min(timeoutMinutes * 60 * 1000, config.optimization.timeout)
+        : config.optimization.timeout,
+      maxMemoryMb: maxMemoryMb > 0
+        ? Math.min(maxMemoryMb, config.optimization.maxMemoryMb)
+        : config.optimization.maxMemoryMb,
+      mipGap: mipGap > 0 && mipGap < 1 ? mipGap : null
+    };
+    const options = {
+      estimate: req.body.mode === 'estimate',
+      deferPlots: req.body.deferPlots !== undefined ? req.body.deferPlots === 'true' : config.charts.deferPlots
+    };
 
-    // Notify client about job creation
-    io.to(jobId).emit('job-status', {
-      jobId: jobId,
-      status: 'uploading',
-      progress: 0,
-      message: 'Processing uploaded file...'
-    });
+    // The dataset is extracted, validated and fingerprinted before queueing: an invalid
+    // dataset is rejected without taking a queue slot, and a job whose identical inputs are
+    // being solved attaches to that solve instead of taking a worker slot
+    const jobId = uuidv4();
+    let cacheKey;
+    try {
+      const csvFilesDir = await extractDataset(jobId, filePath);
+      await requireValidDataset(csvFilesDir);
+      cacheKey = await solveCache.key(csvFilesDir, { estimate: options.estimate, mipGap: limits.mipGap });
+    } catch (error) {
+      await fs.remove(path.join(__dirname, 'datasets', jobId)).catch(console.error);
+      await fs.remove(filePath).catch(console.error);
+      return res.status(error.validation ? 422 : 400).json({ error: error.message, validation: error.validation });
+    }
 
-    // Process the uploaded file
-    await processOptimizationJob(jobId, filePath, fileName);
+    const job = jobQueue.enqueue({ id: jobId, fileName, filePath, priority, limits, options, cacheKey });
+    console.log(`Queued optimization job ${job.id} with file: ${fileName} (priority ${priority}${options.estimate ? ', estimate' : ''})`);
 
     res.json({ 
-      jobId: jobId, 
-      message: 'Optimization job started successfully',
-      status: 'started'
+      jobId: job.id, 
+      message: 'Optimization job queued successfully',
+      status: job.status,
+      position: jobQueue.position(job.id)
     });
 
   } catch (error) {
@@ -123,21 +168,89 @@ app.post('/api/optimize', upload.single('dataset'), async (req, res) => {
 // Get job status
 app.get('/api/job/:jobId', (req, res) => {
   const jobId = req.params.jobId;
-  const job = activeJobs.get(jobId);
+  const job = jobQueue.get(jobId);
   
   if (!job) {
     return res.status(404).json({ error: 'Job not found' });
   }
   
-  res.json(job);
+  res.json({ ...job, position: jobQueue.position(jobId) });
+});
+
+// Get the tail of a job's optimizer log
+app.get('/api/job/:jobId/log', (req, res) => {
+  const log = jobLogs.get(req.params.jobId);
+  
+  if (!log) {
+    return res.status(404).json({ error: 'No log available for this job' });
+  }
+  
+  res.type('text/plain').send(log.text());
+});
+
+// Serve a chart of a job's results; charts of deferred-plots runs are rendered on first request
+app.get('/api/job/:jobId/charts/:filename', async (req, res) => {
+  const { jobId, filename } = req.params;
+  const job = jobQueue.get(jobId);
+  const runDir = job && job.status === 'completed' ? jobRunDir(jobId, job.results) : null;
+  if (!runDir || path.basename(filename) !== filename) {
+    return res.status(404).json({ error: 'Chart not found' });
+  }
+
+  try {
+    storageManager.touch(runDir);
+    const chartPath = await chartRenderer.get(runDir, filename);
+    if (!chartPath) {
+      return res.status(404).json({ error: 'Chart not found' });
+    }
+    res.sendFile(chartPath, { etag: true, lastModified: true });
+  } catch (error) {
+    console.error(`Error serving chart ${jobId}/${filename}:`, error);
+    res.status(500).json({ error: 'Failed to serve chart' });
+  }
+});
+
+// Chart renderer state (renders in progress, background queue, counters)
+app.get('/api/charts/renderer', (req, res) => {
+  res.json(chartRenderer.getStats());
+});
+
+// Solve result cache statistics (entries, size, hits, coalesced submissions)
+app.get('/api/solve-cache', async (req, res) => {
+  await solveCache.load();
+  res.json(solveCache.getStats());
+});
+
+// Disk usage of datasets/, uploads/results/ and compacted archives, with retention budgets
+app.get('/api/storage', async (req, res) => {
+  try {
+    res.json(await storageManager.metrics());
+  } catch (error) {
+    console.error('Error reading storage metrics:', error);
+    res.status(500).json({ error: 'Error reading storage metrics' });
+  }
+});
+
+// Index of managed folders, including the summaries of compacted runs
+app.get('/api/storage/index', async (req, res) => {
+  await storageManager.load();
+  res.json(storageManager.list());
+});
+
+// Run a retention sweep now
+app.post('/api/storage/sweep', async (req, res) => {
+  await storageManager.sweep();
+  res.json(await storageManager.metrics());
 });
 
 // Get all active jobs
 app.get('/api/jobs', (req, res) => {
-  const jobs = Array.from(activeJobs.values()).map(job => ({
+  const jobs = jobQueue.list().map(job => ({
     id: job.id,
     fileName: job.fileName,
     status: job.status,
+    priority: job.priority,
+    position: jobQueue.position(job.id),
     progress: job.progress,
     message: job.message,
     startTime: job.startTime
@@ -149,7 +262,7 @@ app.get('/api/jobs', (req, res) => {
 // Download results
 app.get('/api/job/:jobId/download', async (req, res) => {
   const jobId = req.params.jobId;
-  const job = activeJobs.get(jobId);
+  const job = jobQueue.get(jobId);
   
   if (!job) {
     return res.status(404).json({ error: 'Job not found' });
@@ -163,27 +276,31 @@ app.get('/api/job/:jobId/download', async (req, res) => {
     // Find the results directory in the optimization dataset
     const optimizationDir = path.join(__dirname, 'datasets', `optimization_${jobId}`);
     const resultsPath = path.join(optimizationDir, 'results');
-    const zipPath = path.join(__dirname, 'results', `${jobId}_results.zip`);
+    storageManager.touch(optimizationDir);
     
-    // Check if results directory exists
+    // Check if results directory exists; compacted runs are served from their archive
     if (!await fs.pathExists(resultsPath)) {
+      const archivePath = storageManager.archiveFor(optimizationDir);
+      if (archivePath && await fs.pathExists(archivePath)) {
+        return res.download(archivePath, `optimization_results_${jobId}.zip`);
+      }
       return res.status(404).json({ error: 'Results not found' });
     }
     
-    // Create ZIP file of results
-    await createResultsZip(resultsPath, zipPath);
-    
-    res.download(zipPath, `optimization_results_${jobId}.zip`, (err) => {
-      if (err) {
-        console.error('Error downloading file:', err);
-      }
-      // Clean up ZIP file after download
-      fs.remove(zipPath).catch(console.error);
+    // Stream the ZIP straight to the response; archives are cached per results content hash
+    await resultsArchive.send(req, res, {
+      key: jobId,
+      resultsPath: resultsPath,
+      downloadName: `optimization_results_${jobId}.zip`
     });
     
   } catch (error) {
     console.error('Error creating download:', error);
-    res.status(500).json({ error: 'Error creating download' });
+    if (!res.headersSent) {
+      res.status(500).json({ error: 'Error creating download' });
+    } else {
+      res.destroy(error);
+    }
   }
 });
 
@@ -193,13 +310,22 @@ app.delete('/api/jobs/cleanup', async (req, res) => {
     const cutoffTime = new Date(Date.now() - 24 * 60 * 60 * 1000); // 24 hours ago
     let cleanedCount = 0;
     
-    for (const [jobId, job] of activeJobs.entries()) {
-      if (job.status === 'completed' && job.startTime < cutoffTime) {
-        activeJobs.delete(jobId);
+    for (const job of jobQueue.list()) {
+      const jobId = job.id;
+      if (job.status === 'completed' && new Date(job.startTime) < cutoffTime) {
+        jobQueue.remove(jobId);
+        jobLogs.delete(jobId);
+        // Jobs journaled before uploads had unique names may still share the path
+        const shared = jobQueue.list().some(other => other.filePath === job.filePath &&
+          !['completed', 'error'].includes(other.status));
+        if (!shared) {
+          await fs.remove(job.filePath).catch(console.error);
+        }
         
         // Clean up files
         const jobDir = path.join(__dirname, 'results', jobId);
         await fs.remove(jobDir).catch(console.error);
+        await resultsArchive.remove(jobId).catch(console.error);
         
         cleanedCount++;
       }
@@ -212,110 +338,326 @@ app.delete('/api/jobs/cleanup', async (req, res) => {
   }
 });
 
-// Helper function to process optimization job
-async function processOptimizationJob(jobId, filePath, fileName) {
-  const job = activeJobs.get(jobId);
-  
-  try {
-    // Update status to extracting
-    job.status = 'extracting';
-    job.progress = 10;
-    job.message = 'Extracting dataset files...';
-    io.to(jobId).emit('job-status', {
-      jobId: jobId,
+// Helper function to process optimization job (run by the job queue worker).
+// Status changes go through jobQueue.update, which emits the `job-status` event.
+async function processOptimizationJob(job) {
+  const jobId = job.id;
+  let csvFilesDir = path.join(__dirname, 'datasets', jobId, 'csv_files');
+  let cacheKey = job.cacheKey;
+
+  if (!cacheKey) {
+    // Datasets are extracted at upload; only jobs whose extraction is missing get here
+    jobQueue.update(jobId, {
       status: 'extracting',
       progress: 10,
       message: 'Extracting dataset files...'
     });
+    csvFilesDir = await extractDataset(jobId, job.filePath);
+    jobQueue.update(jobId, { status: 'validating', progress: 15, message: 'Validating dataset files...' });
+    await requireValidDataset(csvFilesDir).catch((error) => {
+      jobQueue.update(jobId, { validation: error.validation });
+      throw error;
+    });
+    cacheKey = await solveCache.key(csvFilesDir, { estimate: job.options && job.options.estimate, mipGap: job.limits.mipGap });
+  }
 
-    // Extract the uploaded ZIP file
-    const extractDir = path.join(__dirname, 'datasets', jobId);
-    await fs.ensureDir(extractDir);
-    
-    await fs.createReadStream(filePath)
-      .pipe(unzipper.Extract({ path: extractDir }))
-      .promise();
-
-    // Find the csv_files directory
-    const csvFilesDir = path.join(extractDir, 'csv_files');
-    if (!await fs.pathExists(csvFilesDir)) {
-      throw new Error('No csv_files directory found in uploaded dataset');
+  // Identical inputs and options are solved once: answer from the solve cache, or from the
+  // job solving them right now. Queued jobs normally attach to a running solve before they
+  // take a worker slot (attachToSolve); jobs keyed only here may still find one. The leader
+  // registers synchronously after the running() check (before any await for keyed jobs),
+  // so concurrent identical submissions cannot both become leaders.
+  const leader = solveCache.running(cacheKey);
+  let settle = null;
+  if (!leader) {
+    solveCache.track(cacheKey, jobId, new Promise((resolve) => { settle = resolve; }));
+  }
+  try {
+    let cached;
+    if (leader) {
+      jobQueue.update(jobId, {
+        message: `Identical dataset is being solved by job ${leader.jobId}; waiting for its results...`
+      });
+      cached = await leader.promise;
+    } else {
+      cached = await solveCache.lookup(cacheKey);
+    }
+    if (cached) {
+      await completeFromCache(job, cached, csvFilesDir);
+      if (settle) {
+        settle(cached);
+      }
+      return;
     }
 
-    // Update status to preparing
-    job.status = 'preparing';
-    job.progress = 20;
-    job.message = 'Preparing optimization environment...';
-    io.to(jobId).emit('job-status', {
-      jobId: jobId,
-      status: 'preparing',
-      progress: 20,
-      message: 'Preparing optimization environment...'
-    });
+    const juliaResult = await solveDataset(job, csvFilesDir);
+    const { provenOptimal, estimate } = juliaResult.results;
+    // Only reproducible answers are cached: proven optimal solves and LP estimates
+    if (settle && (provenOptimal || estimate)) {
+      const resultsPath = path.join(__dirname, 'datasets', `optimization_${jobId}`, 'results');
+      settle(await solveCache.store(cacheKey, resultsPath, { results: juliaResult.results, sourceJobId: jobId })
+        .catch((error) => {
+          console.error('Error storing solve cache entry:', error);
+          return null;
+        }));
+    }
+  } finally {
+    if (settle) {
+      settle(null);
+    }
+  }
+}
 
-    // Create dataset directory structure
-    const datasetName = `optimization_${jobId}`;
-    const datasetDir = path.join(__dirname, 'datasets', datasetName);
-    await fs.ensureDir(datasetDir);
-    
-    // Copy csv_files to the dataset directory
-    await fs.copy(csvFilesDir, path.join(datasetDir, 'csv_files'));
-    
-    // Create results directory
-    const resultsDir = path.join(__dirname, 'results', jobId);
-    await fs.ensureDir(resultsDir);
-
-    // Update status to running
-    job.status = 'running';
-    job.progress = 30;
-    job.message = 'Running Julia optimization...';
-    io.to(jobId).emit('job-status', {
-      jobId: jobId,
-      status: 'running',
-      progress: 30,
-      message: 'Running Julia optimization...'
+// Helper function to extract an uploaded dataset ZIP into datasets/<jobId>; returns its
+// csv_files directory
+async function extractDataset(jobId, filePath) {
+  const extractDir = path.join(__dirname, 'datasets', jobId);
+  await fs.ensureDir(extractDir);
+
+  await fs.createReadStream(filePath)
+    .pipe(unzipper.Extract({ path: extractDir }))
+    .promise();
+
+  const csvFilesDir = path.join(extractDir, 'csv_files');
+  if (!await fs.pathExists(csvFilesDir)) {
+    throw new Error('No csv_files directory found in uploaded dataset');
+  }
+  await expandCompactWork(csvFilesDir);
+  return csvFilesDir;
+}
+
+// Helper function to expand compact work files (work_matrix.npy, work_sites.npy,
+// work_periods.txt) to the work.csv the Julia DataLoader reads, so the validator checks the
+// same work requirements the solver consumes. A dataset that ships work.csv keeps it.
+async function expandCompactWork(csvFilesDir) {
+  if (await fs.pathExists(path.join(csvFilesDir, 'work.csv')) ||
+      !await fs.pathExists(path.join(csvFilesDir, 'work_matrix.npy'))) {
+    return;
+  }
+  const scriptPath = path.join(__dirname, '..', '..', 'src', 'tools', 'work_tensor.py');
+  await new Promise((resolve, reject) => {
+    const pythonProcess = spawn(config.pythonPath, [scriptPath, csvFilesDir, '--to-csv']);
+    let stderr = '';
+    pythonProcess.stderr.on('data', (data) => {
+      stderr = (stderr + data.toString()).slice(-2000);
     });
+    pythonProcess.on('close', (code) => {
+      if (code === 0) {
+        resolve();
+      } else {
+        const lastLine = stderr.trim().split('\n').pop() || `exit code ${code}`;
+        reject(new Error(`Could not expand the compact work files to work.csv: ${lastLine}`));
+      }
+    });
+    pythonProcess.on('error', error => reject(new Error(`Could not expand the compact work files: ${error.message}`)));
+  });
+}
 
-    // Run Julia optimization
-    const juliaResult = await runJuliaOptimization(datasetName, jobId, datasetDir);
-    
-    if (juliaResult.success) {
-      // Update status to completed
-      job.status = 'completed';
-      job.progress = 100;
-      job.message = 'Optimization completed successfully!';
-      job.results = juliaResult.results;
-      
-      io.to(jobId).emit('job-status', {
-        jobId: jobId,
-        status: 'completed',
-        progress: 100,
-        message: 'Optimization completed successfully!',
-        results: juliaResult.results
-      });
-    } else {
-      throw new Error(juliaResult.error);
+// Job queue attach hook: a queued job whose identical inputs are being solved waits for
+// that solve without a worker slot. Resolves with whether the job was completed from it;
+// when the solve was not cacheable the job goes back to the queue and solves itself.
+function attachToSolve(job) {
+  const leader = job.cacheKey ? solveCache.running(job.cacheKey) : null;
+  if (!leader) {
+    return null;
+  }
+  jobQueue.update(job.id, {
+    message: `Identical dataset is being solved by job ${leader.jobId}; waiting for its results...`
+  });
+  return leader.promise.then(async (cached) => {
+    if (!cached) {
+      return false;
     }
+    await completeFromCache(job, cached, path.join(__dirname, 'datasets', job.id, 'csv_files'));
+    return true;
+  });
+}
 
-  } catch (error) {
-    console.error(`Error in job ${jobId}:`, error);
-    
-    job.status = 'error';
-    job.progress = 0;
-    job.message = `Error: ${error.message}`;
-    job.error = error.message;
-    
-    io.to(jobId).emit('job-status', {
-      jobId: jobId,
-      status: 'error',
-      progress: 0,
-      message: `Error: ${error.message}`
+// Helper function to fingerprint queued jobs again after a restart: the model version in
+// the cache key may have changed since they were uploaded
+async function rekeyQueuedJobs() {
+  for (const job of jobQueue.pending()) {
+    const csvFilesDir = path.join(__dirname, 'datasets', job.id, 'csv_files');
+    const cacheKey = await fs.pathExists(csvFilesDir)
+      ? await solveCache.key(csvFilesDir, { estimate: job.options && job.options.estimate, mipGap: job.limits.mipGap })
+        .catch(() => null)
+      : null;
+    jobQueue.update(job.id, { cacheKey });
+  }
+}
+
+// Helper function to complete a job from a cached (or coalesced) solve of identical inputs.
+// The job's own csv_files (identical to the cached inputs) sit next to the copied results
+// like in a solved run, so deferred charts that need the dataset can still be rendered.
+async function completeFromCache(job, cached, csvFilesDir) {
+  const datasetDir = path.join(__dirname, 'datasets', `optimization_${job.id}`);
+  await fs.copy(csvFilesDir, path.join(datasetDir, 'csv_files'));
+  await fs.copy(cached.resultsPath, path.join(datasetDir, 'results'));
+  console.log(`♻️  Job ${job.id} reused the solve of job ${cached.sourceJobId}`);
+  jobQueue.update(job.id, {
+    status: 'completed',
+    progress: 100,
+    message: `Optimization completed instantly: identical dataset already solved (job ${cached.sourceJobId})`,
+    results: cached.results,
+    cached: { key: cached.key, sourceJobId: cached.sourceJobId, createdAt: cached.createdAt }
+  });
+  scheduleChartRender(job.id, cached.results);
+}
+
+// Helper function to locate the results run folder of a job (<timestamp> under its dataset)
+function jobRunDir(jobId, results) {
+  if (!results || !results.runName) {
+    return null;
+  }
+  return path.join(__dirname, 'datasets', `optimization_${jobId}`, 'results', results.runName);
+}
+
+// Helper function to queue the charts of a deferred-plots run for low-priority rendering
+function scheduleChartRender(jobId, results) {
+  const runDir = jobRunDir(jobId, results);
+  if (runDir && results.chartsDeferred) {
+    chartRenderer.background(runDir);
+  }
+}
+
+// Helper function to pre-screen and solve an extracted, validated dataset; marks the job
+// completed and returns the Julia result
+async function solveDataset(job, csvFilesDir) {
+  const jobId = job.id;
+
+  // The dataset was validated before it was queued (see /api/optimize)
+
+  // Energy / plug-time pre-screen: reject impossible instances, estimate unavoidable missed work
+  const prescreen = await prescreenDataset(csvFilesDir);
+  if (prescreen) {
+    jobQueue.update(jobId, { prescreen: prescreen });
+    if (!prescreen.feasible) {
+      throw new Error(`Dataset is infeasible: ${prescreen.issues.join('; ')}`);
+    }
+    const missed = prescreen.totals.estimated_missed_work_kWh;
+    if (missed > 0 || prescreen.warnings.length > 0) {
+      jobQueue.update(jobId, {
+        message: `Pre-screen: at least ${missed.toFixed(2)} kWh of work cannot be served` +
+          (prescreen.warnings.length ? ` (${prescreen.warnings.join('; ')})` : '')
+      }, { prescreen: prescreen.totals });
+    }
+  }
+
+  // Update status to preparing
+  jobQueue.update(jobId, {
+    status: 'preparing',
+    progress: 20,
+    message: 'Preparing optimization environment...'
+  });
+
+  // Create dataset directory structure
+  const datasetName = `optimization_${jobId}`;
+  const datasetDir = path.join(__dirname, 'datasets', datasetName);
+  await fs.ensureDir(datasetDir);
+  
+  // Copy csv_files to the dataset directory
+  await fs.copy(csvFilesDir, path.join(datasetDir, 'csv_files'));
+  
+  // Create results directory
+  const resultsDir = path.join(__dirname, 'results', jobId);
+  await fs.ensureDir(resultsDir);
+
+  // Update status to running
+  jobQueue.update(jobId, {
+    status: 'running',
+    progress: 30,
+    message: 'Running Julia optimization...'
+  });
+
+  // Run Julia optimization within the job's time and memory limits
+  const juliaResult = await runJuliaOptimization(datasetName, jobId, datasetDir, job.limits, job.options);
+  
+  if (juliaResult.success) {
+    // Update status to completed; a time or gap limited solve reports its proven gap
+    const { provenOptimal, mipGap, estimate } = juliaResult.results;
+    let message = 'Optimization completed successfully!';
+    if (estimate) {
+      message = 'Quick estimate completed (LP relaxation; cost is a lower bound, schedule is approximate)';
+    } else if (provenOptimal === false && Number.isFinite(mipGap)) {
+      message = `Optimization stopped early; best solution within ${(100 * mipGap).toFixed(2)}% of optimal`;
+    }
+    jobQueue.update(jobId, {
+      status: 'completed',
+      progress: 100,
+      message,
+      results: juliaResult.results
     });
+    storageManager.touch(datasetDir, { fileName: job.fileName, results: juliaResult.results });
+    scheduleChartRender(jobId, juliaResult.results);
+    return juliaResult;
   }
+  throw new Error(juliaResult.error);
+}
+
+// Helper function to run a Python dataset tool from src/tools with `<csvFilesDir> --json`.
+// Resolves to null when the interpreter cannot be started, and rejects when the tool ran
+// but produced no JSON report (it crashed on the dataset).
+function runDatasetTool(scriptName, csvFilesDir) {
+  return new Promise((resolve, reject) => {
+    const scriptPath = path.join(__dirname, '..', '..', 'src', 'tools', scriptName);
+    const pythonProcess = spawn(config.pythonPath, [scriptPath, csvFilesDir, '--json']);
+
+    let stdout = '';
+    pythonProcess.stdout.on('data', (data) => {
+      stdout += data.toString();
+    });
+
+    let stderr = '';
+    pythonProcess.stderr.on('data', (data) => {
+      stderr = (stderr + data.toString()).slice(-2000);
+    });
+
+    pythonProcess.on('close', (code) => {
+      try {
+        resolve(JSON.parse(stdout));
+      } catch (error) {
+        const lastLine = stderr.trim().split('\n').pop() || `exit code ${code}`;
+        reject(new Error(`${scriptName} failed on the dataset: ${lastLine}`));
+      }
+    });
+
+    pythonProcess.on('error', (error) => {
+      console.warn(`${scriptName} unavailable: ${error.message}`);
+      resolve(null);
+    });
+  });
+}
+
+// Helper function to validate a csv_files directory with the Python validator
+function validateDataset(csvFilesDir) {
+  return runDatasetTool('validate_dataset.py', csvFilesDir);
+}
+
+// Helper function to validate a dataset or throw with every violation (error.validation
+// holds the report). A validator crash fails too: it means the files could not be read.
+async function requireValidDataset(csvFilesDir) {
+  const validation = await validateDataset(csvFilesDir);
+  if (validation && !validation.valid) {
+    const details = validation.violations
+      .map(v => `[${v.file}] ${v.message}`)
+      .join('; ');
+    const error = new Error(`Dataset validation failed: ${details}`);
+    error.validation = validation;
+    throw error;
+  }
+  return validation;
+}
+
+// Helper function to compute per-CEV energy and plug-time bounds before the MILP is built;
+// advisory, so a pre-screen that fails is skipped
+function prescreenDataset(csvFilesDir) {
+  return runDatasetTool('feasibility_prescreen.py', csvFilesDir).catch((error) => {
+    console.warn(`${error.message}, skipping pre-screen`);
+    return null;
+  });
 }
 
 // Helper function to run Julia optimization
-function runJuliaOptimization(datasetName, jobId, datasetDir) {
+function runJuliaOptimization(datasetName, jobId, datasetDir, limits = {}, options = {}) {
   return new Promise((resolve, reject) => {
     const juliaPath = process.env.JULIA_PATH || 'julia';
     const scriptPath = path.join(__dirname, '..', '..', 'mcs_optimization_main.jl');
@@ -329,67 +671,156 @@ function runJuliaOptimization(datasetName, jobId, datasetDir) {
     console.log(`CSV files directory exists: ${require('fs').existsSync(path.join(datasetDir, 'csv_files'))}`);
     console.log(`Parameters file exists: ${require('fs').existsSync(path.join(datasetDir, 'csv_files', 'parameters.csv'))}`);
     
-    // Use the full path to the dataset directory
-    const juliaProcess = spawn(juliaPath, [scriptPath, datasetDir], {
+    // Use the full path to the dataset directory; the heap hint makes Julia's GC
+    // work to stay below the job's memory limit before the watchdog has to kill it
+    const juliaArgs = limits.maxMemoryMb
+      ? [`--heap-size-hint=${limits.maxMemoryMb}M`, scriptPath, datasetDir]
+      : [scriptPath, datasetDir];
+    // The solver stops early enough to save its best incumbent before the watchdog fires
+    if (limits.timeoutMs) {
+      const solverSeconds = Math.max(10, Math.floor(limits.timeoutMs * config.optimization.solverTimeShare / 1000));
+      juliaArgs.push('--time-limit', String(solverSeconds));
+    }
+    if (limits.mipGap) {
+      juliaArgs.push('--gap', String(limits.mipGap));
+    }
+    if (options.estimate) {
+      juliaArgs.push('--estimate');
+    }
+    if (options.deferPlots) {
+      juliaArgs.push('--defer-plots');
+    }
+    const juliaProcess = spawn(juliaPath, juliaArgs, {
       cwd: path.join(__dirname, '..', '..'),
-      stdio: ['pipe', 'pipe', 'pipe']
+      // fd 3 carries NDJSON progress events, separate from the human-readable stdout log
+      stdio: ['pipe', 'pipe', 'pipe', 'pipe'],
+      env: { ...process.env, MCS_PROGRESS_FD: String(PROGRESS_FD) }
+    });
+    const stopWatchdog = watchJobLimits(juliaProcess, jobId, limits);
+
+    const stdoutLog = new LogBuffer(config.optimization.logBufferLines);
+    const stderrLog = new LogBuffer(config.optimization.logBufferLines);
+    jobLogs.set(jobId, stdoutLog);
+    let completedEvent = null;
+    let noSolutionEvent = null;
+
+    parseProgressStream(juliaProcess.stdio[PROGRESS_FD], (event) => {
+      io.to(jobId).emit('job-progress', { jobId: jobId, ...event });
+
+      if (event.event === 'phase' && PHASE_PROGRESS[event.phase]) {
+        jobQueue.update(jobId, {
+          progress: PHASE_PROGRESS[event.phase],
+          message: PHASE_MESSAGES[event.phase],
+          phase: event.phase
+        });
+      } else if (event.event === 'solved') {
+        jobQueue.update(jobId, {
+          solver: {
+            status: event.status,
+            solveTime: event.solve_time,
+            incumbent: event.incumbent,
+            bound: event.bound,
+            mipGap: event.mip_gap
+          }
+        });
+      } else if (event.event === 'incumbent') {
+        const job = jobQueue.get(jobId);
+        jobQueue.update(jobId, {
+          message: `Solving MILP... best solution ${Number(event.objective).toFixed(2)}, gap ${(100 * event.mip_gap).toFixed(2)}%`,
+          solver: {
+            ...(job && job.solver),
+            incumbent: event.objective,
+            bound: event.bound,
+            mipGap: event.mip_gap
+          }
+        });
+      } else if (event.event === 'completed') {
+        completedEvent = event;
+      } else if (event.event === 'no_solution') {
+        noSolutionEvent = event;
+      }
     });
-
-    let stdout = '';
-    let stderr = '';
-    let progress = 30;
 
     juliaProcess.stdout.on('data', (data) => {
       const output = data.toString();
-      stdout += output;
+      stdoutLog.append(output);
       console.log(`Julia stdout: ${output}`);
-      
-      // Update progress based on output
-      if (output.includes('Loading data')) {
-        progress = 40;
-      } else if (output.includes('Data loaded successfully')) {
-        progress = 50;
-      } else if (output.includes('Running optimization model')) {
-        progress = 60;
-      } else if (output.includes('Optimization completed')) {
-        progress = 90;
-      }
-      
-      // Emit progress update
-      io.to(jobId).emit('job-status', {
-        jobId: jobId,
-        status: 'running',
-        progress: progress,
-        message: 'Running optimization...',
-        log: output
-      });
     });
 
     juliaProcess.stderr.on('data', (data) => {
       const error = data.toString();
-      stderr += error;
+      stderrLog.append(error);
       console.error(`Julia stderr: ${error}`);
     });
 
     juliaProcess.on('close', (code) => {
       console.log(`Julia process exited with code ${code}`);
+      const limitExceeded = stopWatchdog();
       
-      if (code === 0) {
-        // Parse results from stdout
-        const results = parseJuliaResults(stdout);
+      if (limitExceeded) {
+        reject(new Error(limitExceeded));
+      } else if (code === 0 && noSolutionEvent) {
+        // The solver stopped at its time or gap limit before finding any feasible schedule
+        reject(new Error(`No feasible solution found within the limits (${noSolutionEvent.status}, ` +
+          `${Number(noSolutionEvent.solve_time).toFixed(0)}s); try a longer time limit`));
+      } else if (code === 0) {
+        // Metrics come from the structured 'completed' event; the log tail still lists output files
+        const results = parseJuliaResults(stdoutLog.text());
+        if (completedEvent) {
+          Object.assign(results, resultsFromCompletedEvent(completedEvent));
+        }
         resolve({ success: true, results: results });
       } else {
-        reject(new Error(`Julia process failed with code ${code}. Error: ${stderr}`));
+        reject(new Error(`Julia process failed with code ${code}. Error: ${stderrLog.text()}`));
       }
     });
 
     juliaProcess.on('error', (error) => {
+      stopWatchdog();
       console.error('Failed to start Julia process:', error);
       reject(new Error(`Failed to start Julia process: ${error.message}`));
     });
   });
 }
 
+// Helper function to enforce a job's time and memory limits on a child process.
+// Memory is read from /proc (Linux); elsewhere only the time limit applies.
+// Returns a stop function that yields the reason the process was killed, if any.
+function watchJobLimits(childProcess, jobId, { timeoutMs, maxMemoryMb } = {}) {
+  let exceeded = null;
+  const kill = (reason) => {
+    if (!exceeded) {
+      exceeded = reason;
+      console.error(`Job ${jobId}: ${reason}`);
+      childProcess.kill('SIGKILL');
+    }
+  };
+
+  const timer = timeoutMs
+    ? setTimeout(() => kill(`Time limit of ${Math.round(timeoutMs / 60000)} minutes exceeded`), timeoutMs)
+    : null;
+
+  const memoryTimer = maxMemoryMb && process.platform === 'linux'
+    ? setInterval(async () => {
+        try {
+          const status = await fs.readFile(`/proc/${childProcess.pid}/status`, 'utf8');
+          const match = status.match(/VmRSS:\s+(\d+)\s+kB/);
+          if (match && parseInt(match[1], 10) / 1024 > maxMemoryMb) {
+            kill(`Memory limit of ${maxMemoryMb} MB exceeded`);
+          }
+        } catch (error) {
+          // Process already exited
+        }
+      }, 5000)
+    : null;
+
+  return () => {
+    clearTimeout(timer);
+    clearInterval(memoryTimer);
+    return exceeded;
+  };
+}
+
 // Helper function to parse Julia results
 function parseJuliaResults(stdout) {
   const results = {
@@ -429,40 +860,8 @@ function parseJuliaResults(stdout) {
   return results;
 }
 
-// Helper function to create ZIP file of results
-async function createResultsZip(resultsPath, zipPath) {
-  return new Promise((resolve, reject) => {
-    console.log(`Creating ZIP from: ${resultsPath} to: ${zipPath}`);
-    
-    // Check if results directory exists and has files
-    fs.readdir(resultsPath, (err, files) => {
-      if (err) {
-        console.error('Error reading results directory:', err);
-        reject(err);
-        return;
-      }
-      console.log(`Files in results directory: ${files}`);
-      
-      const output = fs.createWriteStream(zipPath);
-      const archive = archiver('zip', { zlib: { level: 9 } });
-
-      output.on('close', () => {
-        console.log('ZIP file created successfully');
-        resolve();
-      });
-      archive.on('error', (err) => {
-        console.error('Error creating ZIP:', err);
-        reject(err);
-      });
-
-      archive.pipe(output);
-      archive.directory(resultsPath, false);
-      archive.finalize();
-    });
-  });
-}
-
-// Results upload and processing endpoint
+// Results upload and processing endpoint. The ZIP is extracted entry by entry; the response
+// is sent as soon as the first run's summary is known and the rest is extracted in the background.
 app.post('/api/results/upload', upload.single('resultsZip'), async (req, res) => {
   try {
     if (!req.file) {
@@ -472,31 +871,32 @@ app.post('/api/results/upload', upload.single('resultsZip'), async (req, res) =>
     const zipFile = req.file;
     console.log(`Processing results ZIP: ${zipFile.originalname}`);
 
-    // Create temporary directory for extraction
-    const extractDir = path.join(__dirname, 'uploads', 'results', uuidv4());
+    // Directory the extracted files are kept in for serving
+    const uploadId = uuidv4();
+    const extractDir = path.join(__dirname, 'uploads', 'results', uploadId);
     await fs.ensureDir(extractDir);
+    await resultsIndex.build();
 
-    // Extract ZIP file
-    await new Promise((resolve, reject) => {
-      fs.createReadStream(zipFile.path)
-        .pipe(unzipper.Extract({ path: extractDir }))
-        .on('close', resolve)
-        .on('error', reject);
-    });
+    const { summary, done } = resultsUploadParser.parse(uploadId, zipFile.path, extractDir);
 
-    // Parse results and extract data
-    const resultsData = await parseResultsDirectory(extractDir);
-    
-    // Keep the extracted files for serving (don't remove extractDir)
-    // Clean up only the uploaded ZIP file
-    await fs.remove(zipFile.path);
+    // Clean up only the uploaded ZIP file once every entry is extracted
+    done
+      .then((result) => console.log(`✅ Results ${uploadId} extracted: ${Object.keys(result.runs).length} run(s)`))
+      .catch((error) => console.error(`Error extracting results ${uploadId}:`, error))
+      .finally(() => fs.remove(zipFile.path).catch(console.error));
+
+    const resultsData = await summary;
+    const status = resultsUploadParser.get(uploadId);
+    storageManager.touch(extractDir, { timestamp: resultsData.timestamp, summary: resultsData.summary });
 
     res.json({
       success: true,
-      datasetName: resultsData.datasetName,
+      uploadId: uploadId,
+      datasetName: uploadId,
       timestamp: resultsData.timestamp,
       summary: resultsData.summary,
-      charts: resultsData.charts
+      charts: status.status === 'ready' ? status.charts : resultsData.charts,
+      chartsPending: status.status !== 'ready'
     });
 
   } catch (error) {
@@ -508,207 +908,125 @@ app.post('/api/results/upload', upload.single('resultsZip'), async (req, res) =>
   }
 });
 
-// Function to parse results directory
-async function parseResultsDirectory(resultsDir) {
-  try {
-    const files = await fs.readdir(resultsDir);
-    
-    // Find timestamp directory (e.g., 20250830_032808)
-    const timestampDir = files.find(file => /^\d{8}_\d{6}$/.test(file));
-    if (!timestampDir) {
-      throw new Error('No timestamp directory found in results');
-    }
-
-    const timestampPath = path.join(resultsDir, timestampDir);
-    const timestampFiles = await fs.readdir(timestampPath);
+// Status of a results upload that is still being extracted (charts appear when ready)
+app.get('/api/results/upload/:uploadId', (req, res) => {
+  const status = resultsUploadParser.get(req.params.uploadId);
+  
+  if (!status) {
+    return res.status(404).json({ error: 'Upload not found' });
+  }
+  
+  res.json({
+    uploadId: req.params.uploadId,
+    status: status.status,
+    timestamp: status.timestamp,
+    runs: Object.keys(status.runs),
+    charts: status.charts,
+    error: status.error
+  });
+});
 
-    // Parse summary from log files
-    const summary = await parseOptimizationSummary(timestampPath, timestampFiles);
-    
-    // Parse charts
-    const charts = await parseCharts(timestampPath, timestampFiles);
-
-    return {
-      datasetName: path.basename(resultsDir),
-      timestamp: timestampDir,
-      summary: summary,
-      charts: charts
-    };
+// Helper function to serve a file from an uploaded results ZIP via the results index.
+// res.sendFile / res.download stream asynchronously and answer ETag and Range requests.
+async function serveResultsFile(req, res, { notFoundMessage, download = false, headers = {} }) {
+  const { timestamp, filename } = req.params;
+  await resultsIndex.build();
 
-  } catch (error) {
-    console.error('Error parsing results directory:', error);
-    throw error;
+  let filePath = resultsIndex.lookup(timestamp, filename);
+  if (!filePath && chartRenderer.isChart(filename)) {
+    filePath = await renderUploadedChart(timestamp, filename);
+  }
+  if (filePath) {
+    storageManager.touch(filePath);
+  }
+  if (!filePath) {
+    return res.status(404).json({ error: notFoundMessage });
   }
-}
 
-// Function to parse optimization summary
-async function parseOptimizationSummary(timestampPath, files) {
-  try {
-    const logFile = files.find(file => file.includes('optimization_log.txt'));
-    if (!logFile) {
-      return null;
+  const options = { etag: true, lastModified: true, acceptRanges: true, headers };
+  const onDone = (error) => {
+    if (!error || res.headersSent) {
+      return;
     }
+    if (error.code === 'ENOENT') {
+      // Removed from disk since it was indexed
+      resultsIndex.invalidate(timestamp, filename);
+      return res.status(404).json({ error: notFoundMessage });
+    }
+    console.error(`Error serving results file ${timestamp}/${filename}:`, error);
+    res.status(500).json({ error: 'Failed to serve file' });
+  };
 
-    const logContent = await fs.readFile(path.join(timestampPath, logFile), 'utf8');
-    
-    // Extract key metrics using regex patterns
-    const metrics = {
-      solutionStatus: extractValue(logContent, /Solution Status:\s*(\w+)/),
-      totalEnergyFromGrid: extractNumericValue(logContent, /Total Energy from Grid:\s*([\d.]+)/),
-      totalMissedWork: extractNumericValue(logContent, /Total Missed Work:\s*([\d.]+)/),
-      totalElectricityCost: extractNumericValue(logContent, /Total Electricity Cost:\s*([\d.]+)/),
-      totalCarbonEmissionsCost: extractNumericValue(logContent, /Total Carbon Emissions Cost:\s*([\d.]+)/),
-      peakPower: extractNumericValue(logContent, /Peak Power:\s*([\d.]+)/),
-      averagePower: extractNumericValue(logContent, /Average Power:\s*([\d.]+)/),
-      dutyCycle: extractNumericValue(logContent, /Duty Cycle:\s*([\d.]+)/),
-      energyEfficiency: extractNumericValue(logContent, /Energy Efficiency:\s*([\d.]+)/),
-      initialMCSEnergy: extractNumericValue(logContent, /Initial MCS Energy:\s*([\d.]+)/),
-      finalMCSEnergy: extractNumericValue(logContent, /Final MCS Energy:\s*([\d.]+)/),
-      netEnergyChange: extractNumericValue(logContent, /Net Energy Change:\s*([\d.]+)/),
-      numMCS: extractNumericValue(logContent, /Number of MCSs:\s*(\d+)/),
-      numCEV: extractNumericValue(logContent, /Number of EVs:\s*(\d+)/),
-      numNodes: extractNumericValue(logContent, /Number of nodes:\s*(\d+)/),
-      numTimePeriods: extractNumericValue(logContent, /Number of time periods:\s*(\d+)/)
-    };
-
-    return metrics;
-
-  } catch (error) {
-    console.error('Error parsing optimization summary:', error);
-    return null;
+  if (download) {
+    res.download(filePath, filename, options, onDone);
+  } else {
+    res.sendFile(filePath, options, onDone);
   }
 }
 
-// Function to parse charts and CSV data
-async function parseCharts(timestampPath, files) {
-  try {
-    const chartFiles = files.filter(file => file.endsWith('.png'));
-    const csvFiles = files.filter(file => file.endsWith('.csv'));
-    
-    console.log('📊 Chart files found:', chartFiles);
-    console.log('📈 CSV files found:', csvFiles);
-    
-    const charts = chartFiles.map(file => {
-      const chartName = file.replace('.png', '');
-      const csvFile = csvFiles.find(csv => csv.replace('.csv', '') === chartName);
-      
-      console.log(`🔍 Chart: ${chartName}, CSV: ${csvFile ? csvFile : 'none'}`);
-      
-      return {
-        name: chartName,
-        type: csvFile ? 'INTERACTIVE' : 'PNG',
-        imageUrl: `/api/results/image/${path.basename(timestampPath)}/${file}`,
-        downloadUrl: `/api/results/download/${path.basename(timestampPath)}/${file}`,
-        csvDataUrl: csvFile ? `/api/results/csv/${path.basename(timestampPath)}/${csvFile}` : null,
-        fileSize: 0
-      };
-    });
-
-    return charts;
-
-  } catch (error) {
-    console.error('Error parsing charts:', error);
-    return [];
+// Helper function to render a missing chart of an uploaded run from its CSV files and
+// index it; resolves to its path, or null when the run or its data is not there
+async function renderUploadedChart(timestamp, filename) {
+  const anchor = ['optimization_log.txt', '01_total_grid_power_profile.csv', '03_mcs_state_of_energy.csv']
+    .map(name => resultsIndex.lookup(timestamp, name))
+    .find(Boolean);
+  if (!anchor) {
+    return null;
   }
+  const runDir = path.dirname(anchor);
+  const chartPath = await chartRenderer.get(runDir, filename);
+  if (chartPath) {
+    resultsIndex.addFile(path.dirname(runDir), timestamp, filename, chartPath);
+  }
+  return chartPath;
 }
 
-// Helper functions for parsing
-function extractValue(content, regex) {
-  const match = content.match(regex);
-  return match ? match[1] : null;
-}
-
-function extractNumericValue(content, regex) {
-  const match = content.match(regex);
-  return match ? parseFloat(match[1]) : 0;
-}
-
-// Serve chart images
+// Serve chart images (charts of deferred-plots runs are rendered on first request)
 app.get('/api/results/image/:timestamp/:filename', (req, res) => {
-  try {
-    const { timestamp, filename } = req.params;
-    
-    // Search for the file in all result directories
-    const resultsDir = path.join(__dirname, 'uploads', 'results');
-    const resultDirs = fs.readdirSync(resultsDir);
-    
-    let filePath = null;
-    for (const resultDir of resultDirs) {
-      const potentialPath = path.join(resultsDir, resultDir, timestamp, filename);
-      if (fs.existsSync(potentialPath)) {
-        filePath = potentialPath;
-        break;
-      }
-    }
-    
-    if (filePath && fs.existsSync(filePath)) {
-      res.sendFile(filePath);
-    } else {
-      res.status(404).json({ error: 'Image not found' });
-    }
-  } catch (error) {
-    console.error('Error serving image:', error);
-    res.status(500).json({ error: 'Failed to serve image' });
-  }
+  serveResultsFile(req, res, { notFoundMessage: 'Image not found' });
 });
 
 // Download chart files
 app.get('/api/results/download/:timestamp/:filename', (req, res) => {
-  try {
-    const { timestamp, filename } = req.params;
-    
-    // Search for the file in all result directories
-    const resultsDir = path.join(__dirname, 'uploads', 'results');
-    const resultDirs = fs.readdirSync(resultsDir);
-    
-    let filePath = null;
-    for (const resultDir of resultDirs) {
-      const potentialPath = path.join(resultsDir, resultDir, timestamp, filename);
-      if (fs.existsSync(potentialPath)) {
-        filePath = potentialPath;
-        break;
-      }
-    }
-    
-    if (filePath && fs.existsSync(filePath)) {
-      res.download(filePath);
-    } else {
-      res.status(404).json({ error: 'File not found' });
-    }
-  } catch (error) {
-    console.error('Error downloading file:', error);
-    res.status(500).json({ error: 'Failed to download file' });
-  }
+  serveResultsFile(req, res, { notFoundMessage: 'File not found', download: true });
 });
 
 // Serve CSV data files
 app.get('/api/results/csv/:timestamp/:filename', (req, res) => {
-  try {
-    const { timestamp, filename } = req.params;
-    
-    // Search for the file in all result directories
-    const resultsDir = path.join(__dirname, 'uploads', 'results');
-    const resultDirs = fs.readdirSync(resultsDir);
-    
-    let filePath = null;
-    for (const resultDir of resultDirs) {
-      const potentialPath = path.join(resultsDir, resultDir, timestamp, filename);
-      if (fs.existsSync(potentialPath)) {
-        filePath = potentialPath;
-        break;
-      }
+  const { filename } = req.params;
+  serveResultsFile(req, res, {
+    notFoundMessage: 'CSV file not found',
+    headers: {
+      'Content-Type': 'text/csv',
+      'Content-Disposition': `attachment; filename="${filename}"`
     }
-    
-    if (filePath && fs.existsSync(filePath)) {
-      res.setHeader('Content-Type', 'text/csv');
-      res.setHeader('Content-Disposition', `attachment; filename="${filename}"`);
-      res.sendFile(filePath);
-    } else {
-      res.status(404).json({ error: 'CSV file not found' });
+  });
+});
+
+// Serve a downsampled CSV for charting: ?points=<row budget>&columns=<comma-separated names or * patterns>
+app.get('/api/results/series/:timestamp/:filename', async (req, res) => {
+  const { timestamp, filename } = req.params;
+  const points = Math.min(Math.max(parseInt(req.query.points, 10) || 1000, 10), 100000);
+  const columns = req.query.columns
+    ? String(req.query.columns).split(',').map(column => column.trim()).filter(Boolean)
+    : null;
+
+  try {
+    await resultsIndex.build();
+    const filePath = resultsIndex.lookup(timestamp, filename);
+    if (!filePath || !filename.endsWith('.csv')) {
+      return res.status(404).json({ error: 'CSV file not found' });
     }
+
+    const csv = await seriesDownsampler.get(filePath, { columns, points });
+    res.type('text/csv').send(csv);
   } catch (error) {
-    console.error('Error serving CSV file:', error);
-    res.status(500).json({ error: 'Failed to serve CSV file' });
+    if (error.code === 'ENOENT') {
+      resultsIndex.invalidate(timestamp, filename);
+      return res.status(404).json({ error: 'CSV file not found' });
+    }
+    console.error(`Error downsampling ${timestamp}/${filename}:`, error);
+    res.status(500).json({ error: 'Failed to downsample series' });
   }
 });
 
@@ -772,6 +1090,39 @@ server.listen(PORT, () => {
   console.log(`📊 Health check: http://localhost:${PORT}/api/health`);
   console.log(`🔗 WebSocket server ready for real-time updates`);
   console.log(`🤖 Chat API ready for AI conversations`);
+
+  // Index previously uploaded results so file lookups never scan the disk
+  resultsIndex.build();
+  solveCache.load();
+
+  // Retention: folders of finished jobs and uploads are compacted and expired in the background
+  storageManager.setHooks({
+    isProtected: (root, name) => {
+      if (root === 'uploadsResults') {
+        const upload = resultsUploadParser.get(name);
+        return Boolean(upload && upload.status !== 'ready' && upload.status !== 'error');
+      }
+      const job = jobQueue.get(name.replace(/^optimization_/, ''));
+      return Boolean(job && !['completed', 'error'].includes(job.status));
+    },
+    onCompacted: (root, name, dir) => {
+      if (root === 'uploadsResults') {
+        resultsIndex.removeRun(dir);
+      } else {
+        resultsArchive.remove(name.replace(/^optimization_/, '')).catch(console.error);
+      }
+    }
+  });
+  storageManager.start();
+
+  // Restore queued and interrupted jobs, then start the optimization workers
+  jobQueue.load();
+  rekeyQueuedJobs()
+    .catch(error => console.error('Error fingerprinting queued jobs:', error))
+    .then(() => {
+      jobQueue.start(processOptimizationJob, { attach: attachToSolve });
+      console.log(`⚙️  Job queue running with ${jobQueue.concurrency} concurrent workers`);
+    });
 });
 
 // Graceful shutdown
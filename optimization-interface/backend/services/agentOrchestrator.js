@@ -1,12 +1,8 @@
-const OpenAI = require('openai');
 const { OPENAI_CONFIG } = require('../config/openai');
 const promptManager = require('./promptManager');
 const navigationAgent = require('./navigationAgent');
-
-// Initialize OpenAI
-const openai = new OpenAI({
-  apiKey: OPENAI_CONFIG.apiKey,
-});
+// Cached, coalescing completions (OpenAI or the local stub backend)
+const llmClient = require('./llmClient');
 
 class AgentOrchestrator {
   constructor() {
@@ -381,7 +377,7 @@ Return ONLY a JSON object with the results from all executed agents:
         workflowState: workflowState
       });
       
-      const response = await openai.chat.completions.create({
+      const response = await llmClient.complete({
         model: OPENAI_CONFIG.model,
         messages: [
           { role: 'system', content: prompt },
@@ -421,7 +417,7 @@ Return ONLY a JSON object with the results from all executed agents:
         workflowState
       );
       
-      const response = await openai.chat.completions.create({
+      const response = await llmClient.complete({
         model: OPENAI_CONFIG.model,
         messages: [
           { role: 'system', content: prompt },
@@ -473,7 +469,7 @@ Return ONLY a JSON object with the results from all executed agents:
         workflowState
       );
 
-      const response = await openai.chat.completions.create({
+      const response = await llmClient.complete({
         model: OPENAI_CONFIG.model,
         messages: [
           { role: 'system', content: prompt },
@@ -508,7 +504,7 @@ Return ONLY a JSON object with the results from all executed agents:
         conversationHistory: this.getConversationHistory(sessionId)
       });
       
-      const response = await openai.chat.completions.create({
+      const response = await llmClient.complete({
         model: OPENAI_CONFIG.model,
         messages: [
           { role: 'system', content: prompt },
@@ -680,7 +676,7 @@ Return ONLY a JSON object:
 }
 `;
 
-      const response = await openai.chat.completions.create({
+      const response = await llmClient.complete({
         model: OPENAI_CONFIG.model,
         messages: [
           { role: 'system', content: reactCotPrompt },
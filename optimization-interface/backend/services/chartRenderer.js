@@ -0,0 +1,136 @@
+const fs = require('fs-extra');
+const os = require('os');
+const path = require('path');
+const { spawn } = require('child_process');
+const config = require('../config');
+
+// PNG charts mcs_render_charts.jl can draw from a run's CSV files
+const CHART_PATTERN = /^(0[1-8]_[a-z_]+|mcs_\d+_power_profile|mcs_optimization_results)\.png$/;
+
+/**
+ * On-demand rendering of the PNG charts of runs solved with deferred plots.
+ *
+ * The first request for a chart that is not on disk renders its run with
+ * mcs_render_charts.jl; the PNGs are written next to the CSVs, so later requests are
+ * plain file serves. A render draws every missing chart of the run (the Julia start-up
+ * dominates), and concurrent requests for the same run share it. Runs handed to
+ * background() are rendered one at a time at low CPU priority while no client is waiting.
+ */
+class ChartRenderer {
+  constructor() {
+    this.scriptPath = path.join(__dirname, '..', '..', '..', 'mcs_render_charts.jl');
+    // run directory -> promise of the render in progress
+    this.rendering = new Map();
+    this.backgroundQueue = [];
+    this.stats = { renders: 0, failed: 0, onDemand: 0, background: 0 };
+  }
+
+  isChart(filename) {
+    return CHART_PATTERN.test(filename);
+  }
+
+  /**
+   * Path of a chart in runDir, rendering the run first when the chart is missing;
+   * null when it cannot be rendered (no data, or the render failed)
+   */
+  async get(runDir, filename) {
+    const chartPath = path.join(runDir, filename);
+    if (await fs.pathExists(chartPath)) {
+      return chartPath;
+    }
+    if (!this.isChart(filename) || !await fs.pathExists(runDir)) {
+      return null;
+    }
+    this.stats.onDemand += 1;
+    await this.renderRun(runDir, { lowPriority: false });
+    return await fs.pathExists(chartPath) ? chartPath : null;
+  }
+
+  /**
+   * Queue a run for low-priority rendering (when enabled in config.charts)
+   */
+  background(runDir) {
+    if (!config.charts.backgroundRender || this.backgroundQueue.includes(runDir)) {
+      return;
+    }
+    this.backgroundQueue.push(runDir);
+    this.drain();
+  }
+
+  drain() {
+    if (this.rendering.size > 0 || this.backgroundQueue.length === 0) {
+      return;
+    }
+    this.stats.background += 1;
+    this.renderRun(this.backgroundQueue.shift(), { lowPriority: true });
+  }
+
+  /**
+   * Render every missing chart of a run; resolves with whether the renderer succeeded
+   */
+  renderRun(runDir, { lowPriority }) {
+    if (this.rendering.has(runDir)) {
+      return this.rendering.get(runDir);
+    }
+    const queued = this.backgroundQueue.indexOf(runDir);
+    if (queued >= 0) {
+      this.backgroundQueue.splice(queued, 1);
+    }
+
+    const rendering = new Promise((resolve) => {
+      const started = Date.now();
+      const juliaProcess = spawn(config.juliaPath, [this.scriptPath, runDir], {
+        cwd: path.join(__dirname, '..', '..', '..')
+      });
+      if (lowPriority) {
+        try {
+          os.setPriority(juliaProcess.pid, config.charts.backgroundNice);
+        } catch (error) {
+          // Not supported on this platform; render at normal priority
+        }
+      }
+      const timer = setTimeout(() => juliaProcess.kill('SIGKILL'), config.charts.renderTimeoutMs);
+
+      let stderr = '';
+      juliaProcess.stderr.on('data', (data) => {
+        stderr = (stderr + data.toString()).slice(-4000);
+      });
+      juliaProcess.on('close', (code) => {
+        clearTimeout(timer);
+        this.stats.renders += 1;
+        if (code === 0) {
+          console.log(`🖼️  Rendered charts of ${runDir} in ${((Date.now() - started) / 1000).toFixed(1)}s`);
+        } else {
+          this.stats.failed += 1;
+          console.error(`Chart render of ${runDir} failed with code ${code}: ${stderr}`);
+        }
+        resolve(code === 0);
+      });
+      juliaProcess.on('error', (error) => {
+        clearTimeout(timer);
+        this.stats.failed += 1;
+        console.error('Failed to start chart renderer:', error);
+        resolve(false);
+      });
+    }).finally(() => {
+      this.rendering.delete(runDir);
+      this.drain();
+    });
+
+    this.rendering.set(runDir, rendering);
+    return rendering;
+  }
+
+  getStats() {
+    return {
+      rendering: Array.from(this.rendering.keys()),
+      backgroundQueued: this.backgroundQueue.length,
+      ...this.stats
+    };
+  }
+}
+
+// Create singleton instance
+const chartRenderer = new ChartRenderer();
+
+module.exports = chartRenderer;
@@ -0,0 +1,236 @@
+const fs = require('fs-extra');
+const path = require('path');
+const EventEmitter = require('events');
+const { v4: uuidv4 } = require('uuid');
+const config = require('../config');
+
+// Statuses that mean a worker owns the job, or that it waits on another job's work
+const ACTIVE_STATUSES = ['starting', 'extracting', 'validating', 'preparing', 'running', 'waiting'];
+
+/**
+ * Persistent optimization job queue.
+ *
+ * Jobs are journaled to a JSON file so a restart keeps their status; jobs that were
+ * running when the process stopped are put back in the queue. At most `concurrency`
+ * jobs run at once, highest priority first, then oldest first. Jobs the attach hook can
+ * answer from work already in progress wait for it without a worker slot. Every change
+ * is emitted as a 'status' event, which the server forwards as the Socket.IO `job-status` event.
+ */
+class JobQueue extends EventEmitter {
+  constructor() {
+    super();
+    this.storePath = path.join(__dirname, '..', config.optimization.queueFile);
+    this.concurrency = config.optimization.maxConcurrentJobs;
+    this.jobs = new Map();
+    this.running = new Set();
+    this.handler = null;
+    this.attach = null;
+    this.persistTimer = null;
+    this.writing = Promise.resolve();
+  }
+
+  /**
+   * Load the journal and re-queue jobs interrupted by a restart
+   */
+  load() {
+    try {
+      if (fs.existsSync(this.storePath)) {
+        const stored = fs.readJsonSync(this.storePath);
+        for (const job of stored) {
+          if (ACTIVE_STATUSES.includes(job.status)) {
+            job.status = 'queued';
+            job.progress = 0;
+            job.message = 'Re-queued after server restart';
+          }
+          this.jobs.set(job.id, job);
+        }
+        console.log(`📋 Loaded ${this.jobs.size} jobs from ${this.storePath}`);
+      }
+    } catch (error) {
+      console.error('❌ Error loading job queue:', error);
+    }
+  }
+
+  /**
+   * Start processing with handler(job), an async function that runs one job.
+   * attach(job) is asked before a queued job takes a worker slot: it returns null, or a
+   * promise resolving with whether work already in progress completed the job (when it
+   * did not, the job goes back to the queue)
+   */
+  start(handler, { attach = null } = {}) {
+    this.handler = handler;
+    this.attach = attach;
+    this.schedule();
+  }
+
+  /**
+   * Add a job; returns the stored job record
+   */
+  enqueue({ id = uuidv4(), fileName, filePath, priority = 0, limits = {}, options = {}, cacheKey = null }) {
+    const job = {
+      id: id,
+      fileName: fileName,
+      filePath: filePath,
+      priority: priority,
+      limits: {
+        timeoutMs: limits.timeoutMs || config.optimization.timeout,
+        maxMemoryMb: limits.maxMemoryMb || config.optimization.maxMemoryMb,
+        mipGap: limits.mipGap || null
+      },
+      options: {
+        estimate: Boolean(options.estimate),
+        deferPlots: Boolean(options.deferPlots)
+      },
+      cacheKey: cacheKey,
+      status: 'queued',
+      progress: 0,
+      message: 'Waiting for a free optimization worker...',
+      startTime: new Date(),
+      queuedAt: Date.now(),
+      attempts: 0,
+      results: null,
+      error: null
+    };
+    this.jobs.set(job.id, job);
+    this.persist(true);
+    this.emit('status', job, {});
+    this.schedule();
+    return job;
+  }
+
+  get(jobId) {
+    return this.jobs.get(jobId) || null;
+  }
+
+  list() {
+    return Array.from(this.jobs.values());
+  }
+
+  /**
+   * 1-based position among queued jobs, or 0 when the job is not waiting
+   */
+  position(jobId) {
+    return this.pending().findIndex(job => job.id === jobId) + 1;
+  }
+
+  /**
+   * Merge a patch into a job and notify listeners; `extra` is sent with the event only
+   */
+  update(jobId, patch, extra = {}) {
+    const job = this.jobs.get(jobId);
+    if (!job) {
+      return null;
+    }
+    const statusChanged = patch.status && patch.status !== job.status;
+    Object.assign(job, patch);
+    this.persist(statusChanged);
+    this.emit('status', job, extra);
+    return job;
+  }
+
+  remove(jobId) {
+    const removed = this.jobs.delete(jobId);
+    if (removed) {
+      this.persist(true);
+    }
+    return removed;
+  }
+
+  pending() {
+    return this.list()
+      .filter(job => job.status === 'queued')
+      .sort((a, b) => (b.priority - a.priority) || (a.queuedAt - b.queuedAt));
+  }
+
+  schedule() {
+    if (!this.handler) {
+      return;
+    }
+    for (const job of this.pending()) {
+      this.follow(job);
+    }
+    while (this.running.size < this.concurrency) {
+      const next = this.pending()[0];
+      if (!next) {
+        break;
+      }
+      // A job started in this loop may answer the next one
+      if (this.follow(next)) {
+        continue;
+      }
+      this.running.add(next.id);
+      this.update(next.id, {
+        status: 'starting',
+        message: 'Starting optimization job...',
+        attempts: next.attempts + 1
+      });
+      this.run(next);
+    }
+  }
+
+  async run(job) {
+    try {
+      await this.handler(job);
+    } catch (error) {
+      this.fail(job, error);
+    } finally {
+      this.running.delete(job.id);
+      this.schedule();
+    }
+  }
+
+  /**
+   * Let a queued job wait on work in progress (see start); true when it was attached
+   */
+  follow(job) {
+    const waiting = this.attach ? this.attach(job) : null;
+    if (!waiting) {
+      return false;
+    }
+    this.update(job.id, { status: 'waiting' });
+    waiting
+      .then((completed) => {
+        if (!completed) {
+          this.update(job.id, { status: 'queued', message: 'Waiting for a free optimization worker...' });
+        }
+      })
+      .catch(error => this.fail(job, error))
+      .finally(() => this.schedule());
+    return true;
+  }
+
+  fail(job, error) {
+    console.error(`Error in job ${job.id}:`, error);
+    this.update(job.id, {
+      status: 'error',
+      progress: 0,
+      message: `Error: ${error.message}`,
+      error: error.message
+    });
+  }
+
+  /**
+   * Write the journal; progress-only updates are batched, status changes are written at once
+   */
+  persist(immediate = false) {
+    if (this.persistTimer && !immediate) {
+      return;
+    }
+    clearTimeout(this.persistTimer);
+    this.persistTimer = setTimeout(() => {
+      this.persistTimer = null;
+      const snapshot = JSON.stringify(this.list());
+      const tmpPath = `${this.storePath}.tmp`;
+      // Writes are chained so two snapshots never race on the temp file
+      this.writing = this.writing
+        .then(() => fs.outputFile(tmpPath, snapshot))
+        .then(() => fs.move(tmpPath, this.storePath, { overwrite: true }))
+        .catch(error => console.error('❌ Error saving job queue:', error));
+    }, immediate ? 0 : 1000);
+  }
+}
+
+// Create singleton instance
+const jobQueue = new JobQueue();
+
+module.exports = jobQueue;
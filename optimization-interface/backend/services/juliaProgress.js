@@ -0,0 +1,103 @@
+const readline = require('readline');
+const path = require('path');
+
+// File descriptor the optimizer writes NDJSON progress events to (see src/core/ProgressEvents.jl)
+const PROGRESS_FD = 3;
+
+// Job progress (%) reported when the optimizer enters each phase
+const PHASE_PROGRESS = {
+  loading: 35,
+  loaded: 45,
+  building: 50,
+  solving: 60,
+  analyzing: 85,
+  saving: 90
+};
+
+const PHASE_MESSAGES = {
+  loading: 'Loading dataset...',
+  loaded: 'Data loaded, building model...',
+  building: 'Building optimization model...',
+  solving: 'Solving MILP...',
+  analyzing: 'Analyzing solution...',
+  saving: 'Saving charts and CSV results...'
+};
+
+/**
+ * Keeps only the last `maxLines` lines of a process's output
+ */
+class LogBuffer {
+  constructor(maxLines = 500) {
+    this.maxLines = maxLines;
+    this.lines = [];
+    this.partial = '';
+    this.dropped = 0;
+  }
+
+  append(chunk) {
+    const parts = (this.partial + chunk).split('\n');
+    this.partial = parts.pop();
+    for (const line of parts) {
+      this.lines.push(line);
+    }
+    if (this.lines.length > this.maxLines) {
+      const excess = this.lines.length - this.maxLines;
+      this.lines.splice(0, excess);
+      this.dropped += excess;
+    }
+  }
+
+  text() {
+    return this.lines.concat(this.partial ? [this.partial] : []).join('\n');
+  }
+}
+
+/**
+ * Parse NDJSON events from a readable stream line by line, calling onEvent(event)
+ * for every well-formed object; malformed lines are ignored
+ */
+function parseProgressStream(stream, onEvent) {
+  const lines = readline.createInterface({ input: stream, crlfDelay: Infinity });
+  lines.on('line', (line) => {
+    if (!line.trim()) {
+      return;
+    }
+    try {
+      onEvent(JSON.parse(line));
+    } catch (error) {
+      console.warn(`Ignoring malformed progress event: ${line.slice(0, 200)}`);
+    }
+  });
+  return lines;
+}
+
+/**
+ * Map the optimizer's 'completed' event to the job results shape used by the frontend
+ */
+function resultsFromCompletedEvent(event) {
+  return {
+    objectiveValue: event.objective,
+    totalEnergyFromGrid: event.total_energy_from_grid,
+    totalMissedWork: event.total_missed_work,
+    totalCarbonEmissions: event.total_carbon_emissions,
+    totalElectricityCost: event.total_electricity_cost,
+    workCompletionPercentage: event.work_completion_percentage,
+    solveTime: event.solve_time,
+    solverStatus: event.status,
+    mipGap: event.mip_gap,
+    provenOptimal: event.proven_optimal,
+    estimate: Boolean(event.estimate),
+    // Results folder of the run (<timestamp>) and whether its PNG charts are rendered on demand
+    runName: event.run_dir ? path.basename(event.run_dir) : null,
+    chartsDeferred: Boolean(event.charts_deferred)
+  };
+}
+
+module.exports = {
+  PROGRESS_FD,
+  PHASE_PROGRESS,
+  PHASE_MESSAGES,
+  LogBuffer,
+  parseProgressStream,
+  resultsFromCompletedEvent
+};
@@ -0,0 +1,178 @@
+const crypto = require('crypto');
+const { OPENAI_CONFIG, LLM_CONFIG } = require('../config/openai');
+
+// Collapse whitespace and case so trivially different turns share a cache entry
+function normalizeContent(content) {
+  return String(content || '').trim().replace(/\s+/g, ' ').toLowerCase();
+}
+
+/**
+ * Cache key for a chat.completions.create request: everything that affects the answer,
+ * with message text normalized
+ */
+function requestKey(params) {
+  const normalized = {
+    model: params.model,
+    temperature: params.temperature,
+    max_tokens: params.max_tokens,
+    response_format: params.response_format || null,
+    messages: (params.messages || []).map(message => [message.role, normalizeContent(message.content)])
+  };
+  return crypto.createHash('sha1').update(JSON.stringify(normalized)).digest('hex');
+}
+
+/**
+ * OpenAI chat completions (the client is created on first use)
+ */
+class OpenAIBackend {
+  constructor() {
+    this.name = 'openai';
+    this.client = null;
+  }
+
+  create(params) {
+    if (!this.client) {
+      const OpenAI = require('openai');
+      this.client = new OpenAI({ apiKey: OPENAI_CONFIG.apiKey });
+    }
+    return this.client.chat.completions.create(params);
+  }
+}
+
+/**
+ * Local stand-in for offline benchmarking: answers after a fixed latency with a response
+ * every agent can parse (JSON requests get the fields the agents read, text requests an echo)
+ */
+class StubBackend {
+  constructor(latencyMs = 0) {
+    this.name = 'stub';
+    this.latencyMs = latencyMs;
+  }
+
+  async create(params) {
+    if (this.latencyMs > 0) {
+      await new Promise(resolve => setTimeout(resolve, this.latencyMs));
+    }
+    const lastUserMessage = [...(params.messages || [])].reverse().find(message => message.role === 'user');
+    const content = params.response_format && params.response_format.type === 'json_object'
+      ? JSON.stringify({
+        flowType: 'full_analysis',
+        confidence: 1,
+        reasoning: 'Stub backend',
+        requiresUnderstanding: true,
+        requiresValidation: true,
+        requiresRecommendation: true,
+        reactChain: [],
+        scenario: {},
+        parameters: {},
+        extraction_confidence: 0,
+        missing_critical_info: [],
+        is_valid: true,
+        validation_score: 1,
+        missing_parameters: [],
+        suggestions: [],
+        recommendations: []
+      })
+      : `Stub response to: ${lastUserMessage ? lastUserMessage.content : ''}`;
+    return {
+      id: `stub-${Date.now()}`,
+      model: params.model,
+      choices: [{ index: 0, message: { role: 'assistant', content }, finish_reason: 'stop' }],
+      usage: { prompt_tokens: 0, completion_tokens: 0, total_tokens: 0 }
+    };
+  }
+}
+
+/**
+ * Chat completion client for the agent pipeline: LRU cache with TTL keyed on the normalized
+ * request, coalescing of concurrent identical requests, and a pluggable backend
+ */
+class LLMClient {
+  constructor(options = {}) {
+    this.maxEntries = options.maxEntries || LLM_CONFIG.cacheMaxEntries;
+    this.ttlMs = options.ttlMs || LLM_CONFIG.cacheTtlMs;
+    // key -> { response, expiresAt }, in least-recently-used order
+    this.cache = new Map();
+    // key -> Promise of the response for requests still waiting on the backend
+    this.inFlight = new Map();
+    this.stats = { requests: 0, hits: 0, coalesced: 0, misses: 0, errors: 0 };
+    this.setBackend(options.backend || LLM_CONFIG.backend);
+  }
+
+  /**
+   * Switch backend: 'openai', 'stub', or any object with an async create(params)
+   */
+  setBackend(backend) {
+    if (backend === 'stub') {
+      this.backend = new StubBackend(LLM_CONFIG.stubLatencyMs);
+    } else if (backend === 'openai') {
+      this.backend = new OpenAIBackend();
+    } else {
+      this.backend = backend;
+    }
+    this.clear();
+    console.log(`🤖 LLM backend: ${this.backend.name || 'custom'}`);
+  }
+
+  /**
+   * Drop-in for openai.chat.completions.create(params)
+   */
+  async complete(params) {
+    this.stats.requests += 1;
+    const key = requestKey(params);
+
+    const cached = this.cache.get(key);
+    if (cached && cached.expiresAt > Date.now()) {
+      this.cache.delete(key);
+      this.cache.set(key, cached);
+      this.stats.hits += 1;
+      return cached.response;
+    }
+    this.cache.delete(key);
+
+    if (this.inFlight.has(key)) {
+      this.stats.coalesced += 1;
+      return this.inFlight.get(key);
+    }
+
+    this.stats.misses += 1;
+    const request = Promise.resolve()
+      .then(() => this.backend.create(params))
+      .then((response) => {
+        this.cache.set(key, { response, expiresAt: Date.now() + this.ttlMs });
+        while (this.cache.size > this.maxEntries) {
+          this.cache.delete(this.cache.keys().next().value);
+        }
+        return response;
+      })
+      .catch((error) => {
+        // Errors are shared by coalesced callers but never cached
+        this.stats.errors += 1;
+        throw error;
+      })
+      .finally(() => this.inFlight.delete(key));
+    this.inFlight.set(key, request);
+    return request;
+  }
+
+  clear() {
+    this.cache.clear();
+  }
+
+  getStats() {
+    return {
+      backend: this.backend.name || 'custom',
+      cacheSize: this.cache.size,
+      inFlight: this.inFlight.size,
+      ...this.stats
+    };
+  }
+}
+
+// Create singleton instance
+const llmClient = new LLMClient();
+
+module.exports = llmClient;
+module.exports.LLMClient = LLMClient;
+module.exports.StubBackend = StubBackend;
+module.exports.requestKey = requestKey;
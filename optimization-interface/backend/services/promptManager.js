@@ -1,10 +1,51 @@
 const fs = require('fs-extra');
 const path = require('path');
 
+const PLACEHOLDER_PATTERN = /\{(\w+)\}/;
+
+/**
+ * Split a prompt into literal text and {placeholder} names once, so rendering is a join
+ * @param {string} content - Prompt file content
+ * @returns {Array<string>} Segments; odd indices are placeholder names
+ */
+function compileTemplate(content) {
+  return content.split(PLACEHOLDER_PATTERN);
+}
+
+/**
+ * Render a compiled prompt; placeholders without a value are left as written
+ * @param {Array<string>} segments - Output of compileTemplate
+ * @param {Object} values - Placeholder name -> text
+ * @returns {string} Rendered prompt
+ */
+function renderTemplate(segments, values) {
+  let output = '';
+  for (let i = 0; i < segments.length; i++) {
+    if (i % 2 === 0) {
+      output += segments[i];
+    } else {
+      output += Object.prototype.hasOwnProperty.call(values, segments[i]) ? String(values[segments[i]]) : `{${segments[i]}}`;
+    }
+  }
+  return output;
+}
+
+function formatConversationHistory(history) {
+  if (!history || history.length === 0) {
+    return 'No previous conversation.';
+  }
+  return history.map(msg => {
+    const role = msg.role === 'user' ? 'User' : 'Assistant';
+    return `${role}: ${msg.content}`;
+  }).join('\n');
+}
+
 class PromptManager {
   constructor() {
     this.promptsDir = path.join(__dirname, '..', 'prompts');
     this.prompts = {};
+    // prompt name -> compiled template (see compileTemplate)
+    this.templates = {};
     this.loaded = false;
     // Initialize immediately
     this.initialize();
@@ -44,6 +85,7 @@ class PromptManager {
           try {
             const promptContent = fs.readFileSync(promptPath, 'utf8');
             this.prompts[promptName] = promptContent;
+            this.templates[promptName] = compileTemplate(promptContent);
             console.log(`📝 Loaded prompt: ${promptName}`);
           } catch (readError) {
             console.error(`❌ Error reading prompt file ${file}:`, readError);
@@ -76,49 +118,34 @@ class PromptManager {
     return this.prompts[promptName];
   }
 
+  /**
+   * Render a prompt from its compiled template
+   * @param {string} promptName - Name of the prompt file (without .md extension)
+   * @param {Object} values - Placeholder name -> text
+   * @returns {string} Formatted prompt
+   */
+  render(promptName, values) {
+    this.getPrompt(promptName);
+    return renderTemplate(this.templates[promptName], values);
+  }
+
   /**
    * Get conversation manager prompt with context
    * @param {Object} context - Current conversation context
    * @returns {string} Formatted prompt
    */
   getConversationPrompt(context = {}) {
-    let prompt = this.getPrompt('conversation-manager');
-    
-    // Replace placeholders with actual values
-    prompt = prompt.replace('{currentStep}', context.currentStep || 'Not set');
-    prompt = prompt.replace('{currentConfiguration}', JSON.stringify(context.formData || {}, null, 2));
-    prompt = prompt.replace('{previousActions}', JSON.stringify(context.previousActions || [], null, 2));
-    
-    // Add agent results to the context
-    if (context.extractedParameters) {
-      prompt = prompt.replace('{extractedParameters}', JSON.stringify(context.extractedParameters, null, 2));
-    } else {
-      prompt = prompt.replace('{extractedParameters}', 'No parameters extracted');
-    }
-    
-    if (context.validationResult) {
-      prompt = prompt.replace('{validationResult}', JSON.stringify(context.validationResult, null, 2));
-    } else {
-      prompt = prompt.replace('{validationResult}', 'No validation performed');
-    }
-    
-    if (context.recommendationResult) {
-      prompt = prompt.replace('{recommendationResult}', JSON.stringify(context.recommendationResult, null, 2));
-    } else {
-      prompt = prompt.replace('{recommendationResult}', 'No recommendations provided');
-    }
-    
-    // Format conversation history
-    let conversationHistoryText = 'No previous conversation.';
-    if (context.conversationHistory && context.conversationHistory.length > 0) {
-      conversationHistoryText = context.conversationHistory.map(msg => {
-        const role = msg.role === 'user' ? 'User' : 'Assistant';
-        return `${role}: ${msg.content}`;
-      }).join('\n');
-    }
-    prompt = prompt.replace('{conversationHistory}', conversationHistoryText);
-    
-    return prompt;
+    const json = (value) => JSON.stringify(value, null, 2);
+    return this.render('conversation-manager', {
+      currentStep: context.currentStep || 'Not set',
+      currentConfiguration: json(context.formData || {}),
+      previousActions: json(context.previousActions || []),
+      // Add agent results to the context
+      extractedParameters: context.extractedParameters ? json(context.extractedParameters) : 'No parameters extracted',
+      validationResult: context.validationResult ? json(context.validationResult) : 'No validation performed',
+      recommendationResult: context.recommendationResult ? json(context.recommendationResult) : 'No recommendations provided',
+      conversationHistory: formatConversationHistory(context.conversationHistory)
+    });
   }
 
   /**
@@ -128,30 +155,12 @@ class PromptManager {
    * @returns {string} Formatted prompt
    */
   getUnderstandingAgentPrompt(userInput, context = {}) {
-    let prompt = this.getPrompt('understanding-agent');
-    
-    // Replace placeholders with actual values
-    prompt = prompt.replace('{userInput}', userInput);
-    prompt = prompt.replace('{currentContext}', JSON.stringify(context, null, 2));
-    
-    // Format conversation history
-    let conversationHistoryText = 'No previous conversation.';
-    if (context.conversationHistory && context.conversationHistory.length > 0) {
-      conversationHistoryText = context.conversationHistory.map(msg => {
-        const role = msg.role === 'user' ? 'User' : 'Assistant';
-        return `${role}: ${msg.content}`;
-      }).join('\n');
-    }
-    prompt = prompt.replace('{conversationHistory}', conversationHistoryText);
-    
-    // Format workflow state
-    let workflowStateText = 'No workflow state.';
-    if (context.workflowState) {
-      workflowStateText = JSON.stringify(context.workflowState, null, 2);
-    }
-    prompt = prompt.replace('{workflowState}', workflowStateText);
-    
-    return prompt;
+    return this.render('understanding-agent', {
+      userInput,
+      currentContext: JSON.stringify(context, null, 2),
+      conversationHistory: formatConversationHistory(context.conversationHistory),
+      workflowState: context.workflowState ? JSON.stringify(context.workflowState, null, 2) : 'No workflow state.'
+    });
   }
 
   /**
@@ -163,15 +172,12 @@ class PromptManager {
    * @returns {string} Formatted prompt
    */
   getValidationAgentPrompt(extractedParameters, userInput, currentConfiguration = {}, workflowState = {}) {
-    let prompt = this.getPrompt('validation-agent');
-    
-    // Replace placeholders with actual values
-    prompt = prompt.replace('{extractedParameters}', JSON.stringify(extractedParameters, null, 2));
-    prompt = prompt.replace('{userInput}', userInput);
-    prompt = prompt.replace('{currentConfiguration}', JSON.stringify(currentConfiguration, null, 2));
-    prompt = prompt.replace('{workflowState}', JSON.stringify(workflowState, null, 2));
-    
-    return prompt;
+    return this.render('validation-agent', {
+      extractedParameters: JSON.stringify(extractedParameters, null, 2),
+      userInput,
+      currentConfiguration: JSON.stringify(currentConfiguration, null, 2),
+      workflowState: JSON.stringify(workflowState, null, 2)
+    });
   }
 
   /**
@@ -183,15 +189,12 @@ class PromptManager {
    * @returns {string} Formatted prompt
    */
   getRecommendationAgentPrompt(userInput, extractedParameters, validationResult, workflowState = {}) {
-    let prompt = this.getPrompt('recommendation-agent');
-    
-    // Replace placeholders with actual values
-    prompt = prompt.replace('{userInput}', userInput);
-    prompt = prompt.replace('{extractedParameters}', JSON.stringify(extractedParameters, null, 2));
-    prompt = prompt.replace('{validationResult}', JSON.stringify(validationResult, null, 2));
-    prompt = prompt.replace('{workflowState}', JSON.stringify(workflowState, null, 2));
-    
-    return prompt;
+    return this.render('recommendation-agent', {
+      userInput,
+      extractedParameters: JSON.stringify(extractedParameters, null, 2),
+      validationResult: JSON.stringify(validationResult, null, 2),
+      workflowState: JSON.stringify(workflowState, null, 2)
+    });
   }
 
   /**
@@ -208,6 +211,7 @@ class PromptManager {
   async reloadPrompts() {
     console.log('🔄 Reloading prompts...');
     this.prompts = {};
+    this.templates = {};
     await this.loadPrompts();
   }
 
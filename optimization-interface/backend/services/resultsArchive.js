@@ -0,0 +1,129 @@
+const fs = require('fs-extra');
+const path = require('path');
+const crypto = require('crypto');
+const archiver = require('archiver');
+
+class ResultsArchiveCache {
+  constructor() {
+    this.cacheDir = path.join(__dirname, '..', 'results', 'archives');
+    // archive path (key + content hash) -> promise resolved once that archive is on disk
+    this.inFlight = new Map();
+  }
+
+  /**
+   * Hash of a results directory: relative path, size and mtime of every file
+   */
+  async fingerprint(dir) {
+    const hash = crypto.createHash('sha1');
+    const walk = async (current) => {
+      const entries = (await fs.readdir(current, { withFileTypes: true }))
+        .sort((a, b) => a.name.localeCompare(b.name));
+      for (const entry of entries) {
+        const fullPath = path.join(current, entry.name);
+        if (entry.isDirectory()) {
+          await walk(fullPath);
+        } else {
+          const stats = await fs.stat(fullPath);
+          hash.update(`${path.relative(dir, fullPath)}\0${stats.size}\0${stats.mtimeMs}\n`);
+        }
+      }
+    };
+    await walk(dir);
+    return hash.digest('hex');
+  }
+
+  archivePath(key, hash) {
+    return path.join(this.cacheDir, `${key}-${hash}.zip`);
+  }
+
+  /**
+   * Send a ZIP of resultsPath. The first request for a given key and content hash streams
+   * the archive to the response while writing the cache file; later and concurrent requests
+   * are served from that file, so each version of the results is compressed once. Builds are
+   * tracked per archive path: two keys with identical contents each get their own file.
+   */
+  async send(req, res, { key, resultsPath, downloadName }) {
+    const hash = await this.fingerprint(resultsPath);
+    const etag = `"${hash}"`;
+    res.setHeader('ETag', etag);
+    if (req.headers['if-none-match'] === etag) {
+      return res.status(304).end();
+    }
+
+    const cachedPath = this.archivePath(key, hash);
+    await fs.ensureDir(this.cacheDir);
+    if (!this.inFlight.has(cachedPath) && !await fs.pathExists(cachedPath)) {
+      // pathExists yields, so check again: build() registers itself synchronously
+      if (!this.inFlight.has(cachedPath)) {
+        return this.build(res, { key, resultsPath, cachedPath, downloadName });
+      }
+    }
+    await this.inFlight.get(cachedPath);
+    return res.download(cachedPath, downloadName);
+  }
+
+  /**
+   * Compress resultsPath once, teeing the archive into the response and the cache file
+   */
+  async build(res, { key, resultsPath, cachedPath, downloadName }) {
+    const partialPath = `${cachedPath}.${process.pid}.partial`;
+    const output = fs.createWriteStream(partialPath);
+    const archive = archiver('zip', { zlib: { level: 9 } });
+
+    const written = new Promise((resolve, reject) => {
+      output.on('close', resolve);
+      output.on('error', reject);
+      archive.on('error', reject);
+    });
+    const build = written
+      .then(() => fs.move(partialPath, cachedPath, { overwrite: true }))
+      .then(() => this.evictStale(key, cachedPath))
+      .finally(() => this.inFlight.delete(cachedPath));
+    this.inFlight.set(cachedPath, build.catch(() => {}));
+
+    res.attachment(downloadName);
+    res.setHeader('Content-Type', 'application/zip');
+    // A client that disconnects must not stop the cache file from being completed
+    res.on('close', () => archive.unpipe(res));
+
+    archive.pipe(output);
+    archive.pipe(res);
+    archive.directory(resultsPath, false);
+    archive.finalize();
+
+    try {
+      await build;
+      console.log(`📦 Cached results archive ${path.basename(cachedPath)}`);
+    } catch (error) {
+      await fs.remove(partialPath).catch(() => {});
+      throw error;
+    }
+  }
+
+  /**
+   * Remove archives of older versions of the same results
+   */
+  async evictStale(key, currentPath) {
+    const files = await fs.readdir(this.cacheDir);
+    for (const file of files) {
+      const filePath = path.join(this.cacheDir, file);
+      if (file.startsWith(`${key}-`) && file.endsWith('.zip') && filePath !== currentPath) {
+        await fs.remove(filePath).catch(console.error);
+      }
+    }
+  }
+
+  /**
+   * Drop every cached archive for a key (e.g. when a job is cleaned up)
+   */
+  async remove(key) {
+    if (await fs.pathExists(this.cacheDir)) {
+      await this.evictStale(key, null);
+    }
+  }
+}
+
+// Create singleton instance
+const resultsArchive = new ResultsArchiveCache();
+
+module.exports = resultsArchive;
@@ -0,0 +1,110 @@
+const fs = require('fs-extra');
+const path = require('path');
+
+const TIMESTAMP_PATTERN = /^\d{8}_\d{6}$/;
+
+class ResultsIndex {
+  constructor() {
+    this.resultsRoot = path.join(__dirname, '..', 'uploads', 'results');
+    // "<timestamp>/<filename>" -> absolute file path
+    this.files = new Map();
+    // extracted upload directory -> keys it contributed
+    this.runs = new Map();
+    this.ready = null;
+  }
+
+  key(timestamp, filename) {
+    return `${timestamp}/${filename}`;
+  }
+
+  /**
+   * Build the index from every extracted upload under uploads/results (async, once)
+   */
+  build() {
+    if (!this.ready) {
+      this.ready = this.scan().catch((error) => {
+        console.error('❌ Error building results index:', error);
+        this.ready = null;
+      });
+    }
+    return this.ready;
+  }
+
+  async scan() {
+    await fs.ensureDir(this.resultsRoot);
+    const uploads = await fs.readdir(this.resultsRoot);
+    for (const upload of uploads) {
+      await this.addRun(path.join(this.resultsRoot, upload));
+    }
+    console.log(`🗂️  Results index ready: ${this.files.size} files in ${this.runs.size} uploads`);
+  }
+
+  /**
+   * Index (or re-index) one extracted results ZIP; its files win over older uploads
+   */
+  async addRun(extractDir) {
+    const stats = await fs.stat(extractDir).catch(() => null);
+    if (!stats || !stats.isDirectory()) {
+      return 0;
+    }
+
+    this.removeRun(extractDir);
+    const keys = [];
+    const entries = await fs.readdir(extractDir);
+    for (const timestamp of entries.filter(entry => TIMESTAMP_PATTERN.test(entry))) {
+      const timestampPath = path.join(extractDir, timestamp);
+      const files = await fs.readdir(timestampPath).catch(() => []);
+      for (const filename of files) {
+        const key = this.key(timestamp, filename);
+        this.files.set(key, path.join(timestampPath, filename));
+        keys.push(key);
+      }
+    }
+    this.runs.set(extractDir, keys);
+    return keys.length;
+  }
+
+  /**
+   * Index a single file as soon as it has been extracted
+   */
+  addFile(extractDir, timestamp, filename, filePath) {
+    const key = this.key(timestamp, filename);
+    this.files.set(key, filePath);
+    if (!this.runs.has(extractDir)) {
+      this.runs.set(extractDir, []);
+    }
+    this.runs.get(extractDir).push(key);
+  }
+
+  /**
+   * Drop every entry contributed by an extracted upload directory
+   */
+  removeRun(extractDir) {
+    const keys = this.runs.get(extractDir) || [];
+    for (const key of keys) {
+      if (this.files.get(key) && this.files.get(key).startsWith(extractDir + path.sep)) {
+        this.files.delete(key);
+      }
+    }
+    this.runs.delete(extractDir);
+  }
+
+  /**
+   * O(1) lookup of a results file; null when it is not indexed
+   */
+  lookup(timestamp, filename) {
+    return this.files.get(this.key(timestamp, filename)) || null;
+  }
+
+  /**
+   * Forget a single entry whose file disappeared from disk
+   */
+  invalidate(timestamp, filename) {
+    this.files.delete(this.key(timestamp, filename));
+  }
+}
+
+// Create singleton instance
+const resultsIndex = new ResultsIndex();
+
+module.exports = resultsIndex;
@@ -0,0 +1,264 @@
+const fs = require('fs-extra');
+const path = require('path');
+const { StringDecoder } = require('string_decoder');
+const unzipper = require('unzipper');
+const resultsIndex = require('./resultsIndex');
+const chartRenderer = require('./chartRenderer');
+
+const TIMESTAMP_PATTERN = /^\d{8}_\d{6}$/;
+const SUMMARY_FILE_PATTERN = /^(optimization_log\.txt|optimization_report.*\.(md|txt))$/;
+// Only the top of a report holds the summary; the rest lists per-period locations
+const SUMMARY_BYTES = 64 * 1024;
+
+// Extract a field from log/report text
+function extractValue(content, regex) {
+  const match = content.match(regex);
+  return match ? match[1] : null;
+}
+
+function extractNumericValue(content, regex) {
+  const match = content.match(regex);
+  return match ? parseFloat(match[1]) : 0;
+}
+
+/**
+ * Summary metrics from optimization_log.txt / optimization_report_*.md text
+ */
+function summaryFromText(content) {
+  return {
+    solutionStatus: extractValue(content, /Solution Status:\s*(\w+)/),
+    objectiveValue: extractNumericValue(content, /Objective Value:\s*([\d.]+)/),
+    totalEnergyFromGrid: extractNumericValue(content, /Total Energy from Grid:\s*([\d.]+)/),
+    totalMissedWork: extractNumericValue(content, /Total Missed Work:\s*([\d.]+)/),
+    totalElectricityCost: extractNumericValue(content, /Total Electricity Cost:\s*([\d.]+)/),
+    totalCarbonEmissionsCost: extractNumericValue(content, /Total Carbon Emissions Cost:\s*([\d.]+)/),
+    workCompletionPercentage: extractNumericValue(content, /Work Completion Percentage:\s*([\d.]+)/),
+    solveTime: extractNumericValue(content, /Solve Time:\s*([\d.]+)/),
+    peakPower: extractNumericValue(content, /Peak Power:\s*([\d.]+)/),
+    averagePower: extractNumericValue(content, /Average Power:\s*([\d.]+)/),
+    dutyCycle: extractNumericValue(content, /Duty Cycle:\s*([\d.]+)/),
+    energyEfficiency: extractNumericValue(content, /Energy Efficiency:\s*([\d.]+)/),
+    initialMCSEnergy: extractNumericValue(content, /Initial MCS Energy:\s*([\d.]+)/),
+    finalMCSEnergy: extractNumericValue(content, /Final MCS Energy:\s*([\d.]+)/),
+    netEnergyChange: extractNumericValue(content, /Net Energy Change:\s*([\d.]+)/),
+    numMCS: extractNumericValue(content, /Number of MCSs:\s*(\d+)/),
+    numCEV: extractNumericValue(content, /Number of EVs:\s*(\d+)/),
+    numNodes: extractNumericValue(content, /Number of nodes:\s*(\d+)/),
+    numTimePeriods: extractNumericValue(content, /Number of time periods:\s*(\d+)/)
+  };
+}
+
+/**
+ * Fill fleet-size fields the text did not provide from result CSV headers
+ * (MCS_<m>_SOE_kWh, CEV_<e>_SOE_kWh, Site_<i>_Work_Power_kW) and row counts
+ */
+function applyCsvHeaders(summary, csvInfo) {
+  const countColumns = (pattern) => {
+    const ids = new Set();
+    for (const { header } of csvInfo.values()) {
+      for (const column of header) {
+        const match = column.match(pattern);
+        if (match) {
+          ids.add(match[1]);
+        }
+      }
+    }
+    return ids.size;
+  };
+  if (!summary.numMCS) {
+    summary.numMCS = countColumns(/^MCS_(\d+)_SOE_kWh$/);
+  }
+  if (!summary.numCEV) {
+    summary.numCEV = countColumns(/^CEV_(\d+)_SOE_kWh$/);
+  }
+  if (!summary.numTimePeriods) {
+    summary.numTimePeriods = Math.max(0, ...Array.from(csvInfo.values(), info => info.rows));
+  }
+  return summary;
+}
+
+/**
+ * Chart descriptors for one run, in the shape the results viewer expects. Runs saved with
+ * deferred plots have chart CSVs but no PNGs; their images are rendered on first request.
+ */
+function chartsForRun(timestamp, files) {
+  const csvNames = new Set(files.filter(file => file.endsWith('.csv')).map(file => file.replace('.csv', '')));
+  // Dot-prefixed PNGs are charts still being written by the renderer
+  const pngs = new Set(files.filter(file => file.endsWith('.png') && !file.startsWith('.')));
+  const deferred = Array.from(csvNames, name => `${name}.png`)
+    .filter(file => !pngs.has(file) && chartRenderer.isChart(file));
+  return [...pngs, ...deferred]
+    .sort()
+    .map(file => {
+      const chartName = file.replace('.png', '');
+      const hasCsv = csvNames.has(chartName);
+      return {
+        name: chartName,
+        type: hasCsv ? 'INTERACTIVE' : 'PNG',
+        imageUrl: `/api/results/image/${timestamp}/${file}`,
+        downloadUrl: `/api/results/download/${timestamp}/${file}`,
+        csvDataUrl: hasCsv ? `/api/results/csv/${timestamp}/${chartName}.csv` : null,
+        fileSize: 0
+      };
+    });
+}
+
+class ResultsUploadParser {
+  constructor() {
+    // uploadId -> { status, timestamp, runs, charts, error }
+    this.uploads = new Map();
+  }
+
+  get(uploadId) {
+    return this.uploads.get(uploadId) || null;
+  }
+
+  /**
+   * Extract a results ZIP entry by entry. Returns { summary, done }: `summary` resolves with
+   * { timestamp, summary, charts } as soon as the first run's summary is known, `done` when
+   * every entry has been written and indexed.
+   */
+  parse(uploadId, zipPath, extractDir) {
+    const upload = { status: 'extracting', timestamp: null, runs: {}, charts: [], error: null };
+    this.uploads.set(uploadId, upload);
+
+    let resolveSummary;
+    let rejectSummary;
+    const summary = new Promise((resolve, reject) => {
+      resolveSummary = resolve;
+      rejectSummary = reject;
+    });
+
+    const state = { summaryText: '', csvInfo: new Map(), sentSummary: false };
+    const publishSummary = () => {
+      if (state.sentSummary || !upload.timestamp) {
+        return;
+      }
+      state.sentSummary = true;
+      const text = state.summaryText;
+      resolveSummary({
+        timestamp: upload.timestamp,
+        summary: (text || state.csvInfo.size) ? applyCsvHeaders(summaryFromText(text), state.csvInfo) : null,
+        charts: chartsForRun(upload.timestamp, upload.runs[upload.timestamp])
+      });
+    };
+
+    const done = (async () => {
+      const zip = fs.createReadStream(zipPath).pipe(unzipper.Parse({ forceStream: true }));
+      for await (const entry of zip) {
+        const parts = entry.path.split(/[\\/]/).filter(Boolean);
+        const dest = path.resolve(extractDir, entry.path);
+        if (entry.type !== 'File' || !dest.startsWith(path.resolve(extractDir) + path.sep)) {
+          entry.autodrain();
+          continue;
+        }
+
+        // Same layout as the job download ZIP (and resultsIndex): <timestamp>/<file>
+        const timestamp = parts.length === 2 && TIMESTAMP_PATTERN.test(parts[0]) ? parts[0] : null;
+        const filename = parts[parts.length - 1];
+        if (timestamp && upload.timestamp && timestamp !== upload.timestamp) {
+          // The first run is complete once another run starts
+          publishSummary();
+        }
+
+        await fs.ensureDir(path.dirname(dest));
+        const collector = this.collectorFor(timestamp, filename, upload, state);
+        await new Promise((resolve, reject) => {
+          const output = fs.createWriteStream(dest);
+          entry.on('data', chunk => collector && collector(chunk));
+          entry.on('error', reject);
+          output.on('finish', resolve);
+          output.on('error', reject);
+          entry.pipe(output);
+        });
+        if (collector && collector.end) {
+          collector.end();
+        }
+
+        if (timestamp) {
+          if (!upload.timestamp) {
+            upload.timestamp = timestamp;
+          }
+          (upload.runs[timestamp] = upload.runs[timestamp] || []).push(filename);
+          resultsIndex.addFile(extractDir, timestamp, filename, dest);
+          if (timestamp === upload.timestamp && this.summaryComplete(state)) {
+            publishSummary();
+          }
+        }
+      }
+
+      if (!upload.timestamp) {
+        throw new Error('No timestamp directory found in results');
+      }
+      publishSummary();
+      upload.charts = chartsForRun(upload.timestamp, upload.runs[upload.timestamp]);
+      upload.status = 'ready';
+      return upload;
+    })();
+
+    done.catch((error) => {
+      upload.status = 'error';
+      upload.error = error.message;
+      rejectSummary(error);
+    });
+
+    return { summary, done };
+  }
+
+  /**
+   * Tap for entries that feed the summary: report/log text (first 64 KB) and CSV header + row count
+   */
+  collectorFor(timestamp, filename, upload, state) {
+    if (!timestamp || (upload.timestamp && timestamp !== upload.timestamp)) {
+      return null;
+    }
+    if (SUMMARY_FILE_PATTERN.test(filename)) {
+      state.sawSummaryFile = true;
+      let kept = 0;
+      // Chunks are appended as-is (a decoder keeps split UTF-8 characters whole), so values
+      // that straddle a chunk boundary stay intact; files are separated once they end
+      const decoder = new StringDecoder('utf8');
+      const collect = (chunk) => {
+        if (kept < SUMMARY_BYTES) {
+          state.summaryText += decoder.write(chunk.subarray(0, Math.min(chunk.length, SUMMARY_BYTES - kept)));
+          kept += chunk.length;
+        }
+      };
+      collect.end = () => {
+        state.summaryText += decoder.end() + '\n';
+      };
+      return collect;
+    }
+    if (filename.endsWith('.csv')) {
+      const info = { header: [], rows: 0, firstLine: '' };  // rows excludes the header
+      state.csvInfo.set(filename, info);
+      return (chunk) => {
+        const text = chunk.toString('utf8');
+        if (!info.header.length) {
+          const newline = text.indexOf('\n');
+          info.firstLine += newline >= 0 ? text.slice(0, newline) : text;
+          if (newline >= 0) {
+            info.header = info.firstLine.trim().split(',');
+            info.rows -= 1;
+          }
+        }
+        for (let i = text.indexOf('\n'); i >= 0; i = text.indexOf('\n', i + 1)) {
+          info.rows += 1;
+        }
+      };
+    }
+    return null;
+  }
+
+  summaryComplete(state) {
+    // Report parsed and both SOE files seen, so fleet sizes are known too
+    return state.sawSummaryFile &&
+      state.csvInfo.has('03_mcs_state_of_energy.csv') &&
+      state.csvInfo.has('04_cev_state_of_energy.csv');
+  }
+}
+
+// Create singleton instance
+const resultsUploadParser = new ResultsUploadParser();
+
+module.exports = resultsUploadParser;
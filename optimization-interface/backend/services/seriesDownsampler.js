@@ -0,0 +1,145 @@
+const fs = require('fs-extra');
+
+// Columns always kept so the viewer can label the x axis
+const TIME_COLUMNS = ['Time_Period', 'Time_Label'];
+
+/**
+ * Min/max downsampling of result CSV time series.
+ *
+ * The rows are split into buckets, and in every bucket the rows holding the minimum and
+ * maximum of each selected numeric column are kept (plus the first and last row), so every
+ * plotted series keeps its own peaks and troughs. The union of these rows is fitted to the
+ * point budget by using fewer buckets; when even one bucket holds more extremes than the
+ * budget allows (very many columns), the rows that are extremes of the most series, with
+ * the largest swings, are kept.
+ * Output is CSV with the same header layout, restricted to the projected columns
+ * (`columns` entries may use `*` wildcards, e.g. `CEV_*_SOE_kWh`).
+ */
+class SeriesDownsampler {
+  constructor(maxEntries = 200) {
+    this.maxEntries = maxEntries;
+    // "<path>|<mtime>|<columns>|<points>" -> CSV text, in least-recently-used order
+    this.cache = new Map();
+  }
+
+  async get(filePath, { columns = null, points = 1000 } = {}) {
+    const stats = await fs.stat(filePath);
+    const key = `${filePath}|${stats.mtimeMs}|${columns ? columns.join(',') : '*'}|${points}`;
+
+    if (this.cache.has(key)) {
+      const cached = this.cache.get(key);
+      this.cache.delete(key);
+      this.cache.set(key, cached);
+      return cached;
+    }
+
+    const csv = this.downsample(await fs.readFile(filePath, 'utf8'), columns, points);
+    this.cache.set(key, csv);
+    if (this.cache.size > this.maxEntries) {
+      this.cache.delete(this.cache.keys().next().value);
+    }
+    return csv;
+  }
+
+  downsample(text, columns, points) {
+    const lines = text.split(/\r?\n/).filter(line => line.length > 0);
+    if (lines.length === 0) {
+      return '';
+    }
+    const header = lines[0].split(',').map(h => h.trim());
+    const rows = lines.slice(1).map(line => line.split(','));
+
+    // Column projection (time columns are always included)
+    const patterns = columns && columns.map(column => new RegExp(
+      `^${column.split('*').map(part => part.replace(/[.+?^${}()|[\]\\]/g, '\\$&')).join('.*')}$`));
+    const wanted = patterns
+      ? header.filter(name => TIME_COLUMNS.includes(name) || patterns.some(pattern => pattern.test(name)))
+      : header;
+    const indices = wanted.map(name => header.indexOf(name));
+
+    const numeric = indices.filter(i => !TIME_COLUMNS.includes(header[i]) &&
+      rows.every(row => row[i] === undefined || row[i].trim() === '' || !isNaN(Number(row[i]))));
+    const values = numeric.map(i => Float64Array.from(rows, row => Number(row[i])));
+
+    let keep = rows.map((_, r) => r);
+    if (rows.length > points) {
+      keep = values.length > 0
+        ? this.selectRows(values, rows.length, points)
+        : Array.from({ length: points }, (_, k) => Math.round(k * (rows.length - 1) / (points - 1)));
+    }
+
+    const out = [wanted.join(',')];
+    for (const r of keep) {
+      out.push(indices.map(i => rows[r][i] !== undefined ? rows[r][i] : '').join(','));
+    }
+    return out.join('\n') + '\n';
+  }
+
+  /**
+   * Indices of at most `points` rows: the first and last row plus the per-column minimum and
+   * maximum rows of as many buckets as the budget allows
+   */
+  selectRows(values, rowCount, points) {
+    const ranges = values.map((series) => {
+      let min = Infinity;
+      let max = -Infinity;
+      for (const value of series) {
+        if (value < min) min = value;
+        if (value > max) max = value;
+      }
+      return max - min || 1;
+    });
+
+    let buckets = Math.max(1, Math.floor((points - 2) / 2));
+    for (;;) {
+      const scores = this.extremes(values, ranges, rowCount, buckets);
+      if (scores.size <= points) {
+        return Array.from(scores.keys()).sort((a, b) => a - b);
+      }
+      if (buckets === 1) {
+        // The first and last row score Infinity, so they always survive the cut
+        return Array.from(scores.entries())
+          .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+          .slice(0, points)
+          .map(([row]) => row)
+          .sort((a, b) => a - b);
+      }
+      // Fewer buckets, in proportion to the overshoot
+      buckets = Math.max(1, Math.min(buckets - 1, Math.floor(buckets * (points - 2) / (scores.size - 2))));
+    }
+  }
+
+  /**
+   * Rows holding a column's minimum or maximum within one of `buckets` buckets, mapped to
+   * the summed relative swing of the columns they are extremes of
+   */
+  extremes(values, ranges, rowCount, buckets) {
+    const scores = new Map([[0, Infinity], [rowCount - 1, Infinity]]);
+    const size = (rowCount - 2) / buckets;
+    for (let b = 0; b < buckets; b++) {
+      const start = 1 + Math.floor(b * size);
+      const end = Math.min(rowCount - 1, 1 + Math.floor((b + 1) * size));
+      values.forEach((series, k) => {
+        let minIndex = start;
+        let maxIndex = start;
+        for (let r = start + 1; r < end; r++) {
+          if (series[r] < series[minIndex]) minIndex = r;
+          if (series[r] > series[maxIndex]) maxIndex = r;
+        }
+        // A flat stretch is drawn correctly from its neighbours
+        if (start >= end || series[maxIndex] === series[minIndex]) {
+          return;
+        }
+        const swing = (series[maxIndex] - series[minIndex]) / ranges[k];
+        scores.set(minIndex, (scores.get(minIndex) || 0) + swing);
+        scores.set(maxIndex, (scores.get(maxIndex) || 0) + swing);
+      });
+    }
+    return scores;
+  }
+}
+
+// Create singleton instance
+const seriesDownsampler = new SeriesDownsampler();
+
+module.exports = seriesDownsampler;
@@ -0,0 +1,232 @@
+const fs = require('fs-extra');
+const path = require('path');
+const crypto = require('crypto');
+const config = require('../config');
+
+// Julia sources whose changes can change a solution: every module under src/core plus the entry script
+const MODEL_DIR = path.join(__dirname, '..', '..', '..', 'src', 'core');
+const MODEL_SCRIPT = path.join(__dirname, '..', '..', '..', 'mcs_optimization_main.jl');
+
+// Line endings, BOMs and trailing blanks do not change what the optimizer reads
+function normalizeCsv(text) {
+  return text
+    .replace(/^\uFEFF/, '')
+    .split(/\r\n|\r|\n/)
+    .map(line => line.trimEnd())
+    .join('\n')
+    .replace(/\n+$/, '');
+}
+
+/**
+ * Solve results keyed by a hash of the normalized csv_files contents, the model version
+ * (a hash of the Julia sources, taken at startup) and the solver options that change the
+ * answer, so editing the model never serves solutions of its previous version. Entries
+ * live under results/solve-cache/<key>/ (the results directory plus entry.json) and are
+ * evicted least-recently-used under a size cap. Identical submissions that arrive while
+ * one is solving wait for that solve without taking a worker slot.
+ */
+class SolveCache {
+  constructor() {
+    this.cacheDir = path.join(__dirname, '..', config.solveCache.dir);
+    this.maxBytes = config.solveCache.maxMb * 1024 * 1024;
+    // key -> { sizeBytes, lastAccess }
+    this.entries = new Map();
+    // key -> { jobId, promise } of the solve currently producing this key
+    this.inFlight = new Map();
+    this.stats = { hits: 0, misses: 0, coalesced: 0, stored: 0, evicted: 0 };
+    this.ready = null;
+    this.modelVersion = null;
+  }
+
+  /**
+   * Hash of the Julia model sources (computed once per process)
+   */
+  model() {
+    if (!this.modelVersion) {
+      this.modelVersion = (async () => {
+        const hash = crypto.createHash('sha256');
+        const files = (await fs.readdir(MODEL_DIR).catch(() => []))
+          .filter(name => name.endsWith('.jl'))
+          .sort()
+          .map(name => path.join(MODEL_DIR, name));
+        files.push(MODEL_SCRIPT);
+        for (const file of files) {
+          const text = await fs.readFile(file, 'utf8').catch(() => '');
+          hash.update(`${path.basename(file)}\0${text}\0`);
+        }
+        return hash.digest('hex').slice(0, 16);
+      })();
+    }
+    return this.modelVersion;
+  }
+
+  /**
+   * Cache key of a csv_files directory and the job options that affect the solution
+   */
+  async key(csvFilesDir, options = {}) {
+    const hash = crypto.createHash('sha256');
+    const files = (await fs.readdir(csvFilesDir))
+      .filter(name => name.toLowerCase().endsWith('.csv'))
+      .sort();
+    for (const name of files) {
+      const text = await fs.readFile(path.join(csvFilesDir, name), 'utf8');
+      hash.update(`${name}\0${normalizeCsv(text)}\0`);
+    }
+    hash.update(JSON.stringify({
+      model: await this.model(),
+      estimate: Boolean(options.estimate),
+      mipGap: options.mipGap || null
+    }));
+    return hash.digest('hex');
+  }
+
+  /**
+   * Load the entry list from disk (async, once)
+   */
+  load() {
+    this.model();
+    if (!this.ready) {
+      this.ready = this.scan().catch((error) => {
+        console.error('❌ Error loading solve cache:', error);
+        this.ready = null;
+      });
+    }
+    return this.ready;
+  }
+
+  async scan() {
+    await fs.ensureDir(this.cacheDir);
+    for (const key of await fs.readdir(this.cacheDir)) {
+      const entryFile = path.join(this.cacheDir, key, 'entry.json');
+      const entry = await fs.readJson(entryFile).catch(() => null);
+      if (!entry) {
+        // Interrupted store: no entry.json was written
+        await fs.remove(path.join(this.cacheDir, key)).catch(console.error);
+        continue;
+      }
+      const stats = await fs.stat(entryFile);
+      this.entries.set(key, { sizeBytes: entry.sizeBytes, lastAccess: stats.mtimeMs });
+    }
+    console.log(`🗄️  Solve cache ready: ${this.entries.size} entries, ${(this.totalBytes() / 1048576).toFixed(1)} MB`);
+  }
+
+  totalBytes() {
+    let total = 0;
+    for (const entry of this.entries.values()) {
+      total += entry.sizeBytes;
+    }
+    return total;
+  }
+
+  /**
+   * Cached entry ({ results, resultsPath, sourceJobId }) or null; a hit refreshes its LRU time
+   */
+  async lookup(key) {
+    await this.load();
+    if (!this.entries.has(key)) {
+      this.stats.misses += 1;
+      return null;
+    }
+    const entryDir = path.join(this.cacheDir, key);
+    const entry = await fs.readJson(path.join(entryDir, 'entry.json')).catch(() => null);
+    if (!entry) {
+      this.entries.delete(key);
+      this.stats.misses += 1;
+      return null;
+    }
+    const now = new Date();
+    this.entries.get(key).lastAccess = now.getTime();
+    await fs.utimes(path.join(entryDir, 'entry.json'), now, now).catch(() => {});
+    this.stats.hits += 1;
+    return { ...entry, resultsPath: path.join(entryDir, 'results') };
+  }
+
+  /**
+   * Copy a finished job's results directory into the cache, then evict down to the cap.
+   * Returns the stored entry, or null when it does not fit
+   */
+  async store(key, resultsPath, { results, sourceJobId }) {
+    await this.load();
+    const entryDir = path.join(this.cacheDir, key);
+    await fs.remove(entryDir);
+    await fs.copy(resultsPath, path.join(entryDir, 'results'));
+    const sizeBytes = await directorySize(path.join(entryDir, 'results'));
+    if (sizeBytes > this.maxBytes) {
+      await fs.remove(entryDir);
+      return null;
+    }
+    // entry.json is written last: a directory without it is an interrupted store
+    const entry = { key, sourceJobId, results, sizeBytes, createdAt: new Date().toISOString() };
+    await fs.writeJson(path.join(entryDir, 'entry.json'), entry);
+    this.entries.set(key, { sizeBytes, lastAccess: Date.now() });
+    this.stats.stored += 1;
+    await this.evict();
+    return this.entries.has(key) ? { ...entry, resultsPath: path.join(entryDir, 'results') } : null;
+  }
+
+  /**
+   * Remove least-recently-used entries until the cache fits its size cap
+   */
+  async evict() {
+    let total = this.totalBytes();
+    const byAge = Array.from(this.entries.entries())
+      .sort((a, b) => a[1].lastAccess - b[1].lastAccess);
+    for (const [key, entry] of byAge) {
+      if (total <= this.maxBytes) {
+        break;
+      }
+      this.entries.delete(key);
+      total -= entry.sizeBytes;
+      this.stats.evicted += 1;
+      await fs.remove(path.join(this.cacheDir, key)).catch(console.error);
+      console.log(`🧹 Evicted solve cache entry ${key.slice(0, 12)}`);
+    }
+  }
+
+  /**
+   * The in-flight solve of a key, if another job is producing it right now
+   */
+  running(key) {
+    const leader = this.inFlight.get(key);
+    if (leader) {
+      this.stats.coalesced += 1;
+    }
+    return leader || null;
+  }
+
+  /**
+   * Register jobId as the solve producing key; `promise` resolves with the cache entry
+   * (or null when the result was not cacheable) and is removed once settled
+   */
+  track(key, jobId, promise) {
+    const tracked = promise.finally(() => this.inFlight.delete(key));
+    this.inFlight.set(key, { jobId, promise: tracked });
+    return tracked;
+  }
+
+  getStats() {
+    return {
+      entries: this.entries.size,
+      sizeBytes: this.totalBytes(),
+      maxBytes: this.maxBytes,
+      inFlight: this.inFlight.size,
+      ...this.stats
+    };
+  }
+}
+
+async function directorySize(dir) {
+  let total = 0;
+  for (const entry of await fs.readdir(dir, { withFileTypes: true })) {
+    const fullPath = path.join(dir, entry.name);
+    total += entry.isDirectory() ? await directorySize(fullPath) : (await fs.stat(fullPath)).size;
+  }
+  return total;
+}
+
+// Create singleton instance
+const solveCache = new SolveCache();
+
+module.exports = solveCache;
+module.exports.normalizeCsv = normalizeCsv;
+module.exports.directorySize = directorySize;
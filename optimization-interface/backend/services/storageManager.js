@@ -0,0 +1,316 @@
+const fs = require('fs-extra');
+const fsPromises = require('fs').promises;
+const path = require('path');
+const archiver = require('archiver');
+const config = require('../config');
+const { directorySize } = require('./solveCache');
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Retention manager for the per-job dataset folders (datasets/) and extracted results
+ * uploads (uploads/results/).
+ *
+ * Every top-level folder is an entry in a persisted index with its size, creation and
+ * last access time (touched when its results are served), so sweeps never re-walk
+ * unchanged folders. A background sweep
+ *   - compacts entries not accessed for `compactAfterDays` into one ZIP each under
+ *     storage/archive/, keeping their summary in the index,
+ *   - compacts least-recently-used entries while a root is over its size budget,
+ *   - deletes archives not accessed for `maxAgeDays`, or least recently used first while
+ *     the archives are over their budget.
+ * Folders the server still needs (running jobs, uploads being extracted) are skipped.
+ */
+class StorageManager {
+  constructor() {
+    const backendDir = path.join(__dirname, '..');
+    this.storageDir = path.join(backendDir, config.storage.dir);
+    this.archiveDir = path.join(this.storageDir, 'archive');
+    this.indexPath = path.join(this.storageDir, 'index.json');
+    this.roots = {
+      datasets: { dir: path.join(backendDir, config.datasetsDir), maxBytes: config.storage.datasetsMaxMb * 1048576 },
+      uploadsResults: { dir: path.join(backendDir, config.uploadsDir, 'results'), maxBytes: config.storage.uploadsResultsMaxMb * 1048576 }
+    };
+    // "<root>/<name>" -> { root, name, sizeBytes, createdAt, lastAccess, measuredAt, archive, summary }
+    this.entries = new Map();
+    this.hooks = { isProtected: () => false, onCompacted: () => {} };
+    this.lastSweep = null;
+    this.sweeping = null;
+    this.timer = null;
+    this.ready = null;
+  }
+
+  key(root, name) {
+    return `${root}/${name}`;
+  }
+
+  /**
+   * isProtected(root, name) -> true while the server still needs the folder;
+   * onCompacted(root, name, dir) runs after a folder was replaced by its archive
+   */
+  setHooks(hooks) {
+    Object.assign(this.hooks, hooks);
+  }
+
+  /**
+   * Load the persisted index (async, once)
+   */
+  load() {
+    if (!this.ready) {
+      this.ready = (async () => {
+        await fs.ensureDir(this.archiveDir);
+        const stored = await fs.readJson(this.indexPath).catch(() => []);
+        for (const entry of stored) {
+          this.entries.set(this.key(entry.root, entry.name), entry);
+        }
+      })().catch((error) => {
+        console.error('❌ Error loading storage index:', error);
+        this.ready = null;
+      });
+    }
+    return this.ready;
+  }
+
+  async persist() {
+    const partialPath = `${this.indexPath}.partial`;
+    await fs.writeJson(partialPath, Array.from(this.entries.values()));
+    await fs.move(partialPath, this.indexPath, { overwrite: true });
+  }
+
+  /**
+   * Start the background sweep (first run shortly after startup)
+   */
+  start() {
+    const intervalMs = config.storage.sweepIntervalMinutes * 60 * 1000;
+    setTimeout(() => this.sweep(), 30 * 1000).unref();
+    this.timer = setInterval(() => this.sweep(), intervalMs);
+    this.timer.unref();
+  }
+
+  /**
+   * Record an access to a managed folder (any path inside it); `summary` replaces the
+   * stored summary when given
+   */
+  touch(filePath, summary) {
+    const located = this.locate(filePath);
+    if (!located) {
+      return;
+    }
+    const key = this.key(located.root, located.name);
+    const entry = this.entries.get(key) || {
+      root: located.root, name: located.name, sizeBytes: 0, createdAt: Date.now(), measuredAt: 0, archive: null, summary: null
+    };
+    entry.lastAccess = Date.now();
+    if (summary !== undefined) {
+      entry.summary = summary;
+    }
+    this.entries.set(key, entry);
+  }
+
+  /**
+   * Root name and top-level folder of a path inside a managed root, or null
+   */
+  locate(filePath) {
+    for (const [root, { dir }] of Object.entries(this.roots)) {
+      const relative = path.relative(dir, filePath);
+      if (relative && !relative.startsWith('..') && !path.isAbsolute(relative)) {
+        return { root, name: relative.split(path.sep)[0] };
+      }
+    }
+    return null;
+  }
+
+  /**
+   * Archive that replaced a compacted folder, or null
+   */
+  archiveFor(folderPath) {
+    const located = this.locate(folderPath);
+    const entry = located && this.entries.get(this.key(located.root, located.name));
+    return entry && entry.archive ? path.join(this.archiveDir, entry.archive) : null;
+  }
+
+  /**
+   * Pick up new folders, forget removed ones and re-measure folders accessed since
+   * they were last measured
+   */
+  async refresh() {
+    for (const [root, { dir }] of Object.entries(this.roots)) {
+      await fs.ensureDir(dir);
+      const names = new Set(await fs.readdir(dir));
+      for (const name of names) {
+        const folderPath = path.join(dir, name);
+        const stats = await fs.stat(folderPath).catch(() => null);
+        if (!stats || !stats.isDirectory()) {
+          continue;
+        }
+        const key = this.key(root, name);
+        let entry = this.entries.get(key);
+        if (!entry) {
+          entry = {
+            root, name, sizeBytes: 0, createdAt: stats.birthtimeMs || stats.mtimeMs,
+            lastAccess: stats.mtimeMs, measuredAt: 0, archive: null, summary: null
+          };
+          this.entries.set(key, entry);
+        }
+        if (entry.archive) {
+          // Restored or re-created after compaction: the folder is live again
+          entry.archive = null;
+          entry.measuredAt = 0;
+        }
+        if (entry.measuredAt < Math.max(entry.lastAccess, stats.mtimeMs)) {
+          entry.sizeBytes = await directorySize(folderPath).catch(() => entry.sizeBytes);
+          entry.measuredAt = Date.now();
+        }
+      }
+      for (const [key, entry] of this.entries) {
+        if (entry.root === root && !entry.archive && !names.has(entry.name)) {
+          this.entries.delete(key);
+        }
+      }
+    }
+  }
+
+  /**
+   * Replace a folder by a single ZIP in storage/archive, keeping its index entry
+   */
+  async compact(entry) {
+    const folderPath = path.join(this.roots[entry.root].dir, entry.name);
+    const archiveName = `${entry.root}-${entry.name}.zip`;
+    const archivePath = path.join(this.archiveDir, archiveName);
+    const partialPath = `${archivePath}.partial`;
+
+    const output = fs.createWriteStream(partialPath);
+    const archive = archiver('zip', { zlib: { level: 9 } });
+    const written = new Promise((resolve, reject) => {
+      output.on('close', resolve);
+      output.on('error', reject);
+      archive.on('error', reject);
+    });
+    archive.pipe(output);
+    archive.directory(folderPath, false);
+    archive.finalize();
+    try {
+      await written;
+    } catch (error) {
+      await fs.remove(partialPath).catch(() => {});
+      throw error;
+    }
+    await fs.move(partialPath, archivePath, { overwrite: true });
+    await fs.remove(folderPath);
+
+    entry.archive = archiveName;
+    entry.folderBytes = entry.sizeBytes;
+    entry.sizeBytes = (await fs.stat(archivePath)).size;
+    entry.compactedAt = Date.now();
+    this.hooks.onCompacted(entry.root, entry.name, folderPath);
+    console.log(`🗜️  Compacted ${entry.root}/${entry.name} into ${archiveName}`);
+  }
+
+  async removeArchive(key, entry) {
+    await fs.remove(path.join(this.archiveDir, entry.archive)).catch(console.error);
+    this.entries.delete(key);
+    console.log(`🧹 Deleted archive of ${entry.root}/${entry.name}`);
+  }
+
+  /**
+   * One retention pass; concurrent calls share the running pass
+   */
+  sweep() {
+    if (!this.sweeping) {
+      this.sweeping = this.runSweep()
+        .catch(error => console.error('❌ Storage sweep failed:', error))
+        .finally(() => { this.sweeping = null; });
+    }
+    return this.sweeping;
+  }
+
+  async runSweep() {
+    await this.load();
+    await this.refresh();
+    const now = Date.now();
+    const byAccess = entries => entries.sort((a, b) => a[1].lastAccess - b[1].lastAccess);
+
+    for (const [root, { maxBytes }] of Object.entries(this.roots)) {
+      const live = byAccess(Array.from(this.entries.entries())
+        .filter(([, entry]) => entry.root === root && !entry.archive));
+      let liveBytes = live.reduce((total, [, entry]) => total + entry.sizeBytes, 0);
+      for (const [, entry] of live) {
+        const stale = now - entry.lastAccess > config.storage.compactAfterDays * DAY_MS;
+        if (!stale && liveBytes <= maxBytes) {
+          continue;
+        }
+        if (this.hooks.isProtected(root, entry.name)) {
+          continue;
+        }
+        const before = entry.sizeBytes;
+        await this.compact(entry).catch(error => console.error(`Error compacting ${root}/${entry.name}:`, error));
+        if (entry.archive) {
+          liveBytes -= before;
+        }
+      }
+    }
+
+    const archives = byAccess(Array.from(this.entries.entries()).filter(([, entry]) => entry.archive));
+    let archiveBytes = archives.reduce((total, [, entry]) => total + entry.sizeBytes, 0);
+    const maxArchiveBytes = config.storage.archiveMaxMb * 1048576;
+    for (const [key, entry] of archives) {
+      const expired = now - entry.lastAccess > config.storage.maxAgeDays * DAY_MS;
+      if (expired || archiveBytes > maxArchiveBytes) {
+        archiveBytes -= entry.sizeBytes;
+        await this.removeArchive(key, entry);
+      }
+    }
+
+    this.lastSweep = new Date().toISOString();
+    await this.persist();
+  }
+
+  /**
+   * Disk usage per root and for the archive, with budgets and free space
+   */
+  async metrics() {
+    await this.load();
+    const usage = {};
+    for (const [root, { dir, maxBytes }] of Object.entries(this.roots)) {
+      const live = Array.from(this.entries.values()).filter(entry => entry.root === root && !entry.archive);
+      usage[root] = {
+        path: dir,
+        entries: live.length,
+        bytes: live.reduce((total, entry) => total + entry.sizeBytes, 0),
+        maxBytes
+      };
+    }
+    const archived = Array.from(this.entries.values()).filter(entry => entry.archive);
+    let disk = null;
+    if (fsPromises.statfs) {
+      const stats = await fsPromises.statfs(this.storageDir).catch(() => null);
+      disk = stats && { freeBytes: stats.bavail * stats.bsize, totalBytes: stats.blocks * stats.bsize };
+    }
+    return {
+      roots: usage,
+      archive: {
+        entries: archived.length,
+        bytes: archived.reduce((total, entry) => total + entry.sizeBytes, 0),
+        maxBytes: config.storage.archiveMaxMb * 1048576
+      },
+      budgets: {
+        compactAfterDays: config.storage.compactAfterDays,
+        maxAgeDays: config.storage.maxAgeDays
+      },
+      disk,
+      lastSweep: this.lastSweep
+    };
+  }
+
+  /**
+   * Index entries with their summaries (archived runs included)
+   */
+  list() {
+    return Array.from(this.entries.values());
+  }
+}
+
+// Create singleton instance
+const storageManager = new StorageManager();
+
+module.exports = storageManager;
@@ -15,8 +15,8 @@ import ResultsDisplay from './components/ResultsDisplay';
 import OptimizationRunner from './components/OptimizationRunner';
 import ResultsViewer from './components/ResultsViewer';
 import ChatPanel from './components/ChatPanel';
-import { generateCSVFiles, downloadFiles } from './utils/csvGenerator';
-import { validateAllData } from './utils/validators';
+import { downloadFiles } from './utils/csvGenerator';
+import { buildDataset } from './utils/datasetBuilder';
 
 function App() {
   const [currentStep, setCurrentStep] = useState(0); // Start at 0 for welcome screen
@@ -89,7 +89,6 @@ function App() {
 
 
   const updateFormData = (section, data) => {
-    console.log(`🔍 DEBUG: Updating form data for section '${section}':`, data);
     setFormData(prev => ({
       ...prev,
       [section]: data
@@ -302,8 +301,8 @@ function App() {
     setMessage({ type: '', text: '' });
 
     try {
-      // Validate all data before generating files
-      const validationErrors = validateAllData(formData);
+      // Validate all data and generate the CSV files in a Web Worker
+      const { errors: validationErrors, csvFiles } = await buildDataset(formData);
       
       if (validationErrors.length > 0) {
         setMessage({
@@ -322,14 +321,6 @@ function App() {
       const selectedPath = await selectSaveLocation();
       const savePath = selectedPath || '~/Downloads/';
 
-      console.log('🔍 DEBUG: About to generate CSV files with form data:', {
-        workDataLength: formData.workData.length,
-        workData: formData.workData,
-        timeDataLength: formData.timeData.length,
-        locationsLength: formData.locations.length
-      });
-      
-      const csvFiles = generateCSVFiles(formData);
       await downloadFiles(csvFiles, formData.scenario.scenarioName, savePath);
       
       setMessage({
@@ -351,8 +342,8 @@ function App() {
     setMessage({ type: '', text: '' });
 
     try {
-      // Validate all data before generating files
-      const validationErrors = validateAllData(formData);
+      // Validate all data and generate the CSV files in a Web Worker
+      const { errors: validationErrors, csvFiles } = await buildDataset(formData);
       
       if (validationErrors.length > 0) {
         setMessage({
@@ -371,14 +362,6 @@ function App() {
       const selectedPath = await selectSaveLocation();
       const savePath = selectedPath || '~/Downloads/';
 
-      console.log('🔍 DEBUG: About to generate CSV files and start optimization with form data:', {
-        workDataLength: formData.workData.length,
-        workData: formData.workData,
-        timeDataLength: formData.timeData.length,
-        locationsLength: formData.locations.length
-      });
-      
-      const csvFiles = generateCSVFiles(formData);
       const zipFile = await downloadFiles(csvFiles, formData.scenario.scenarioName, savePath);
       
       // Store the generated ZIP file for optimization
@@ -31,6 +31,19 @@ ChartJS.register(
   zoomPlugin
 );
 
+// Rows requested per chart; the backend keeps every series' per-bucket minima/maxima so peaks survive
+const SERIES_POINT_BUDGET = 1000;
+
+// Downsampled variant of a /api/results/csv/... URL, restricted to the plotted series
+// (column patterns with `*` wildcards) when the chart type lists them
+const seriesUrl = (csvDataUrl, series) => {
+  if (!csvDataUrl.startsWith('/api/results/csv/')) {
+    return null;
+  }
+  const columns = series ? `&columns=${encodeURIComponent(series.join(','))}` : '';
+  return `${csvDataUrl.replace('/api/results/csv/', '/api/results/series/')}?points=${SERIES_POINT_BUDGET}${columns}`;
+};
+
 const InteractiveChartViewer = ({ charts }) => {
   const [chartData, setChartData] = useState({});
   const [loading, setLoading] = useState(false);
@@ -65,7 +78,14 @@ const InteractiveChartViewer = ({ charts }) => {
             csvText = chart.csvData;
             console.log(`Using direct CSV data for ${chart.name}`);
           } else if (chart.csvDataUrl) {
-            const response = await fetch(`http://localhost:3002${chart.csvDataUrl}`);
+            const downsampledUrl = seriesUrl(chart.csvDataUrl, getChartInfo(chart.name).series);
+            let response = downsampledUrl
+              ? await fetch(`http://localhost:3002${downsampledUrl}`)
+              : null;
+            if (!response || !response.ok) {
+              // Fall back to the full CSV
+              response = await fetch(`http://localhost:3002${chart.csvDataUrl}`);
+            }
             if (response.ok) {
               csvText = await response.text();
             } else {
@@ -106,7 +126,8 @@ const InteractiveChartViewer = ({ charts }) => {
       color: '#007bff',
       type: 'bar',
       yAxisLabel: 'Power (kW)',
-      xAxisLabel: 'Time'
+      xAxisLabel: 'Time',
+      series: ['Total_Charging_Power_kW', 'Total_Discharging_Power_kW']
     },
     '02_work_profiles_by_site': {
       title: 'Work Profiles by Site',
@@ -115,7 +136,8 @@ const InteractiveChartViewer = ({ charts }) => {
       color: '#28a745',
       type: 'line',
       yAxisLabel: 'Work Power (kW)',
-      xAxisLabel: 'Time'
+      xAxisLabel: 'Time',
+      series: ['*_Work_Power_kW']
     },
     '03_mcs_state_of_energy': {
       title: 'MCS State of Energy',
@@ -124,7 +146,8 @@ const InteractiveChartViewer = ({ charts }) => {
       color: '#ffc107',
       type: 'line',
       yAxisLabel: 'Energy (kWh)',
-      xAxisLabel: 'Time'
+      xAxisLabel: 'Time',
+      series: ['MCS_*_SOE_kWh']
     },
     '04_cev_state_of_energy': {
       title: 'CEV State of Energy',
@@ -133,7 +156,8 @@ const InteractiveChartViewer = ({ charts }) => {
       color: '#17a2b8',
       type: 'line',
       yAxisLabel: 'Energy (kWh)',
-      xAxisLabel: 'Time'
+      xAxisLabel: 'Time',
+      series: ['CEV_*_SOE_kWh']
     },
     '05_electricity_prices': {
       title: 'Electricity Prices & Emissions',
@@ -143,7 +167,8 @@ const InteractiveChartViewer = ({ charts }) => {
       type: 'line',
       yAxisLabel: 'Price ($/kWh)',
       xAxisLabel: 'Time',
-      dualYAxis: true
+      dualYAxis: true,
+      series: ['Electricity_Price_*', 'CO2_*']
     },
     '06_mcs_location_trajectory': {
       title: 'MCS Location Trajectory',
@@ -152,7 +177,8 @@ const InteractiveChartViewer = ({ charts }) => {
       color: '#343a40',
       type: 'line',
       yAxisLabel: 'Location Type',
-      xAxisLabel: 'Time'
+      xAxisLabel: 'Time',
+      series: ['MCS_*_Location']
     },
     '07_node_map_with_cev_assignments': {
       title: 'Node Map with CEV Assignments',
@@ -225,7 +251,8 @@ const InteractiveChartViewer = ({ charts }) => {
       column !== timeColumn && 
       !column.toLowerCase().includes('time_period') &&
       !column.toLowerCase().includes('net_power') && // Exclude net power
-      !column.toLowerCase().includes('location_type') // Exclude location type (text data)
+      !column.toLowerCase().includes('location_type') && // Exclude location type (text data)
+      column.toLowerCase() !== 'solution_status' // Exclude the solution label (text data)
     );
     
     dataColumns.forEach((column, index) => {
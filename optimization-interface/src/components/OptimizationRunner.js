@@ -7,6 +7,8 @@ const OptimizationRunner = () => {
   const [selectedFile, setSelectedFile] = useState(null);
   const [isUploading, setIsUploading] = useState(false);
   const [uploadProgress, setUploadProgress] = useState(0);
+  const [quickEstimate, setQuickEstimate] = useState(false);
+  const [deferPlots, setDeferPlots] = useState(false);
   const [message, setMessage] = useState({ type: '', text: '' });
   const [showJobModal, setShowJobModal] = useState(false);
   const [selectedJob, setSelectedJob] = useState(null);
@@ -109,6 +111,12 @@ const OptimizationRunner = () => {
 
     const formData = new FormData();
     formData.append('dataset', selectedFile);
+    if (quickEstimate) {
+      formData.append('mode', 'estimate');
+    }
+    if (deferPlots) {
+      formData.append('deferPlots', 'true');
+    }
 
     try {
       const response = await fetch('http://localhost:3002/api/optimize', {
@@ -187,7 +195,10 @@ const OptimizationRunner = () => {
   const getStatusBadge = (status) => {
     const statusConfig = {
       uploading: { variant: 'info', text: 'Uploading' },
+      queued: { variant: 'secondary', text: 'Queued' },
+      starting: { variant: 'info', text: 'Starting' },
       extracting: { variant: 'info', text: 'Extracting' },
+      validating: { variant: 'info', text: 'Validating' },
       preparing: { variant: 'warning', text: 'Preparing' },
       running: { variant: 'primary', text: 'Running' },
       completed: { variant: 'success', text: 'Completed' },
@@ -252,13 +263,47 @@ const OptimizationRunner = () => {
                 </div>
               )}
               
+              <div className="form-check mb-3">
+                <input
+                  id="quickEstimate"
+                  type="checkbox"
+                  className="form-check-input"
+                  checked={quickEstimate}
+                  onChange={(e) => setQuickEstimate(e.target.checked)}
+                  disabled={isUploading}
+                />
+                <label className="form-check-label" htmlFor="quickEstimate">
+                  Quick estimate (LP relaxation)
+                </label>
+                <div className="form-text">
+                  Approximate cost, CO2 and peak in a fraction of the time; the cost is a lower bound
+                </div>
+              </div>
+
+              <div className="form-check mb-3">
+                <input
+                  id="deferPlots"
+                  type="checkbox"
+                  className="form-check-input"
+                  checked={deferPlots}
+                  onChange={(e) => setDeferPlots(e.target.checked)}
+                  disabled={isUploading}
+                />
+                <label className="form-check-label" htmlFor="deferPlots">
+                  Defer charts
+                </label>
+                <div className="form-text">
+                  Finish as soon as the data files are saved; chart images are drawn when first opened
+                </div>
+              </div>
+
               <Button
                 variant="primary"
                 onClick={handleUpload}
                 disabled={!selectedFile || isUploading}
                 className="me-2"
               >
-                {isUploading ? 'Starting Optimization...' : '🚀 Start Optimization'}
+                {isUploading ? 'Starting Optimization...' : quickEstimate ? '⚡ Start Estimate' : '🚀 Start Optimization'}
               </Button>
               
               <Button
@@ -46,6 +46,11 @@ const ResultsViewer = () => {
 
       const data = await response.json();
       setResultsData(data);
+
+      // The summary arrives first; charts are listed once the ZIP is fully extracted
+      if (data.chartsPending) {
+        pollUploadCharts(data.uploadId);
+      }
       
       // Reset progress after success
       setTimeout(() => setUploadProgress(0), 1000);
@@ -58,6 +63,27 @@ const ResultsViewer = () => {
     }
   };
 
+  const pollUploadCharts = async (uploadId) => {
+    try {
+      const response = await fetch(`http://localhost:3002/api/results/upload/${uploadId}`);
+      if (!response.ok) {
+        return;
+      }
+      const status = await response.json();
+      if (status.status === 'ready') {
+        setResultsData(prev => prev && prev.uploadId === uploadId
+          ? { ...prev, charts: status.charts, chartsPending: false }
+          : prev);
+      } else if (status.status === 'error') {
+        setError(`Failed to extract results: ${status.error}`);
+      } else {
+        setTimeout(() => pollUploadCharts(uploadId), 1000);
+      }
+    } catch (err) {
+      console.error('Error polling results upload:', err);
+    }
+  };
+
   const handleClearResults = () => {
     setResultsData(null);
     setError(null);
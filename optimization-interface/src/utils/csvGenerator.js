@@ -1,6 +1,9 @@
 import Papa from 'papaparse';
 import JSZip from 'jszip';
 
+// Rows are joined into parts of roughly this many characters before going into a Blob
+const CHUNK_SIZE = 64 * 1024;
+
 // Modern native file download function (replaces file-saver)
 const downloadFile = (blob, filename) => {
   const url = URL.createObjectURL(blob);
@@ -13,16 +16,55 @@ const downloadFile = (blob, filename) => {
   URL.revokeObjectURL(url);
 };
 
+// Quote a CSV field the way Papa.unparse does (only when it contains a delimiter, quote or newline)
+const csvField = (value) => {
+  const text = value === null || value === undefined ? '' : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+// Accumulates CSV rows into fixed-size string parts instead of one large string
+class CSVChunkWriter {
+  constructor() {
+    this.parts = [];
+    this.current = [];
+    this.length = 0;
+  }
+
+  row(values) {
+    const line = values.map(csvField).join(',');
+    if (this.parts.length > 0 || this.current.length > 0) {
+      this.current.push('\r\n');
+    }
+    this.current.push(line);
+    this.length += line.length + 2;
+    if (this.length >= CHUNK_SIZE) {
+      this.parts.push(this.current.join(''));
+      this.current = [];
+      this.length = 0;
+    }
+  }
+
+  toBlob() {
+    if (this.current.length > 0) {
+      this.parts.push(this.current.join(''));
+    }
+    return new Blob(this.parts, { type: 'text/csv' });
+  }
+}
+
+const toBlob = (csvText) => new Blob([csvText], { type: 'text/csv' });
+
+// Returns { filename: Blob }. Safe to call from a Web Worker (see datasetWorker.js).
 export const generateCSVFiles = (formData) => {
   const { scenario, parameters, evData, locations, distanceMatrix, travelTimeMatrix, timeData, workData } = formData;
   
   const csvFiles = {};
 
   // Generate parameters.csv with correct delta_T based on scenario
-  csvFiles['parameters.csv'] = generateParametersCSV(parameters, scenario.numMCS, scenario.is24Hours);
+  csvFiles['parameters.csv'] = toBlob(generateParametersCSV(parameters, scenario.numMCS, scenario.is24Hours));
 
   // Generate ev_data.csv
-  csvFiles['ev_data.csv'] = generateEVDataCSV(evData);
+  csvFiles['ev_data.csv'] = toBlob(generateEVDataCSV(evData));
 
   // Generate place.csv
   csvFiles['place.csv'] = generatePlaceCSV(locations, scenario.numCEV);
@@ -34,15 +76,15 @@ export const generateCSVFiles = (formData) => {
   csvFiles['travel_time.csv'] = generateTravelTimeCSVFromMatrix(travelTimeMatrix, scenario.numNodes);
 
   // Generate time_data.csv
-  csvFiles['time_data.csv'] = generateTimeDataCSV(timeData);
+  csvFiles['time_data.csv'] = toBlob(generateTimeDataCSV(timeData));
 
   // Generate work.csv
   csvFiles['work.csv'] = generateWorkCSV(workData, timeData, formData.locations);
 
   // Generate CAISO files for 24-hour scenarios
   if (scenario.is24Hours) {
-    csvFiles['CAISO-demand-20250806.csv'] = generateCAISODemandCSV(timeData);
-    csvFiles['CAISO-co2-20250806.csv'] = generateCAISOCO2CSV(timeData);
+    csvFiles['CAISO-demand-20250806.csv'] = toBlob(generateCAISODemandCSV(timeData));
+    csvFiles['CAISO-co2-20250806.csv'] = toBlob(generateCAISOCO2CSV(timeData));
   }
 
   return csvFiles;
@@ -99,43 +141,54 @@ const generateEVDataCSV = (evData) => {
 };
 
 const generatePlaceCSV = (locations, numCEV) => {
-  const data = locations.map((location, index) => {
-    const row = { site: `i${index + 1}` };
+  const writer = new CSVChunkWriter();
+
+  const header = ['site'];
+  for (let ev = 1; ev <= numCEV; ev++) {
+    header.push(`e${ev}`);
+  }
+  writer.row(header);
+
+  locations.forEach((location, index) => {
+    const row = new Array(numCEV + 1);
+    row[0] = `i${index + 1}`;
     
     // Add EV assignment columns
     for (let ev = 1; ev <= numCEV; ev++) {
-      row[`e${ev}`] = location.evAssignments[ev] || 0;
+      row[ev] = location.evAssignments[ev] || 0;
     }
     
-    return row;
+    writer.row(row);
   });
 
-  return Papa.unparse(data);
+  return writer.toBlob();
 };
 
-const generateDistanceCSVFromMatrix = (distanceMatrix, numNodes) => {
-  const data = [];
-  
-  // Header row
-  const header = ['Unnamed: 0'];
+// Node x node matrix CSV with a labelled first column, e.g. distance.csv / travel_time.csv
+const writeMatrixCSV = (corner, labelPrefix, matrix, numNodes) => {
+  const writer = new CSVChunkWriter();
+
+  const header = [corner];
   for (let i = 1; i <= numNodes; i++) {
-    header.push(`i${i}`);
+    header.push(`${labelPrefix}${i}`);
   }
-  data.push(header);
-  
-  // Use user-configured matrix or generate default if empty
-  const distances = distanceMatrix.length > 0 ? distanceMatrix : generateDefaultDistanceMatrix(numNodes);
-  
-  // Data rows
+  writer.row(header);
+
   for (let i = 1; i <= numNodes; i++) {
-    const row = [`i${i}`];
+    const row = [`${labelPrefix}${i}`];
     for (let j = 1; j <= numNodes; j++) {
-      row.push(distances[i-1][j-1]);
+      row.push(matrix[i-1][j-1]);
     }
-    data.push(row);
+    writer.row(row);
   }
 
-  return Papa.unparse(data);
+  return writer.toBlob();
+};
+
+const generateDistanceCSVFromMatrix = (distanceMatrix, numNodes) => {
+  // Use user-configured matrix or generate default if empty
+  const distances = distanceMatrix.length > 0 ? distanceMatrix : generateDefaultDistanceMatrix(numNodes);
+  return writeMatrixCSV('Unnamed: 0', 'i', distances, numNodes);
 };
 
 const generateDefaultDistanceMatrix = (numNodes) => {
@@ -154,28 +207,9 @@ const generateDefaultDistanceMatrix = (numNodes) => {
 };
 
 const generateTravelTimeCSVFromMatrix = (travelTimeMatrix, numNodes) => {
-  const data = [];
-  
-  // Header row - use "Node" instead of "Unnamed: 0"
-  const header = ['Node'];
-  for (let i = 1; i <= numNodes; i++) {
-    header.push(`I${i}`);
-  }
-  data.push(header);
-  
-  // Use user-configured matrix or generate default if empty
+  // Use user-configured matrix or generate default if empty; header uses "Node" instead of "Unnamed: 0"
   const times = travelTimeMatrix.length > 0 ? travelTimeMatrix : generateDefaultTravelTimeMatrix(numNodes);
-  
-  // Data rows
-  for (let i = 1; i <= numNodes; i++) {
-    const row = [`I${i}`];
-    for (let j = 1; j <= numNodes; j++) {
-      row.push(times[i-1][j-1]);
-    }
-    data.push(row);
-  }
-
-  return Papa.unparse(data);
+  return writeMatrixCSV('Node', 'I', times, numNodes);
 };
 
 const generateDefaultTravelTimeMatrix = (numNodes) => {
@@ -281,14 +315,43 @@ const generateFallbackWorkData = (locations, timeData) => {
   return fallbackWorkData;
 };
 
-const generateWorkCSV = (workData, timeData, locations) => {
-  console.log('🔍 DEBUG: Generating work CSV with data:', {
-    workDataLength: workData.length,
-    workData: workData,
-    timeDataLength: timeData.length,
-    locationsLength: locations.length
+// Work power (kW) as a (location x EV) x period Float64Array, rows in work.csv order
+const buildWorkMatrix = (workData, numPeriods, locations, numCEV) => {
+  const matrix = new Float64Array(locations.length * numCEV * numPeriods);
+
+  // One lookup per location-EV pair instead of a search per period
+  const workItems = new Map();
+  workData.forEach(item => workItems.set(`${item.location}:${item.ev}`, item));
+
+  locations.forEach((location, locationIndex) => {
+    for (let ev = 1; ev <= numCEV; ev++) {
+      // No work if EV is not assigned to this location
+      if (!location.evAssignments || location.evAssignments[ev] !== 1) {
+        continue;
+      }
+      const workItem = workItems.get(`${location.id}:${ev}`);
+      if (!workItem || !workItem.workRequirements) {
+        console.log(`❌ EV${ev} at Location${location.id} - No work data found, using 0`);
+        continue;
+      }
+      const offset = (locationIndex * numCEV + (ev - 1)) * numPeriods;
+      const requirements = workItem.workRequirements;
+      for (let t = 0; t < numPeriods && t < requirements.length; t++) {
+        const requirement = requirements[t];
+        if (!requirement) {
+          continue;
+        }
+        // Extract workPower from the workRequirements object
+        const workPower = typeof requirement === 'object' ? requirement.workPower : requirement;
+        matrix[offset + t] = workPower || 0;
+      }
+    }
   });
-  
+
+  return matrix;
+};
+
+const generateWorkCSV = (workData, timeData, locations) => {
   // Use fallback work data if workData is empty
   let finalWorkData = workData;
   if (workData.length === 0) {
@@ -296,101 +359,37 @@ const generateWorkCSV = (workData, timeData, locations) => {
     finalWorkData = generateFallbackWorkData(locations, timeData);
   }
   
-  // Detailed logging of workData structure
-  if (finalWorkData.length > 0) {
-    console.log('🔍 Final WorkData details:');
-    finalWorkData.forEach((item, index) => {
-      console.log(`  Item ${index}:`, {
-        location: item.location,
-        ev: item.ev,
-        workRequirementsLength: item.workRequirements ? item.workRequirements.length : 0,
-        firstFewRequirements: item.workRequirements ? item.workRequirements.slice(0, 3) : []
-      });
-    });
-  } else {
-    console.log('❌ Final WorkData is still empty!');
-  }
-  
-  const data = [];
+  const numNodes = locations.length;
+  const numPeriods = timeData.length;
+  const numCEV = finalWorkData.reduce((max, w) => Math.max(max, w.ev), 0);
+  console.log(`🔍 Generating work CSV for ${numNodes} nodes, ${numCEV} EVs and ${numPeriods} periods`);
+
+  const matrix = buildWorkMatrix(finalWorkData, numPeriods, locations, numCEV);
+  const writer = new CSVChunkWriter();
   
   // Header row - use HH:MM format (matching reference files)
   const header = ['Location', 'EV'];
   timeData.forEach(timePoint => {
     // Convert HH:MM:SS to HH:MM format
-    const timeWithoutSeconds = timePoint.time.substring(0, 5);
-    header.push(timeWithoutSeconds);
+    header.push(timePoint.time.substring(0, 5));
   });
-  data.push(header);
-  
-  // Generate all possible location-EV combinations
-  const numNodes = locations.length;
-  const numCEV = finalWorkData.length > 0 ? Math.max(...finalWorkData.map(w => w.ev)) : 0;
-  
-  console.log(`🔍 Processing ${numNodes} nodes and ${numCEV} EVs`);
-  console.log('🔍 Locations:', locations.map(loc => ({ id: loc.id, evAssignments: loc.evAssignments })));
+  writer.row(header);
   
+  // All location-EV combinations
+  const row = new Array(numPeriods + 2);
   for (let locationIndex = 0; locationIndex < numNodes; locationIndex++) {
-    const location = locations[locationIndex];
-    const locationId = location.id; // Use the actual location ID
-    
+    row[0] = `i${locations[locationIndex].id}`;
     for (let ev = 1; ev <= numCEV; ev++) {
-      const row = [`i${locationId}`, `e${ev}`];
-      
-      // Check if this EV is assigned to this location
-      const isAssigned = location.evAssignments && location.evAssignments[ev] === 1;
-      console.log(`🔍 EV${ev} at Location${locationId} - Assigned: ${isAssigned}`);
-      
-      // Add work requirements for all time periods
-      for (let t = 0; t < timeData.length; t++) {
-        if (isAssigned) {
-          // Find the work requirement for this location-EV combination
-          const workItem = finalWorkData.find(w => w.location === locationId && w.ev === ev);
-          console.log(`🔍 Looking for workItem: location=${locationId}, ev=${ev}, found:`, workItem);
-          
-          if (workItem && workItem.workRequirements && workItem.workRequirements[t]) {
-            // Extract workPower from the workRequirements object
-            const requirement = workItem.workRequirements[t];
-            const workPower = typeof requirement === 'object' ? requirement.workPower : requirement;
-            row.push(workPower || 0);
-            if (t === 0) {
-              console.log(`✅ EV${ev} at Location${locationId} - Work requirement: ${workPower}`);
-              console.log(`  Full requirement object:`, requirement);
-            }
-          } else {
-            row.push(0);
-            if (t === 0) {
-              console.log(`❌ EV${ev} at Location${locationId} - No work data found, using 0`);
-              if (workItem) {
-                console.log('  WorkItem exists but no workRequirements or missing time period');
-                console.log('  WorkItem workRequirements length:', workItem.workRequirements ? workItem.workRequirements.length : 'undefined');
-                console.log('  TimeData length:', timeData.length);
-                console.log('  Current time index:', t);
-              } else {
-                console.log('  No workItem found for this location-EV combination');
-              }
-            }
-          }
-        } else {
-          // No work if EV is not assigned to this location
-          row.push(0);
-        }
+      row[1] = `e${ev}`;
+      const offset = (locationIndex * numCEV + (ev - 1)) * numPeriods;
+      for (let t = 0; t < numPeriods; t++) {
+        row[t + 2] = matrix[offset + t];
       }
-      
-      data.push(row);
+      writer.row(row);
     }
   }
 
-  console.log('🔍 DEBUG: Generated work CSV data:', data.slice(0, 5)); // Show first 5 rows
-  console.log('🔍 DEBUG: Full data array length:', data.length);
-  console.log('🔍 DEBUG: First row (header):', data[0]);
-  console.log('🔍 DEBUG: Second row (i1,e1):', data[1]);
-  console.log('🔍 DEBUG: Third row (i2,e1):', data[2]);
-  
-  const csvResult = Papa.unparse(data);
-  console.log('🔍 DEBUG: CSV result length:', csvResult.length);
-  console.log('🔍 DEBUG: CSV result preview:', csvResult.substring(0, 200));
-  
-  return csvResult;
+  return writer.toBlob();
 };
 
 const generateCAISODemandCSV = (timeData) => {
@@ -0,0 +1,49 @@
+// Runs validation and CSV generation in datasetWorker.js so large fleets don't block the UI.
+// Falls back to the main thread where Web Workers are unavailable (e.g. tests).
+import { generateCSVFiles } from './csvGenerator';
+import { validateAllData } from './validators';
+
+let worker = null;
+let nextId = 0;
+const pending = new Map();
+
+const getWorker = () => {
+  if (!worker) {
+    worker = new Worker(new URL('./datasetWorker.js', import.meta.url));
+    worker.onmessage = (event) => {
+      const { id, error, ...result } = event.data;
+      const request = pending.get(id);
+      if (!request) {
+        return;
+      }
+      pending.delete(id);
+      if (error) {
+        request.reject(new Error(error));
+      } else {
+        request.resolve(result);
+      }
+    };
+    worker.onerror = (event) => {
+      // A crashed worker fails every outstanding request; the next call starts a new one
+      pending.forEach(request => request.reject(new Error(event.message || 'Dataset worker failed')));
+      pending.clear();
+      worker.terminate();
+      worker = null;
+    };
+  }
+  return worker;
+};
+
+// Resolves { errors } when validation fails, otherwise { errors: [], csvFiles: { filename: Blob } }
+export const buildDataset = (formData) => {
+  if (typeof Worker === 'undefined') {
+    const errors = validateAllData(formData);
+    return Promise.resolve(errors.length > 0 ? { errors } : { errors, csvFiles: generateCSVFiles(formData) });
+  }
+
+  return new Promise((resolve, reject) => {
+    const id = ++nextId;
+    pending.set(id, { resolve, reject });
+    getWorker().postMessage({ id, formData });
+  });
+};
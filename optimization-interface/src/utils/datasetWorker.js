@@ -0,0 +1,20 @@
+/* eslint-disable no-restricted-globals */
+// Web Worker: validates the form data and builds the dataset CSVs off the main thread.
+// Messages in:  { id, formData }
+// Messages out: { id, errors } | { id, csvFiles: { filename: Blob } } | { id, error }
+import { generateCSVFiles } from './csvGenerator';
+import { validateAllData } from './validators';
+
+self.onmessage = (event) => {
+  const { id, formData } = event.data;
+  try {
+    const errors = validateAllData(formData);
+    if (errors.length > 0) {
+      self.postMessage({ id, errors });
+      return;
+    }
+    self.postMessage({ id, errors: [], csvFiles: generateCSVFiles(formData) });
+  } catch (error) {
+    self.postMessage({ id, error: error.message });
+  }
+};
@@ -62,11 +62,13 @@ function load_all_data(data_dir::String)
     k_trv = params[:k_trv]
     delta_T = params[:delta_T]
     rho_miss = params[:rho_miss]
+    # Shipped parameters.csv files spell it num_MCS; accept both, like the Python tools
+    num_mcs = Int(round(Float64(get(params, :num_mcs, get(params, :num_MCS, 1)))))
 
-    # Extract MCS parameters
-    SOE_MCS_max = MCS_max
-    SOE_MCS_min = MCS_min
-    SOE_MCS_ini = MCS_ini
+    # Extract MCS parameters (identical MCSs, one entry per MCS)
+    SOE_MCS_max = fill(Float64(MCS_max), num_mcs)
+    SOE_MCS_min = fill(Float64(MCS_min), num_mcs)
+    SOE_MCS_ini = fill(Float64(MCS_ini), num_mcs)
 
     # Load EV data
     ev_df = CSV.read(joinpath(data_dir, "ev_data.csv"), DataFrame)
@@ -81,7 +83,7 @@ function load_all_data(data_dir::String)
     N = 1:nrow(place_df)
     N_g = [1]  # First location is grid node
     N_c = collect(2:length(N))  # Rest are construction sites
-    M = [1]  # Single MCS for now
+    M = collect(1:num_mcs)
 
     # Create location matrix
     A = zeros(Int, length(N), length(E))
@@ -176,7 +178,7 @@ function validate_data(
 
     # Check values
     @assert 0 < eta_ch_dch <= 1 "Efficiency must be between 0 and 1"
-    @assert SOE_MCS_min <= SOE_MCS_ini <= SOE_MCS_max "Invalid MCS energy limits"
+    @assert all(SOE_MCS_min .<= SOE_MCS_ini .<= SOE_MCS_max) "Invalid MCS energy limits"
     @assert all(SOE_CEV_min .<= SOE_CEV_ini .<= SOE_CEV_max) "Invalid CEV energy limits"
     @assert all(D .>= 0) "Negative distances not allowed"
     @assert all(tau_trv .>= 0) "Negative travel times not allowed"
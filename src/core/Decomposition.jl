@@ -0,0 +1,236 @@
+# Site-cluster decomposition of the MCS-CEV model (included by MCSOptimizer).
+#
+# Construction sites are grouped into geographic clusters from the distance matrix, each
+# cluster gets its own MCSs and the CEVs assigned to its sites, and the cluster MILPs are
+# solved concurrently. Grid nodes are shared by every cluster; an optional grid power cap
+# couples the clusters and is split into per-cluster budgets that are re-balanced between
+# rounds. The merged objective is an upper bound on the monolithic optimum.
+
+"""
+Partition construction sites into `k` clusters by distance: farthest-point seeding
+from the most central site, then k-medoids refinement. Returns a vector of site lists.
+"""
+function cluster_sites(D, N_c, k)
+    sites = collect(N_c)
+    k = clamp(k, 1, length(sites))
+    total_distance(i, members) = sum(D[i, j] for j in members; init=0.0)
+
+    medoids = [sites[argmin([total_distance(i, sites) for i in sites])]]
+    while length(medoids) < k
+        push!(medoids, sites[argmax([minimum(D[i, c] for c in medoids) for i in sites])])
+    end
+
+    clusters = Vector{Vector{Int}}()
+    for _ in 1:20
+        clusters = [Int[] for _ in medoids]
+        for i in sites
+            push!(clusters[argmin([D[i, c] for c in medoids])], i)
+        end
+        new_medoids = [members[argmin([total_distance(i, members) for i in members])] for members in clusters]
+        new_medoids == medoids && break
+        medoids = new_medoids
+    end
+    return sort(filter(!isempty, clusters), by=first)
+end
+
+"""
+Split the MCS fleet over clusters: one MCS per cluster with work, the rest by largest
+remainder of each cluster's share of the work energy. Returns one MCS list per cluster.
+"""
+function assign_mcs_to_clusters(M, work_energy)
+    fleet = collect(M)
+    active = findall(>(0), work_energy)
+    isempty(active) && (active = [1])
+    if length(fleet) < length(active)
+        error("$(length(fleet)) MCSs cannot serve $(length(active)) clusters with work; use fewer clusters")
+    end
+
+    counts = zeros(Int, length(work_energy))
+    counts[active] .= 1
+    spare = length(fleet) - length(active)
+    if spare > 0
+        total = sum(work_energy[active])
+        shares = total > 0 ? spare .* work_energy ./ total :
+            [c == active[1] ? Float64(spare) : 0.0 for c in eachindex(work_energy)]
+        extra = floor.(Int, shares)
+        remainder = spare - sum(extra)
+        for c in sortperm(shares .- extra, rev=true)[1:remainder]
+            extra[c] += 1
+        end
+        counts .+= extra
+    end
+
+    assignment = Vector{Vector{Int}}()
+    next = 1
+    for c in eachindex(work_energy)
+        push!(assignment, fleet[next:next + counts[c] - 1])
+        next += counts[c]
+    end
+    return assignment
+end
+
+"""
+Build and solve one cluster's MILP; returns its schedule as plain vectors and dicts
+"""
+function solve_cluster(
+    M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+    D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+    grid_power_cap=nothing
+)
+    model = build_model(
+        M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+        D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+        grid_power_cap=grid_power_cap, verbose=false
+    )
+    optimize!(model)
+    status = termination_status(model)
+    if !has_values(model)
+        return (status=status, objective=Inf, solve_time=solve_time(model))
+    end
+
+    P_ch_tot = value.(model[:P_ch_tot])
+    P_dch_tot = value.(model[:P_dch_tot])
+    return (
+        status = status,
+        objective = objective_value(model),
+        solve_time = solve_time(model),
+        grid_power = [sum(P_ch_tot[m, t] for m in M) for t in T],
+        discharge_power = [sum(P_dch_tot[m, t] for m in M) for t in T],
+        soe_mcs = Dict(m => [value(model[:SOE_MCS][m, t]) for t in T] for m in M),
+        soe_cev = Dict(e => [value(model[:SOE_CEV][e, t]) for t in T] for e in E),
+        missed_work = sum(value(model[:P_miss_work][i, e, t]) * delta_T for i in N, e in E, t in T; init=0.0),
+        electricity_cost = sum(P_ch_tot[m, t] * lambda_whl_elec[t] * delta_T for m in M, t in T),
+        carbon_cost = sum(P_ch_tot[m, t] * lambda_CO2[t] * delta_T for m in M, t in T)
+    )
+end
+
+"""
+Solve the MCS-CEV model by site-cluster decomposition.
+
+Sites are clustered with `cluster_sites` (`num_clusters` defaults to one per MCS, at most
+one per site), MCSs are split with `assign_mcs_to_clusters` and the cluster MILPs run as
+parallel tasks (start Julia with `-t auto` to use several cores). With `grid_power_cap`
+(kW, number or per-period vector) the cap is shared: every cluster gets a budget, and for
+up to `coordination_rounds` rounds the unused budget of a period is moved to the clusters
+whose budget was binding. With `compare_monolithic=true` the full model is solved too and
+the relative gap of the decomposed objective is reported.
+"""
+function solve_decomposed(
+    M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+    D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+    num_clusters=length(M), grid_power_cap=nothing, coordination_rounds=3, compare_monolithic=false
+)
+    wall_start = time()
+    site_clusters = cluster_sites(D, N_c, num_clusters)
+    work_energy = [sum(R_work[i, e, t] * A[i, e] * delta_T for i in sites, e in E, t in T) for sites in site_clusters]
+    mcs_clusters = assign_mcs_to_clusters(M, work_energy)
+
+    # Clusters without MCSs have no work (assign_mcs_to_clusters guarantees it) and are skipped
+    active = findall(!isempty, mcs_clusters)
+    cev_clusters = [[e for e in E if any(A[i, e] == 1 for i in site_clusters[c])] for c in eachindex(site_clusters)]
+    println("Decomposing into $(length(active)) clusters on $(Threads.nthreads()) threads:")
+    for c in active
+        println("  Cluster $c: sites $(site_clusters[c]), MCSs $(mcs_clusters[c]), $(length(cev_clusters[c])) CEVs")
+    end
+
+    cap = grid_power_cap === nothing ? nothing :
+        (grid_power_cap isa Number ? fill(Float64(grid_power_cap), length(T)) : Float64.(collect(grid_power_cap)))
+    budgets = Dict(c => cap === nothing ? nothing : cap .* (length(mcs_clusters[c]) / length(M)) for c in active)
+
+    best = nothing
+    rounds = cap === nothing ? 1 : max(1, coordination_rounds)
+    rounds_run = 0
+    for iteration in 1:rounds
+        rounds_run = iteration
+        tasks = Dict(c => Threads.@spawn solve_cluster(
+            mcs_clusters[c], T, sort(vcat(N_g, site_clusters[c])), N_g, site_clusters[c], cev_clusters[c],
+            A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+            D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+            SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+            grid_power_cap=budgets[c]
+        ) for c in active)
+        results = Dict(c => fetch(tasks[c]) for c in active)
+
+        failed = [c for c in active if !isfinite(results[c].objective)]
+        if !isempty(failed)
+            println("Round $iteration: clusters $failed returned no solution ($(join([results[c].status for c in failed], ", ")))")
+        else
+            objective = sum(results[c].objective for c in active)
+            println("Round $iteration: merged objective $(round(objective; digits=4))")
+            if best === nothing || objective < best.objective - 1e-9
+                best = (objective=objective, results=results)
+            end
+        end
+        (cap === nothing || !isempty(failed) || iteration == rounds) && break
+
+        # Move each period's unused cap to the clusters that used their whole budget
+        used = Dict(c => results[c].grid_power for c in active)
+        rebalanced = false
+        for t in eachindex(cap)
+            slack = cap[t] - sum(used[c][t] for c in active)
+            binding = [c for c in active if used[c][t] >= budgets[c][t] - 1e-6]
+            (slack <= 1e-6 || isempty(binding) || length(binding) == length(active)) && continue
+            for c in active
+                budgets[c][t] = used[c][t] + (c in binding ? slack / length(binding) : 0.0)
+            end
+            rebalanced = true
+        end
+        rebalanced || break
+    end
+    best === nothing && error("Decomposed solve found no feasible schedule for every cluster")
+
+    results = best.results
+    cluster_table = DataFrame(
+        cluster = active,
+        sites = [join(site_clusters[c], " ") for c in active],
+        mcs = [join(mcs_clusters[c], " ") for c in active],
+        cevs = [length(cev_clusters[c]) for c in active],
+        work_energy_kWh = [work_energy[c] for c in active],
+        status = [string(results[c].status) for c in active],
+        objective = [results[c].objective for c in active],
+        solve_time = [results[c].solve_time for c in active]
+    )
+    merged = (
+        objective = best.objective,
+        clusters = cluster_table,
+        grid_power = sum(results[c].grid_power for c in active),
+        discharge_power = sum(results[c].discharge_power for c in active),
+        soe_mcs = merge([results[c].soe_mcs for c in active]...),
+        soe_cev = merge([results[c].soe_cev for c in active]...),
+        missed_work = sum(results[c].missed_work for c in active),
+        electricity_cost = sum(results[c].electricity_cost for c in active),
+        carbon_cost = sum(results[c].carbon_cost for c in active),
+        rounds = rounds_run,
+        wall_time = time() - wall_start
+    )
+
+    monolithic = (objective=nothing, bound=nothing, solve_time=nothing, gap=nothing)
+    if compare_monolithic
+        println("Solving the monolithic model for comparison...")
+        model = build_model(
+            M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+            D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+            SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+            grid_power_cap=cap, verbose=false
+        )
+        optimize!(model)
+        if has_values(model)
+            mono = objective_value(model)
+            monolithic = (
+                objective = mono,
+                bound = objective_bound(model),
+                solve_time = solve_time(model),
+                gap = (merged.objective - mono) / max(abs(mono), 1e-9)
+            )
+            @printf("Decomposed %.4f vs monolithic %.4f: gap %.2f%% (%.1fs vs %.1fs)\n",
+                merged.objective, mono, 100 * monolithic.gap, merged.wall_time, monolithic.solve_time)
+        else
+            println("Monolithic solve returned no solution: ", termination_status(model))
+        end
+    end
+
+    return merge(merged, (monolithic=monolithic,))
+end
@@ -8,73 +8,363 @@ using Printf
 using LinearAlgebra
 using Dates
 
-export solve_and_analyze
+include("ProgressEvents.jl")
+using .ProgressEvents
 
+export solve_and_analyze, build_model, save_result_charts, solve_decomposed, solve_weight_sweep, pareto_weights, emit_progress, reset_progress_clock
+
+"""
+Constraint family label: base names of the referenced variables plus the constraint set
 """
-Check constraint feasibility and log violations
+function constraint_family(con)
+    obj = constraint_object(con)
+    vars = obj.func isa VariableRef ? [obj.func] : collect(keys(obj.func.terms))
+    bases = sort(unique([String(split(name(v), '[')[1]) for v in vars]))
+    set_name = string(nameof(typeof(obj.set)))
+    return isempty(bases) ? set_name : string(join(bases, "+"), " ", set_name)
+end
+
 """
-function check_constraint_feasibility(model, constraint_name, constraint)
-    if !is_valid(model)
-        println("Model is invalid")
-        return
+Batched constraint diagnostics for a non-optimal solve, grouped by constraint family.
+Uses the primal residuals of the returned point when there is one, otherwise asks HiGHS
+for an irreducible infeasible subsystem (IIS). Returns (method, report DataFrame).
+"""
+function constraint_violation_report(model; atol=1e-6)
+    violations = Dict{Any,Float64}()
+    method = "none"
+    if has_values(model)
+        method = "residual"
+        violations = primal_feasibility_report(model; atol=atol, skip_missing=true)
+    else
+        try
+            compute_conflict!(model)
+            if MOI.get(model, MOI.ConflictStatus()) == MOI.CONFLICT_FOUND
+                method = "iis"
+                for con in all_constraints(model; include_variable_in_set_constraints=true)
+                    if MOI.get(model, MOI.ConstraintConflictStatus(), con) == MOI.IN_CONFLICT
+                        violations[con] = NaN  # IIS membership has no residual
+                    end
+                end
+            end
+        catch err
+            println("IIS computation not available: ", sprint(showerror, err))
+        end
     end
-    
+
+    # family => [count, max violation, total violation, worst constraint]
+    families = Dict{String,Vector{Any}}()
+    for (con, violation) in violations
+        entry = get!(() -> Any[0, -Inf, 0.0, ""], families, constraint_family(con))
+        entry[1] += 1
+        entry[3] += violation
+        if isnan(violation) || violation > entry[2]
+            entry[2] = violation
+            entry[4] = first(string(con), 200)
+        end
+    end
+
+    rows = sort(collect(families), by = kv -> -kv[2][1])
+    report = DataFrame(
+        family = String[kv[1] for kv in rows],
+        count = Int[kv[2][1] for kv in rows],
+        max_violation = Float64[kv[2][2] for kv in rows],
+        total_violation = Float64[kv[2][3] for kv in rows],
+        example = String[kv[2][4] for kv in rows]
+    )
+    return method, report
+end
+
+"""
+Write the violation report as constraint_violations.json and constraint_violations.csv
+"""
+function write_violation_report(report, method, status, output_dir)
+    mkpath(output_dir)
+    json_number(x) = isfinite(x) ? string(x) : "null"
+    csv_field(s) = "\"" * replace(s, "\"" => "\"\"") * "\""
+
+    open(joinpath(output_dir, "constraint_violations.csv"), "w") do io
+        println(io, "family,count,max_violation,total_violation,example")
+        for r in eachrow(report)
+            println(io, join([csv_field(r.family), r.count, r.max_violation, r.total_violation, csv_field(r.example)], ","))
+        end
+    end
+
+    open(joinpath(output_dir, "constraint_violations.json"), "w") do io
+        families = [
+            "{\"family\": \"$(escape_string(r.family))\", \"count\": $(r.count), " *
+            "\"max_violation\": $(json_number(r.max_violation)), " *
+            "\"total_violation\": $(json_number(r.total_violation)), " *
+            "\"example\": \"$(escape_string(r.example))\"}"
+            for r in eachrow(report)
+        ]
+        println(io, "{\"status\": \"$(status)\", \"method\": \"$(method)\", " *
+                    "\"violated_constraints\": $(sum(report.count; init=0)), " *
+                    "\"families\": [$(join(families, ", "))]}")
+    end
+end
+
+# Improving MIP solutions are appended here while HiGHS runs (see attach_incumbent_log!)
+const INCUMBENT_LOG = Ref{Union{IO,Nothing}}(nothing)
+const INCUMBENT_START = Ref(0.0)
+
+"""
+Append one incumbent (objective, best bound, relative gap) to the incumbent log and emit
+it as an "incumbent" progress event
+"""
+function log_incumbent(objective, bound, gap)
+    io = INCUMBENT_LOG[]
+    io === nothing && return
+    elapsed = time() - INCUMBENT_START[]
+    @printf(io, "%.3f,%.10g,%.10g,%.6g\n", elapsed, objective, bound, gap)
+    flush(io)
+    emit_progress("incumbent"; objective=objective, bound=bound, mip_gap=gap, solve_elapsed=elapsed)
+end
+
+function highs_incumbent_callback(callback_type::Cint, message::Ptr{Cchar},
+                                  data_out::Ptr{HiGHS.HighsCallbackDataOut},
+                                  data_in::Ptr{HiGHS.HighsCallbackDataIn}, user_data::Ptr{Cvoid})
+    out = unsafe_load(data_out)
+    log_incumbent(out.mip_primal_bound, out.mip_dual_bound, out.mip_gap)
+    return nothing
+end
+
+"""
+Stream improving incumbents of the next solve to `path` (CSV: elapsed_s, objective, bound,
+gap) through the HiGHS MIP-improving-solution callback. HiGHS builds without the C
+callback API only get the final incumbent, written by `close_incumbent_log`.
+"""
+function attach_incumbent_log!(model, path)
+    INCUMBENT_LOG[] = open(path, "w")
+    println(INCUMBENT_LOG[], "elapsed_s,objective,bound,gap")
+    INCUMBENT_START[] = time()
+    try
+        MOI.Utilities.attach_optimizer(model)
+        callback = @cfunction(highs_incumbent_callback, Cvoid,
+            (Cint, Ptr{Cchar}, Ptr{HiGHS.HighsCallbackDataOut}, Ptr{HiGHS.HighsCallbackDataIn}, Ptr{Cvoid}))
+        highs = unsafe_backend(model)
+        HiGHS.Highs_setCallback(highs, callback, C_NULL)
+        HiGHS.Highs_startCallback(highs, HiGHS.kHighsCallbackMipImprovingSolution)
+    catch err
+        println("Incumbent streaming unavailable ($(sprint(showerror, err))); only the final incumbent is logged")
+    end
+end
+
+"""
+Record the final incumbent of the solve and close the incumbent log
+"""
+function close_incumbent_log(model)
+    INCUMBENT_LOG[] === nothing && return
+    quality = solution_quality(model)
     if has_values(model)
-        violation = 0.0
-        if is_binary(constraint)
-            # For binary constraints, check if values are close to 0 or 1
-            val = value(constraint)
-            violation = min(abs(val - 0), abs(val - 1))
-        else
-            # For other constraints, check the actual violation
-            val = value(constraint)
-            if is_less_than(constraint)
-                violation = max(0, val - upper_bound(constraint))
-            elseif is_greater_than(constraint)
-                violation = max(0, lower_bound(constraint) - val)
+        log_incumbent(quality.objective, quality.best_bound, quality.relative_gap)
+    end
+    close(INCUMBENT_LOG[])
+    INCUMBENT_LOG[] = nothing
+end
+
+"""
+Status of the solution a solve returned: solve mode, termination and primal status,
+objective, best bound, proven relative gap, and whether it is proven optimal (within the
+gap target). An LP relaxation estimate has no gap and its objective is a lower bound on
+the MILP optimum.
+"""
+function solution_quality(model)
+    solved = has_values(model)
+    estimate = haskey(model, :lp_relaxation)
+    return (
+        solve_mode = estimate ? "lp_relaxation_estimate" : "milp",
+        termination_status = string(termination_status(model)),
+        primal_status = string(primal_status(model)),
+        objective = solved ? objective_value(model) : NaN,
+        best_bound = !solved ? NaN : estimate ? objective_value(model) : objective_bound(model),
+        relative_gap = solved && !estimate ? relative_gap(model) : NaN,
+        proven_optimal = !estimate && termination_status(model) == MOI.OPTIMAL
+    )
+end
+
+"""
+One-line quality label carried by every result file of a run: `OPTIMAL`, `INCUMBENT <status>
+gap <g>%` for a solve stopped by a limit, or `ESTIMATE ...` for an LP relaxation
+"""
+function solution_label(quality)
+    if quality.solve_mode == "lp_relaxation_estimate"
+        return "ESTIMATE LP relaxation (costs are a lower bound; schedule is approximate)"
+    elseif quality.proven_optimal
+        return "OPTIMAL"
+    end
+    return @sprintf("INCUMBENT %s gap %.2f%%", quality.termination_status, 100 * quality.relative_gap)
+end
+
+# Copy of a result table with the solution label as a last `Solution_Status` column
+labelled_table(table, label) = insertcols(table, :Solution_Status => label)
+
+"""
+First and last period (inclusive) in which MCSs may charge or discharge: 6am-9pm
+"""
+function operating_window(delta_T, num_periods)
+    # Calculate allowed time periods based on time interval length
+    # For 30-minute intervals (48 periods): 6am = period 13, 9pm = period 42
+    # For 15-minute intervals (96 periods): 6am = period 25, 9pm = period 84
+    delta_T_hours = delta_T
+    if delta_T_hours == 0.5  # 30-minute intervals
+        allowed_start_period = 13  # 6:00 AM
+        allowed_end_period = 42    # 9:00 PM
+    elseif delta_T_hours == 0.25  # 15-minute intervals
+        allowed_start_period = 25  # 6:00 AM
+        allowed_end_period = 84    # 9:00 PM
+    else
+        # For other interval lengths, calculate based on 6am-9pm (15 hours)
+        allowed_start_period = Int(ceil(6.0 / delta_T_hours)) + 1
+        allowed_end_period = Int(floor(21.0 / delta_T_hours))
+    end
+    
+    # Ensure we don't exceed the actual number of periods
+    allowed_start_period = max(1, allowed_start_period)
+    allowed_end_period = min(num_periods, allowed_end_period)
+    
+    return allowed_start_period, allowed_end_period
+end
+
+"""
+Feasible MCS moves (i, j, t): leave node i in period t and arrive at node j in period
+t + k, where k = tau_trv[i,j] rounded up to whole periods (at least one). Only moves that
+arrive inside the operating window are kept, and construction sites without assigned
+CEVs are never destinations. Returns the arcs and the travel periods per node pair.
+"""
+function travel_arc_index(N, N_c, E, A, T, tau_trv, delta_T)
+    window_start, window_end = operating_window(delta_T, length(T))
+    arcs = Tuple{Int,Int,Int}[]
+    travel_periods = Dict{Tuple{Int,Int},Int}()
+    for i in N, j in N
+        i == j && continue
+        (j in N_c && !any(A[j, e] == 1 for e in E)) && continue
+        k = max(1, ceil(Int, tau_trv[i, j]))
+        travel_periods[(i, j)] = k
+        for t in max(first(T), window_start - k):(window_end - k)
+            push!(arcs, (i, j, t))
+        end
+    end
+    return arcs, travel_periods
+end
+
+"""
+Preprocessing: per-period power bounds implied by the energy limits, used as big-M
+coefficients instead of the rated powers. For every MCS the reachable SOE range is
+propagated forward from SOE_MCS_ini and backward from the final SOE condition over the
+operating window; the charging (discharging) power in period t can only move the SOE
+from the lowest (highest) reachable level at t to the highest (lowest) at t + 1. A CEV
+can absorb at most its headroom above SOE_CEV_ini minus the work scheduled before t,
+plus the work of period t itself. Returns Dicts keyed (m, t) for charging and discharging and (e, t) for
+MCS-to-CEV power; every bound is at most the rated power.
+"""
+function power_bounds(M, T, N_c, E, A, C_MCS_plug, CH_MCS, DCH_MCS, DCH_MCS_plug, R_work,
+                      SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max, SOE_MCS_min,
+                      eta_ch_dch, delta_T)
+    window_start, window_end = operating_window(delta_T, length(T))
+    operating(t) = window_start <= t <= window_end
+    t_last = last(T)
+    DCH_cap = min(DCH_MCS, C_MCS_plug * DCH_MCS_plug)
+
+    cev = Dict{Tuple{Int,Int},Float64}()
+    for e in E
+        work_before = 0.0
+        for t in T
+            work = sum(R_work[i,e,t] * A[i,e] for i in N_c; init=0.0) * delta_T
+            if !operating(t)
+                cev[(e, t)] = 0.0
+            elseif t == t_last
+                cev[(e, t)] = DCH_MCS_plug
+            else
+                lowest = max(SOE_CEV_min[e], SOE_CEV_ini[e] - work_before)
+                cev[(e, t)] = min(DCH_MCS_plug, max(0.0, SOE_CEV_max[e] - lowest + work) / (eta_ch_dch * delta_T))
             end
+            work_before += work
+        end
+    end
+
+    ch = Dict{Tuple{Int,Int},Float64}()
+    dch = Dict{Tuple{Int,Int},Float64}()
+    gain(t) = operating(t) ? CH_MCS * eta_ch_dch * delta_T : 0.0
+    loss(t) = operating(t) ? DCH_cap * delta_T / eta_ch_dch : 0.0
+    for m in M
+        hi = Dict(first(T) => SOE_MCS_ini[m])
+        lo = Dict(first(T) => SOE_MCS_ini[m])
+        for t in T[2:end]
+            hi[t] = min(SOE_MCS_max[m], hi[t-1] + gain(t-1))
+            lo[t] = max(SOE_MCS_min[m], lo[t-1] - loss(t-1))
         end
-        
-        if violation > 1e-6
-            println("Constraint violation in $constraint_name: $violation")
-            println("Value: $val")
-            if is_less_than(constraint)
-                println("Upper bound: $(upper_bound(constraint))")
-            elseif is_greater_than(constraint)
-                println("Lower bound: $(lower_bound(constraint))")
+        hi[t_last] = lo[t_last] = SOE_MCS_ini[m]
+        for t in reverse(T[1:end-1])
+            hi[t] = min(hi[t], hi[t+1] + loss(t))
+            lo[t] = max(lo[t], lo[t+1] - gain(t))
+        end
+        for t in T
+            if !operating(t)
+                ch[(m, t)] = dch[(m, t)] = 0.0
+                continue
+            end
+            demand = sum(sort([cev[(e, t)] for e in E], rev=true)[1:min(C_MCS_plug, length(E))]; init=0.0)
+            if t == t_last
+                ch[(m, t)] = CH_MCS
+                dch[(m, t)] = min(DCH_cap, demand)
+            else
+                ch[(m, t)] = min(CH_MCS, max(0.0, hi[t+1] - lo[t]) / (eta_ch_dch * delta_T))
+                dch[(m, t)] = min(DCH_cap, demand, max(0.0, hi[t] - lo[t+1]) * eta_ch_dch / delta_T)
             end
         end
     end
+    return (ch=ch, dch=dch, cev=cev)
 end
 
 """
-Solve the MCS-CEV optimization model and analyze results
+Groups of interchangeable MCSs: rated powers and plugs are fleet-wide, so MCSs with the
+same initial, maximum and minimum SOE can swap schedules. Only groups of two or more are
+returned.
 """
-function solve_and_analyze(
+function interchangeable_mcs_groups(M, SOE_MCS_ini, SOE_MCS_max, SOE_MCS_min)
+    groups = Dict{Tuple{Float64,Float64,Float64},Vector{Int}}()
+    for m in M
+        push!(get!(groups, (SOE_MCS_ini[m], SOE_MCS_max[m], SOE_MCS_min[m]), Int[]), m)
+    end
+    return sort([sort(g) for g in values(groups) if length(g) > 1], by=first)
+end
+
+"""
+Build the MCS-CEV MILP (variables, objective and constraints) without solving it.
+`grid_power_cap` (kW, a number or a per-period vector) limits the total grid charging
+power of all MCSs in each period; `nothing` leaves it unconstrained.
+With `symmetry_breaking=true`, interchangeable MCSs are ordered so that the lower index
+reaches the construction sites earlier and stays longer, which removes the M! relabelled
+copies of every schedule from the search.
+"""
+function build_model(
     M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
     D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
-    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T, time_labels
+    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+    grid_power_cap=nothing, symmetry_breaking=false, verbose=true
 )
     # Create the model
     model = Model(HiGHS.Optimizer)
     set_silent(model)
 
-    println("\nStarting optimization with parameters:")
-    println("Number of MCSs: ", length(M))
-    println("Number of time periods: ", length(T))
-    println("Number of nodes: ", length(N))
-    println("Number of grid nodes: ", length(N_g))
-    println("Number of construction sites: ", length(N_c))
-    println("Number of EVs: ", length(E))
-    println("MCS battery capacity: ", SOE_MCS_max, " kWh")
-    println("MCS charging rate: ", CH_MCS, " kW")
-    println("MCS discharging rate: ", DCH_MCS, " kW")
-    println("MCS plug power: ", DCH_MCS_plug, " kW")
-    println("Number of plugs per MCS: ", C_MCS_plug)
-    println("Time interval: ", delta_T, " hours")
-    println("\nEV Parameters:")
-    for e in E
-        println("EV $e - Max SOE: ", SOE_CEV_max[e], " kWh, Min SOE: ", SOE_CEV_min[e], " kWh, Initial SOE: ", SOE_CEV_ini[e], " kWh")
+    if verbose
+        println("\nStarting optimization with parameters:")
+        println("Number of MCSs: ", length(M))
+        println("Number of time periods: ", length(T))
+        println("Number of nodes: ", length(N))
+        println("Number of grid nodes: ", length(N_g))
+        println("Number of construction sites: ", length(N_c))
+        println("Number of EVs: ", length(E))
+        println("MCS battery capacity: ", SOE_MCS_max, " kWh")
+        println("MCS charging rate: ", CH_MCS, " kW")
+        println("MCS discharging rate: ", DCH_MCS, " kW")
+        println("MCS plug power: ", DCH_MCS_plug, " kW")
+        println("Number of plugs per MCS: ", C_MCS_plug)
+        println("Time interval: ", delta_T, " hours")
+        println("\nEV Parameters:")
+        for e in E
+            println("EV $e - Max SOE: ", SOE_CEV_max[e], " kWh, Min SOE: ", SOE_CEV_min[e], " kWh, Initial SOE: ", SOE_CEV_ini[e], " kWh")
+        end
     end
 
     # Variables
@@ -83,8 +373,6 @@ function solve_and_analyze(
     @variable(model, P_MCS_CEV[M, N, E, T] >= 0)  # Power from MCS to CEV
     @variable(model, P_work[N, E, T] >= 0)  # Work power
     @variable(model, P_miss_work[N, E, T] >= 0)  # Missed work power
-    @variable(model, L_trv[M, N, N, T] >= 0)  # Travel energy consumption
-    @variable(model, L_trv_tot[M, T] >= 0)  # Total travel energy consumption
     @variable(model, P_ch_tot[M, T] >= 0)  # Total charging power
     @variable(model, P_dch_tot[M, T] >= 0)  # Total discharging power
     @variable(model, SOE_MCS[M, T] >= 0)  # State of energy of MCS
@@ -92,12 +380,15 @@ function solve_and_analyze(
     @variable(model, rho[M, N, E, T], Bin)  # CEV-MCS connection status
     @variable(model, beta_arr[M, N, T], Bin)  # MCS arrival status
     @variable(model, delta_dep[M, N, T], Bin)  # MCS departure status
-    @variable(model, x[M, N, N, T], Bin)  # MCS travel status
+    # MCS travel status, only for feasible moves (see travel_arc_index)
+    arcs, travel_periods = travel_arc_index(N, N_c, E, A, T, tau_trv, delta_T)
+    @variable(model, x[m in M, (i, j, t) in arcs], Bin)
+    model[:travel_arcs] = arcs
     @variable(model, mu[N, E, T], Bin)  # CEV charging status
     @variable(model, z[M, N, T], Bin)  # MCS location status
     @variable(model, y_ch[M, T], Bin)  # 1 if charging, 0 if discharging
 
-    println("\nAdding constraints...")
+    verbose && println("\nAdding constraints...")
 
     # Objective function
     @objective(model, Min,
@@ -107,7 +398,7 @@ function solve_and_analyze(
     )
 
     # Constraints
-    println("Adding power balance constraints...")
+    verbose && println("Adding power balance constraints...")
     
     # Total charging and discharging power constraints
     @constraint(model, [m in M, t in T],
@@ -127,45 +418,30 @@ function solve_and_analyze(
         P_dch_MCS[m,i,t] == sum(P_MCS_CEV[m,i,e,t] for e in E))  # Discharging power to CEVs
 
     # Charging/discharging mode constraints
+    # Big-M coefficients: rated powers tightened by the SOE limits and work schedule
+    bound = power_bounds(M, T, N_c, E, A, C_MCS_plug, CH_MCS, DCH_MCS, DCH_MCS_plug, R_work,
+                         SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max, SOE_MCS_min,
+                         eta_ch_dch, delta_T)
     @constraint(model, [m in M, t in T], y_ch[m, t] == sum(z[m, i, t] for i in N_g))
-    @constraint(model, [m in M, t in T], P_ch_tot[m, t] <= CH_MCS * y_ch[m, t])
-    @constraint(model, [m in M, t in T], P_dch_tot[m, t] <= DCH_MCS * (1 - y_ch[m, t]))
+    @constraint(model, [m in M, t in T], P_ch_tot[m, t] <= bound.ch[(m, t)] * y_ch[m, t])
+    @constraint(model, [m in M, t in T], P_dch_tot[m, t] <= bound.dch[(m, t)] * (1 - y_ch[m, t]))
 
-    println("Adding power limits...")
+    verbose && println("Adding power limits...")
     # Power limits
     @constraint(model, [m in M, i in N, t in T],
-        P_ch_MCS[m,i,t] <= CH_MCS * z[m,i,t])  # MCS charging power limit
+        P_ch_MCS[m,i,t] <= bound.ch[(m, t)] * z[m,i,t])  # MCS charging power limit
     
     @constraint(model, [m in M, i in N, t in T],
-        P_dch_MCS[m,i,t] <= DCH_MCS * z[m,i,t])  # MCS discharging power limit
+        P_dch_MCS[m,i,t] <= bound.dch[(m, t)] * z[m,i,t])  # MCS discharging power limit
     
     @constraint(model, [m in M, i in N, e in E, t in T],
-        P_MCS_CEV[m,i,e,t] <= DCH_MCS_plug * rho[m,i,e,t])  # Per-plug power limit
+        P_MCS_CEV[m,i,e,t] <= bound.cev[(e, t)] * rho[m,i,e,t])  # Per-plug power limit
 
     # Time window constraints: MCS charging/discharging only allowed between 6am-9pm
-    println("Adding time window constraints (6am-9pm)...")
-    
-    # Calculate allowed time periods based on time interval length
-    # For 30-minute intervals (48 periods): 6am = period 13, 9pm = period 42
-    # For 15-minute intervals (96 periods): 6am = period 25, 9pm = period 84
-    delta_T_hours = delta_T
-    if delta_T_hours == 0.5  # 30-minute intervals
-        allowed_start_period = 13  # 6:00 AM
-        allowed_end_period = 42    # 9:00 PM
-    elseif delta_T_hours == 0.25  # 15-minute intervals
-        allowed_start_period = 25  # 6:00 AM
-        allowed_end_period = 84    # 9:00 PM
-    else
-        # For other interval lengths, calculate based on 6am-9pm (15 hours)
-        allowed_start_period = Int(ceil(6.0 / delta_T_hours)) + 1
-        allowed_end_period = Int(floor(21.0 / delta_T_hours))
-    end
-    
-    # Ensure we don't exceed the actual number of periods
-    allowed_start_period = max(1, allowed_start_period)
-    allowed_end_period = min(length(T), allowed_end_period)
+    verbose && println("Adding time window constraints (6am-9pm)...")
     
-    println("Allowed time periods for MCS operations: $allowed_start_period to $allowed_end_period")
+    allowed_start_period, allowed_end_period = operating_window(delta_T, length(T))
+    verbose && println("Allowed time periods for MCS operations: $allowed_start_period to $allowed_end_period")
     
     # Prohibit charging outside allowed hours
     @constraint(model, [m in M, t in T; t < allowed_start_period || t > allowed_end_period],
@@ -175,11 +451,7 @@ function solve_and_analyze(
     @constraint(model, [m in M, t in T; t < allowed_start_period || t > allowed_end_period],
         P_dch_tot[m, t] == 0)
 
-    # Set travel energy consumption to zero (simplification)
-    @constraint(model, [m in M, i in N, j in N, t in T], L_trv[m,i,j,t] == 0)
-    @constraint(model, [m in M, t in T], L_trv_tot[m,t] == 0)
-
-    println("Adding work constraints...")
+    verbose && println("Adding work constraints...")
     # Work constraints
     @constraint(model, [i in N_c, e in E, t in T],
         P_work[i,e,t] + P_miss_work[i,e,t] == R_work[i,e,t] * A[i,e])  # Work requirement only where CEV is assigned
@@ -197,20 +469,19 @@ function solve_and_analyze(
         end
     end
 
-    println("Adding energy balance constraints...")
+    verbose && println("Adding energy balance constraints...")
     # Energy balance constraints (travel energy consumption set to zero for simplification)
     @constraint(model, [m in M, t in T[2:end]],
         SOE_MCS[m,t] == SOE_MCS[m,t-1] +
         P_ch_tot[m,t-1] * eta_ch_dch * delta_T -
         P_dch_tot[m,t-1] * delta_T / eta_ch_dch)
-    # Note: L_trv_tot[m,t-1] removed - travel energy consumption ignored
 
     @constraint(model, [e in E, t in T[2:end]],
         SOE_CEV[e,t] == SOE_CEV[e,t-1] +
         sum(P_MCS_CEV[m,i,e,t-1] for m in M, i in N_c) * eta_ch_dch * delta_T -
         sum(P_work[i,e,t-1] for i in N_c) * delta_T)
 
-    println("Adding initial and final conditions...")
+    verbose && println("Adding initial and final conditions...")
     # Initial and final conditions
     @constraint(model, [m in M], SOE_MCS[m,first(T)] == SOE_MCS_ini[m])
     @constraint(model, [m in M], SOE_MCS[m,last(T)] == SOE_MCS_ini[m])
@@ -223,13 +494,7 @@ function solve_and_analyze(
     @constraint(model, [e in E, t in T], SOE_CEV[e, t] >= SOE_CEV_min[e])
     @constraint(model, [e in E, t in T], SOE_CEV[e, t] <= SOE_CEV_max[e])
 
-    # Create wide bounds only for plotting reference (not for constraints)
-    SOE_MCS_min_wide = Dict(m => SOE_MCS_min[m] - 0.1 * abs(SOE_MCS_min[m]) for m in M)
-    SOE_MCS_max_wide = Dict(m => SOE_MCS_max[m] + 0.1 * abs(SOE_MCS_max[m]) for m in M)
-    SOE_CEV_min_wide = Dict(e => SOE_CEV_min[e] - 0.1 * abs(SOE_CEV_min[e]) for e in E)
-    SOE_CEV_max_wide = Dict(e => SOE_CEV_max[e] + 0.1 * abs(SOE_CEV_max[e]) for e in E)
-
-    println("Adding movement and connection constraints...")
+    verbose && println("Adding movement and connection constraints...")
     # Movement and connection constraints
     @constraint(model, [m in M, i in N_c, t in T],
         sum(rho[m,i,e,t] for e in E) <= C_MCS_plug)  # Limit on number of CEVs connected to an MCS
@@ -246,46 +511,135 @@ function solve_and_analyze(
     # MCS must be at exactly one node at each time
     @constraint(model, [m in M, t in T], sum(z[m,i,t] for i in N) == 1)
 
+    verbose && println("Adding travel constraints ($(length(arcs)) feasible arcs of $(length(N)^2 * length(T)))...")
+    # Travel: a move starts at the MCS's node, every arrival needs a move that ends in that period,
+    # and the MCS neither charges nor discharges while on the road. A move (i, j, t) keeps the
+    # MCS at i for periods t..t+k-1 (it is placed at its origin until it arrives), and at most
+    # one move per MCS is under way in any period, so no departure or arrival can skip tau_trv.
+    arrivals = Dict{Tuple{Int,Int},Vector{Tuple{Int,Int,Int}}}()
+    departures = Dict{Tuple{Int,Int},Vector{Tuple{Int,Int,Int}}}()
+    under_way = Dict{Int,Vector{Tuple{Int,Int,Int}}}()
+    for (i, j, t) in arcs
+        k = travel_periods[(i, j)]
+        push!(get!(arrivals, (j, t + k), Tuple{Int,Int,Int}[]), (i, j, t))
+        push!(get!(departures, (i, t), Tuple{Int,Int,Int}[]), (i, j, t))
+        for s in t:(t + k - 1)
+            push!(get!(under_way, s, Tuple{Int,Int,Int}[]), (i, j, t))
+        end
+    end
+    @constraint(model, [m in M, (i, t) in collect(keys(departures))],
+        sum(x[m,a...] for a in departures[(i, t)]) <= z[m,i,t])
+    @constraint(model, [m in M, s in collect(keys(under_way))],
+        sum(x[m,a...] for a in under_way[s]) <= 1)
+    @constraint(model, [m in M, (i, j, t) in arcs, s in (t + 1):(t + travel_periods[(i, j)] - 1)],
+        z[m,i,s] >= x[m,i,j,t])
+    @constraint(model, [m in M, j in N, t in T[2:end]],
+        z[m,j,t] - z[m,j,t-1] <= sum(x[m,a...] for a in get(arrivals, (j, t), Tuple{Int,Int,Int}[])))
+    @constraint(model, [m in M, (i, j, t) in arcs, s in (t + 1):(t + travel_periods[(i, j)] - 1)],
+        P_ch_MCS[m,i,s] + P_dch_MCS[m,i,s] <= (CH_MCS + DCH_MCS) * (1 - x[m,i,j,t]))
+
+    # Symmetry breaking: within a group of interchangeable MCSs, order by site presence with
+    # earlier periods weighted more (a linear stand-in for "first site visit" ordering). Any
+    # schedule can be relabelled to satisfy it, so the optimum is unchanged.
+    if symmetry_breaking
+        groups = interchangeable_mcs_groups(M, SOE_MCS_ini, SOE_MCS_max, SOE_MCS_min)
+        ordered_pairs = [(g[k], g[k + 1]) for g in groups for k in 1:(length(g) - 1)]
+        verbose && println("Adding symmetry breaking for interchangeable MCS groups: $groups")
+        @constraint(model, mcs_order[(m1, m2) in ordered_pairs],
+            sum((length(T) - t + 1) * (z[m1,i,t] - z[m2,i,t]) for i in N_c, t in T) >= 0)
+    end
+
+    # Shared grid connection: total MCS charging power per period
+    if grid_power_cap !== nothing
+        grid_cap = grid_power_cap isa Number ? fill(Float64(grid_power_cap), length(T)) : grid_power_cap
+        @constraint(model, grid_power_limit[t in T], sum(P_ch_tot[m,t] for m in M) <= grid_cap[t])
+    end
+
+    return model
+end
+
+"""
+Solve the MCS-CEV optimization model and analyze results.
+With `plots=false` no charts are drawn: the plot return values are `nothing` and only the
+result tables are built (see `save_result_charts` to render them later). When the solve
+stopped without a feasible solution, everything after the model and objective is `nothing`.
+"""
+function solve_and_analyze(
+    M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+    D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T, time_labels;
+    diagnostics_dir=nothing, grid_power_cap=nothing, symmetry_breaking=false,
+    time_limit=nothing, mip_gap=nothing, incumbent_log=nothing, estimate=false, plots=true
+)
+    emit_progress("phase"; phase="building", mcs=length(M), cevs=length(E), nodes=length(N), periods=length(T))
+    model = build_model(
+        M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+        D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+        grid_power_cap=grid_power_cap, symmetry_breaking=symmetry_breaking
+    )
+    P_ch_tot = model[:P_ch_tot]
+    P_dch_tot = model[:P_dch_tot]
+    P_miss_work = model[:P_miss_work]
+    SOE_MCS = model[:SOE_MCS]
+
+    # Create wide bounds only for plotting reference (not for constraints)
+    SOE_MCS_min_wide = Dict(m => SOE_MCS_min[m] - 0.1 * abs(SOE_MCS_min[m]) for m in M)
+    SOE_MCS_max_wide = Dict(m => SOE_MCS_max[m] + 0.1 * abs(SOE_MCS_max[m]) for m in M)
+    SOE_CEV_min_wide = Dict(e => SOE_CEV_min[e] - 0.1 * abs(SOE_CEV_min[e]) for e in E)
+    SOE_CEV_max_wide = Dict(e => SOE_CEV_max[e] + 0.1 * abs(SOE_CEV_max[e]) for e in E)
+
+    # Quick estimate: solve the LP relaxation; binaries may take fractional values
+    if estimate
+        relax_integrality(model)
+        model[:lp_relaxation] = true
+        println("Estimate mode: solving the LP relaxation (objective is a lower bound on the MILP optimum)")
+    end
+
+    # Anytime mode: stop at the time limit or gap target with the best incumbent so far
+    time_limit === nothing || set_time_limit_sec(model, time_limit)
+    mip_gap === nothing || set_optimizer_attribute(model, "mip_rel_gap", mip_gap)
+    incumbent_log === nothing || attach_incumbent_log!(model, incumbent_log)
+
     println("\nSolving the model...")
+    emit_progress("phase"; phase="solving", variables=num_variables(model),
+        constraints=num_constraints(model; count_variable_in_set_constraints=false))
     optimize!(model)
+    close_incumbent_log(model)
+    quality = solution_quality(model)
+    emit_progress("solved"; status=termination_status(model), solve_time=solve_time(model),
+        incumbent=quality.objective, bound=quality.best_bound, mip_gap=quality.relative_gap,
+        estimate=estimate)
 
-    # Check solution status and log details
+    # Check solution status and log details; a feasible incumbent from a time or gap
+    # limited solve is kept and reported with its proven gap
     println("\nSolution Status: ", termination_status(model))
-    if termination_status(model) != MOI.OPTIMAL
-        println("\nChecking constraint violations...")
-        
-        # Check power balance constraints
-        println("\nChecking power balance constraints...")
-        for m in M, t in T
-            check_constraint_feasibility(model, "P_ch_tot[$m,$t]", 
-                P_ch_tot[m,t] - sum(P_ch_MCS[m,i,t] for i in N_g))
-            check_constraint_feasibility(model, "P_dch_tot[$m,$t]",
-                P_dch_tot[m,t] - sum(P_dch_MCS[m,i,t] for i in N_c))
-        end
-
-        # Check energy balance constraints
-        println("\nChecking energy balance constraints...")
-        for m in M, t in T[2:end]
-            check_constraint_feasibility(model, "SOE_MCS[$m,$t]",
-                SOE_MCS[m,t] - (SOE_MCS[m,t-1] +
-                P_ch_tot[m,t-1] * eta_ch_dch * delta_T -
-                P_dch_tot[m,t-1] * delta_T / eta_ch_dch -
-                L_trv_tot[m,t-1]))
+    if termination_status(model) != MOI.OPTIMAL && primal_status(model) == MOI.FEASIBLE_POINT
+        @printf("Best incumbent %.4f, bound %.4f, proven gap %.2f%%\n",
+            quality.objective, quality.best_bound, 100 * quality.relative_gap)
+    elseif termination_status(model) != MOI.OPTIMAL
+        println("\nRunning constraint diagnostics...")
+        method, violation_report = constraint_violation_report(model)
+        if nrow(violation_report) == 0
+            println("No violated constraints found (method: $method)")
+        else
+            println("Violated constraints by family (method: $method):")
+            for r in eachrow(violation_report)
+                @printf("  %-50s %8d  max %.3g\n", r.family, r.count, r.max_violation)
+            end
         end
-
-        # Check work constraints
-        println("\nChecking work constraints...")
-        for i in N_c, e in E, t in T
-            check_constraint_feasibility(model, "Work[$i,$e,$t]",
-                P_work[i,e,t] + P_miss_work[i,e,t] - R_work[i,e,t] * A[i,e])
+        if diagnostics_dir !== nothing
+            write_violation_report(violation_report, method, termination_status(model), diagnostics_dir)
+            println("Violation report written to ", joinpath(diagnostics_dir, "constraint_violations.json"))
         end
+    end
 
-        # Check connection constraints
-        println("\nChecking connection constraints...")
-        for m in M, i in N_c, t in T
-            check_constraint_feasibility(model, "Connection[$m,$i,$t]",
-                sum(rho[m,i,e,t] for e in E) - C_MCS_plug)
-        end
+    # A time or node limit can stop the solve before any feasible solution is found: there is
+    # nothing to analyze, so only the model and a NaN objective are returned (the other 22
+    # values are `nothing`) and the caller reports the status from solution_quality(model)
+    if !has_values(model)
+        println("No feasible solution found within the limits (", termination_status(model), ")")
+        return (model, NaN, ntuple(_ -> nothing, 22)...)
     end
 
     # Calculate metrics
@@ -345,27 +699,48 @@ function solve_and_analyze(
     println("• Average Power: Total energy ÷ total time")
     println("• Duty Cycle: Percentage of time spent charging")
 
-    # Create visualizations
+    emit_progress("phase"; phase="analyzing")
+
     now_str = Dates.format(now(), "yyyy-mm-dd HH:MM:SS")
-    # Use time_labels as a vector of strings for all plots
-    mcs_power_plots, mcs_csv_data = plot_power_profiles(model, M, N, T, delta_T, time_labels)
-    p_total_grid, total_grid_csv = plot_total_grid_power_profile(model, M, N, T, delta_T, time_labels)
-    p2, mcs_soe_csv = plot_soe_profiles(model, M, T, delta_T, time_labels, SOE_MCS_max, SOE_MCS_min, now_str)
-    p3, cev_soe_csv = plot_cev_soe_profiles(model, E, T, delta_T, time_labels, SOE_CEV_max, SOE_CEV_min, SOE_CEV_min_wide, SOE_CEV_max_wide, now_str)
-    p4, work_csv = plot_work_profiles(model, N, N_c, E, T, delta_T, time_labels)
-    p_price_emission, price_emission_csv = plot_price_emission_factors(lambda_whl_elec, lambda_CO2, T, time_labels)
-    p5, mcs_trajectory_csv = plot_mcs_time_trajectory(model, M, N, N_g, N_c, T, time_labels)
-    
-    # Create a combined plot without individual MCS power profiles (they will be saved separately)
-    p_combined = plot(p2, p3, p_price_emission, p4, p5, layout=(3,2), size=(1400,1200))
+    tables = result_tables(model, M, N, N_g, N_c, E, T, time_labels, SOE_MCS_max, SOE_MCS_min,
+                           SOE_CEV_max_wide, SOE_CEV_min_wide, lambda_whl_elec, lambda_CO2)
+    mcs_csv_data, total_grid_csv, mcs_soe_csv, cev_soe_csv = tables.mcs_power, tables.total_grid, tables.mcs_soe, tables.cev_soe
+    work_csv, price_emission_csv, mcs_trajectory_csv = tables.work, tables.price_emission, tables.mcs_trajectory
+
+    # Create visualizations; with deferred plots only the tables are returned
+    p_combined = p5 = p6 = p_price_emission = mcs_power_plots = p_total_grid = nothing
+    if plots
+        mcs_power_plots = [mcs_power_chart(m, table) for (m, table) in zip(M, mcs_csv_data)]
+        p_total_grid = total_grid_chart(total_grid_csv)
+        p2 = mcs_soe_chart(mcs_soe_csv, now_str)
+        p3 = cev_soe_chart(cev_soe_csv, now_str)
+        p4 = work_chart(work_csv)
+        p_price_emission = price_emission_chart(price_emission_csv)
+        p5 = mcs_trajectory_chart(mcs_trajectory_csv, N, N_g)
 
-    p6 = plot_mcs_routes(model, M, N, T, D)
+        # Create a combined plot without individual MCS power profiles (they will be saved separately)
+        p_combined = plot(p2, p3, p_price_emission, p4, p5, layout=(3,2), size=(1400,1200))
+
+        p6 = plot_mcs_routes(model, M, N, T, D)
+    end
 
     return model, objective_value(model), total_energy_from_grid, total_missed_work,
            total_carbon_emissions, total_electricity_cost, p_combined, p5, p6, SOE_MCS_min_wide, SOE_MCS_max_wide, SOE_CEV_min_wide, SOE_CEV_max_wide, now_str, p_price_emission, mcs_power_plots, p_total_grid,
            mcs_csv_data, total_grid_csv, mcs_soe_csv, cev_soe_csv, work_csv, price_emission_csv, mcs_trajectory_csv
 end
 
+# Result tables and charts. Every CSV file of a run is a table built from the solved model,
+# and every chart is drawn from tables only, so a run solved with deferred plots can be
+# rendered later from its CSV files (see mcs_render_charts.jl).
+
+"""
+Ids of the series in a result table from its column names, e.g. `r"^MCS_(.+)_SOE_kWh\$"`
+gives `["1", "2"]` for columns `MCS_1_SOE_kWh` and `MCS_2_SOE_kWh`
+"""
+function series_ids(table, pattern)
+    return [m.captures[1] for m in (match(pattern, name) for name in names(table)) if m !== nothing]
+end
+
 # Helper function to create readable time labels
 function create_readable_time_labels(T, time_labels)
     # Adjust step size based on number of periods for better readability
@@ -386,286 +761,262 @@ function create_readable_time_labels(T, time_labels)
     return readable_T, readable_times
 end
 
-# Plotting functions
-function plot_power_profiles(model, M, N, T, delta_T, time_labels)
-    readable_T, readable_times = create_readable_time_labels(T, time_labels)
-    
-    # Create individual plots for each MCS
-    mcs_plots = []
-    mcs_csv_data = []
-    
-    for (m_idx, m) in enumerate(M)
-        p = plot(title="MCS $m Power Profile", xlabel="Time", ylabel="Power (kW)", 
-                 xticks=(readable_T, readable_times), xlims=(first(T), last(T)),
-                 size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
-        
-        # Get charging and discharging data for this MCS
-        charging = [value(model[:P_ch_tot][m,t]) for t in T]
-        discharging = [value(model[:P_dch_tot][m,t]) for t in T]
-        
-        # Plot charging bars (positive)
-        bar!(p, T, charging, label="Charging", color=:blue, alpha=0.8)
-        
-        # Plot discharging bars (negative)
-        bar!(p, T, -discharging, label="Discharging", color=:red, alpha=0.6)
-        
-        # Add horizontal line at zero to separate charging and discharging
-        hline!(p, [0], color=:black, linestyle=:dash, alpha=0.5, label=nothing)
-        
-        # Create CSV data for this MCS
-        csv_data = DataFrame(
-            Time_Period = T,
-            Time_Label = time_labels,
-            Charging_Power_kW = charging,
-            Discharging_Power_kW = discharging,
-            Net_Power_kW = charging .- discharging
-        )
-        
-        push!(mcs_plots, p)
-        push!(mcs_csv_data, csv_data)
+# Time axis of a table with Time_Period and Time_Label columns
+function table_time_axis(table)
+    T = collect(table.Time_Period)
+    readable_T, readable_times = create_readable_time_labels(T, string.(table.Time_Label))
+    return T, readable_T, readable_times
+end
+
+# Result tables (one per CSV file)
+function mcs_power_table(model, m, T, time_labels)
+    charging = [value(model[:P_ch_tot][m,t]) for t in T]
+    discharging = [value(model[:P_dch_tot][m,t]) for t in T]
+    return DataFrame(
+        Time_Period = T,
+        Time_Label = time_labels,
+        Charging_Power_kW = charging,
+        Discharging_Power_kW = discharging,
+        Net_Power_kW = charging .- discharging
+    )
+end
+
+# Total grid power: the SUM of all MCSs
+function total_grid_table(model, M, T, time_labels)
+    total_charging = [sum(value(model[:P_ch_tot][m,t]) for m in M) for t in T]
+    total_discharging = [sum(value(model[:P_dch_tot][m,t]) for m in M) for t in T]
+    return DataFrame(
+        Time_Period = T,
+        Time_Label = time_labels,
+        Total_Charging_Power_kW = total_charging,
+        Total_Discharging_Power_kW = total_discharging,
+        Net_Power_kW = total_charging .- total_discharging
+    )
+end
+
+function mcs_soe_table(model, M, T, time_labels, SOE_MCS_max, SOE_MCS_min)
+    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
+    for m in M
+        csv_data[!, "MCS_$(m)_SOE_kWh"] = [value(model[:SOE_MCS][m,t]) for t in T]
+        csv_data[!, "MCS_$(m)_Max_SOE_kWh"] = fill(SOE_MCS_max[m], length(T))
+        csv_data[!, "MCS_$(m)_Min_SOE_kWh"] = fill(SOE_MCS_min[m], length(T))
     end
-    
-    return mcs_plots, mcs_csv_data
+    return csv_data
 end
 
-# New function for total grid power profile showing the SUM of all MCSs
-function plot_total_grid_power_profile(model, M, N, T, delta_T, time_labels)
-    readable_T, readable_times = create_readable_time_labels(T, time_labels)
-    p = plot(title="Total Grid Power Profile (Sum of All MCSs)", xlabel="Time", ylabel="Power (kW)", 
-             xticks=(readable_T, readable_times), xlims=(first(T), last(T)),
-             size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
-    
-    # Calculate TOTAL charging and discharging (sum of all MCSs)
-    total_charging = zeros(length(T))
-    total_discharging = zeros(length(T))
-    
+function cev_soe_table(model, E, T, time_labels, SOE_CEV_max, SOE_CEV_min)
+    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
+    for e in E
+        csv_data[!, "CEV_$(e)_SOE_kWh"] = [value(model[:SOE_CEV][e,t]) for t in T]
+        csv_data[!, "CEV_$(e)_Max_SOE_kWh"] = fill(SOE_CEV_max[e], length(T))
+        csv_data[!, "CEV_$(e)_Min_SOE_kWh"] = fill(SOE_CEV_min[e], length(T))
+    end
+    return csv_data
+end
+
+function work_table(model, N_c, E, T, time_labels)
+    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
+    for i in N_c
+        # Work power of this construction site across all EVs
+        csv_data[!, "Site_$(i)_Work_Power_kW"] = [sum(value.(model[:P_work][i,e,t]) for e in E) for t in T]
+    end
+    csv_data[!, "Total_Work_Power_kW"] = [sum(value.(model[:P_work][i,e,t]) for i in N_c, e in E) for t in T]
+    return csv_data
+end
+
+function price_emission_table(lambda_whl_elec, lambda_CO2, T, time_labels)
+    return DataFrame(
+        Time_Period = T,
+        Time_Label = time_labels,
+        Electricity_Price_USD_per_kWh = [lambda_whl_elec[t] for t in T],
+        CO2_Emission_Factor_kg_CO2_per_kWh = [lambda_CO2[t] for t in T]
+    )
+end
+
+function mcs_trajectory_table(model, M, N, N_g, T, time_labels)
+    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
     for m in M
-        charging = [value(model[:P_ch_tot][m,t]) for t in T]
-        discharging = [value(model[:P_dch_tot][m,t]) for t in T]
-        total_charging .+= charging
-        total_discharging .+= discharging
+        # Node of each period; while travelling the MCS stays at its last node
+        locations = []
+        last_loc = nothing
+        for t in T
+            k = findfirst(node -> value(model[:z][m,node,t]) > 0.5, N)
+            if k !== nothing
+                last_loc = N[k]
+            end
+            push!(locations, something(last_loc, N[1]))
+        end
+        csv_data[!, "MCS_$(m)_Location"] = locations
+        csv_data[!, "MCS_$(m)_Location_Type"] = [node in N_g ? "Grid" : "Construction" for node in locations]
     end
+    return csv_data
+end
+
+"""
+All result tables of a solved model, keyed like the CSV files they are saved to
+"""
+function result_tables(model, M, N, N_g, N_c, E, T, time_labels, SOE_MCS_max, SOE_MCS_min,
+                       SOE_CEV_max, SOE_CEV_min, lambda_whl_elec, lambda_CO2)
+    return (
+        mcs_power = [mcs_power_table(model, m, T, time_labels) for m in M],
+        total_grid = total_grid_table(model, M, T, time_labels),
+        mcs_soe = mcs_soe_table(model, M, T, time_labels, SOE_MCS_max, SOE_MCS_min),
+        cev_soe = cev_soe_table(model, E, T, time_labels, SOE_CEV_max, SOE_CEV_min),
+        work = work_table(model, N_c, E, T, time_labels),
+        price_emission = price_emission_table(lambda_whl_elec, lambda_CO2, T, time_labels),
+        mcs_trajectory = mcs_trajectory_table(model, M, N, N_g, T, time_labels)
+    )
+end
+
+# Charts (drawn from result tables only)
+function mcs_power_chart(m, table)
+    T, readable_T, readable_times = table_time_axis(table)
+    p = plot(title="MCS $m Power Profile", xlabel="Time", ylabel="Power (kW)", 
+             xticks=(readable_T, readable_times), xlims=(first(T), last(T)),
+             size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
     
-    # Plot TOTAL charging bars (positive)
-    bar!(p, T, total_charging, label="Total Charging (Grid)", color=:blue, alpha=0.8)
-    
-    # Plot TOTAL discharging bars (negative)
-    bar!(p, T, -total_discharging, label="Total Discharging (CEVs)", color=:red, alpha=0.6)
+    # Charging bars (positive) and discharging bars (negative)
+    bar!(p, T, table.Charging_Power_kW, label="Charging", color=:blue, alpha=0.8)
+    bar!(p, T, -table.Discharging_Power_kW, label="Discharging", color=:red, alpha=0.6)
     
     # Add horizontal line at zero to separate charging and discharging
     hline!(p, [0], color=:black, linestyle=:dash, alpha=0.5, label=nothing)
+    return p
+end
+
+function total_grid_chart(table)
+    T, readable_T, readable_times = table_time_axis(table)
+    p = plot(title="Total Grid Power Profile (Sum of All MCSs)", xlabel="Time", ylabel="Power (kW)", 
+             xticks=(readable_T, readable_times), xlims=(first(T), last(T)),
+             size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
     
-    # Create CSV data
-    csv_data = DataFrame(
-        Time_Period = T,
-        Time_Label = time_labels,
-        Total_Charging_Power_kW = total_charging,
-        Total_Discharging_Power_kW = total_discharging,
-        Net_Power_kW = total_charging .- total_discharging
-    )
+    # TOTAL charging bars (positive) and TOTAL discharging bars (negative)
+    bar!(p, T, table.Total_Charging_Power_kW, label="Total Charging (Grid)", color=:blue, alpha=0.8)
+    bar!(p, T, -table.Total_Discharging_Power_kW, label="Total Discharging (CEVs)", color=:red, alpha=0.6)
     
-    return p, csv_data
+    # Add horizontal line at zero to separate charging and discharging
+    hline!(p, [0], color=:black, linestyle=:dash, alpha=0.5, label=nothing)
+    return p
 end
 
-function plot_soe_profiles(model, M, T, delta_T, time_labels, SOE_MCS_max, SOE_MCS_min, now_str)
-    readable_T, readable_times = create_readable_time_labels(T, time_labels)
+function mcs_soe_chart(table, now_str)
+    T, readable_T, readable_times = table_time_axis(table)
     p = plot(title="MCS State of Energy", xlabel="Time", ylabel="Energy (kWh)", 
              xticks=(readable_T, readable_times), size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
     
-    # Create CSV data
-    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
-    
     # Define colors for different MCSs
     mcs_colors = [:blue, :red, :green, :purple, :orange]
     
-    for (m_idx, m) in enumerate(M)
+    mcs_ids = series_ids(table, r"^MCS_(.+)_SOE_kWh$")
+    for (m_idx, m) in enumerate(mcs_ids)
         color = mcs_colors[mod1(m_idx, length(mcs_colors))]
-        soe_values = [value(model[:SOE_MCS][m,t]) for t in T]
-        plot!(p, T, soe_values, label="MCS $m", color=color, linewidth=2)
-        
-        # Add to CSV data
-        csv_data[!, "MCS_$(m)_SOE_kWh"] = soe_values
-        csv_data[!, "MCS_$(m)_Max_SOE_kWh"] = fill(SOE_MCS_max[m], length(T))
-        csv_data[!, "MCS_$(m)_Min_SOE_kWh"] = fill(SOE_MCS_min[m], length(T))
+        plot!(p, T, table[!, "MCS_$(m)_SOE_kWh"], label="MCS $m", color=color, linewidth=2)
     end
     
-    # Use original bounds from dataset for plotting (not wide bounds)
-    max_values = [SOE_MCS_max[m] for m in M]
-    min_values = [SOE_MCS_min[m] for m in M]
+    max_values = [first(table[!, "MCS_$(m)_Max_SOE_kWh"]) for m in mcs_ids]
+    min_values = [first(table[!, "MCS_$(m)_Min_SOE_kWh"]) for m in mcs_ids]
     hline!(p, max_values, color=:black, linestyle=:dash, label="Max Energy")
     hline!(p, min_values, color=:gray, linestyle=:dash, label="Min Energy")
     annotate!(p, 0.5, 0.95, text("Generated: $now_str", :gray, 10, :left))
-    
-    return p, csv_data
+    return p
 end
 
-function plot_cev_soe_profiles(model, E, T, delta_T, time_labels, SOE_CEV_max, SOE_CEV_min, SOE_CEV_min_dict, SOE_CEV_max_dict, now_str)
-    readable_T, readable_times = create_readable_time_labels(T, time_labels)
+function cev_soe_chart(table, now_str)
+    T, readable_T, readable_times = table_time_axis(table)
     p = plot(title="CEV State of Energy", xlabel="Time", ylabel="Energy (kWh)", 
              xticks=(readable_T, readable_times), size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
     
-    # Create CSV data
-    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
-    
-    for (e_idx, e) in enumerate(E)
-        soe_values = [value(model[:SOE_CEV][e,t]) for t in T]
-        plot!(p, T, soe_values, label="CEV $e")
-        
-        # Add to CSV data
-        csv_data[!, "CEV_$(e)_SOE_kWh"] = soe_values
-        csv_data[!, "CEV_$(e)_Max_SOE_kWh"] = fill(SOE_CEV_max_dict[e], length(T))
-        csv_data[!, "CEV_$(e)_Min_SOE_kWh"] = fill(SOE_CEV_min_dict[e], length(T))
-        
-        # Convert dictionary values to arrays for plotting
-        max_values = [SOE_CEV_max_dict[e] for e in E]
-        min_values = [SOE_CEV_min_dict[e] for e in E]
-        hline!(p, max_values, color=:black, linestyle=:dot, label=(e_idx==1 ? "CEV Max (wide)" : nothing))
-        hline!(p, min_values, color=:gray, linestyle=:dot, label=(e_idx==1 ? "CEV Min (wide)" : nothing))
+    cev_ids = series_ids(table, r"^CEV_(.+)_SOE_kWh$")
+    for e in cev_ids
+        plot!(p, T, table[!, "CEV_$(e)_SOE_kWh"], label="CEV $e")
+    end
+    if !isempty(cev_ids)
+        max_values = [first(table[!, "CEV_$(e)_Max_SOE_kWh"]) for e in cev_ids]
+        min_values = [first(table[!, "CEV_$(e)_Min_SOE_kWh"]) for e in cev_ids]
+        hline!(p, max_values, color=:black, linestyle=:dot, label="CEV Max (wide)")
+        hline!(p, min_values, color=:gray, linestyle=:dot, label="CEV Min (wide)")
     end
     annotate!(p, 0.5, 0.95, text("Generated: $now_str", :gray, 10, :left))
-    
-    return p, csv_data
+    return p
 end
 
-function plot_work_profiles(model, N, N_c, E, T, delta_T, time_labels)
-    readable_T, readable_times = create_readable_time_labels(T, time_labels)
+function work_chart(table)
+    T, readable_T, readable_times = table_time_axis(table)
     p = plot(title="Work Power Profiles by Site", xlabel="Time", ylabel="Power (kW)", 
              xticks=(readable_T, readable_times), size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
     
-    # Create CSV data
-    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
-    
     # Define colors for different construction sites
     site_colors = [:blue, :red, :green, :purple, :orange, :brown, :pink, :gray, :olive, :cyan]
     
-    for (i_idx, i) in enumerate(N_c)
-        # Get work power for this construction site across all EVs
-        site_work = [sum(value.(model[:P_work][i,e,t]) for e in E) for t in T]
-        
+    for (i_idx, i) in enumerate(series_ids(table, r"^Site_(.+)_Work_Power_kW$"))
+        site_work = table[!, "Site_$(i)_Work_Power_kW"]
         # Only plot if this site has work (non-zero values)
         if maximum(site_work) > 0
             color = site_colors[mod1(i_idx, length(site_colors))]
             plot!(p, T, site_work, label="Site $i", color=color, linewidth=2)
         end
-        
-        # Add to CSV data
-        csv_data[!, "Site_$(i)_Work_Power_kW"] = site_work
     end
-    
-    # Add total work power
-    total_work = [sum(value.(model[:P_work][i,e,t]) for i in N_c, e in E) for t in T]
-    csv_data[!, "Total_Work_Power_kW"] = total_work
-    
-    return p, csv_data
+    return p
 end
 
-function plot_mcs_routes(model, M, N, T, D)
-    p = plot(title="MCS Routes", xlabel="X", ylabel="Y", aspect_ratio=:equal)
-    
-    # Create simple 2D coordinates for nodes
-    coords = Dict()
-    n_nodes = length(N)
-    for (i, node) in enumerate(N)
-        angle = 2π * (i-1) / n_nodes
-        coords[node] = (5 * cos(angle), 5 * sin(angle))
-    end
-    
-    # Plot nodes
-    for node in N
-        scatter!(p, [coords[node][1]], [coords[node][2]], 
-                label="Node $node", markersize=10)
-        annotate!(p, coords[node][1], coords[node][2], text("Node $node", :black, 10))
-    end
-    
-    # Plot routes
-    colors = [:red, :blue, :green, :purple]
-    for (m_idx, m) in enumerate(M)
-        for t in T
-            for i in N, j in N
-                if value(model[:x][m,i,j,t]) > 0.5
-                    plot!(p, [coords[i][1], coords[j][1]], 
-                          [coords[i][2], coords[j][2]],
-                          arrow=true, color=colors[mod1(m_idx,4)],
-                          label=nothing, linewidth=2)
-                end
-            end
-        end
-    end
-    
-    return p
+function price_emission_chart(table)
+    T, readable_T, readable_times = table_time_axis(table)
+    p_electricity = plot(
+        title="Electricity Prices Over Time",
+        xlabel="Time",
+        ylabel="Electricity Price (\$/kWh)",
+        legend=:topright,
+        grid=true,
+        xticks=(readable_T, readable_times),
+        size=(900, 500), xrotation=45, bottom_margin=5Plots.mm
+    )
+    plot!(p_electricity, T, table.Electricity_Price_USD_per_kWh, label="Electricity Price", color=:blue, linewidth=2)
+    return p_electricity
 end
 
-function plot_mcs_time_trajectory(model, M, N, N_g, N_c, T, time_labels)
-    # Create descriptive labels for y-axis
-    node_labels = []
-    for node in N
-        if node in N_g
-            push!(node_labels, "Grid $node")
-        else
-            push!(node_labels, "Site $node")
-        end
+"""
+MCS location chart; `N` and `N_g` label the y axis with every node of the network (when
+only the table is known, the nodes it visits)
+"""
+function mcs_trajectory_chart(table, N=nothing, N_g=nothing)
+    mcs_ids = series_ids(table, r"^MCS_(.+)_Location$")
+    if N === nothing
+        N = sort(unique(vcat([table[!, "MCS_$(m)_Location"] for m in mcs_ids]...)))
+        N_g = unique(vcat([table[table[!, "MCS_$(m)_Location_Type"] .== "Grid", "MCS_$(m)_Location"] for m in mcs_ids]...))
     end
+    # Create descriptive labels for y-axis
+    node_labels = [node in N_g ? "Grid $node" : "Site $node" for node in N]
     
-    readable_T, readable_times = create_readable_time_labels(T, time_labels)
+    T, readable_T, readable_times = table_time_axis(table)
     p = plot(title="MCS Location Over Time", xlabel="Time", ylabel="Node Type", 
              yticks=(N, node_labels), xticks=(readable_T, readable_times),
              size=(900, 500), xrotation=45, bottom_margin=5Plots.mm)
     
-    # Create CSV data
-    csv_data = DataFrame(Time_Period = T, Time_Label = time_labels)
-    
     colors = [:red, :blue, :green, :purple]
-    for (m_idx, m) in enumerate(M)
-        locations = []
-        times = []
-        last_loc = nothing
-        for t in T
-            found = false
-            for node in N
-                zval = value(model[:z][m,node,t])
-                if zval > 0.5
-                    push!(locations, node)
-                    push!(times, t)
-                    last_loc = node
-                    found = true
-                    break
-                end
-            end
-            if !found
-                if last_loc !== nothing
-                    push!(locations, last_loc)
-                else
-                    push!(locations, N[1])
-                end
-                push!(times, t)
-            end
-        end
-        
-        # Add to CSV data
-        csv_data[!, "MCS_$(m)_Location"] = locations
-        csv_data[!, "MCS_$(m)_Location_Type"] = [node in N_g ? "Grid" : "Construction" for node in locations]
-        
-        # Now build stepwise arrays
-        step_times = [times[1]]
+    for (m_idx, m) in enumerate(mcs_ids)
+        locations = table[!, "MCS_$(m)_Location"]
+        # Stepwise arrays: a move is drawn as a vertical step at its period
+        step_times = [T[1]]
         step_locations = [locations[1]]
-        for i in 2:length(times)
+        for i in 2:length(T)
             if locations[i] != locations[i-1]
-                push!(step_times, times[i])
+                push!(step_times, T[i])
                 push!(step_locations, locations[i-1])
             end
-            push!(step_times, times[i])
+            push!(step_times, T[i])
             push!(step_locations, locations[i])
         end
-        if !isempty(step_locations)
-            plot!(p, step_times, step_locations, color=colors[mod1(m_idx,4)], label="MCS $m", linewidth=2, marker=:circle, markersize=6)
-        end
+        plot!(p, step_times, step_locations, color=colors[mod1(m_idx,4)], label="MCS $m", linewidth=2, marker=:circle, markersize=6)
     end
     plot!(p, grid=true)
-    
-    return p, csv_data
+    return p
 end
 
-function plot_node_map_with_cev(N, N_g, N_c, E, A, model, M, T, D)
+"""
+Node map with CEV assignments; `mcs_nodes` holds, per MCS, its node in the first and last
+period (`nothing` where unknown)
+"""
+function node_map_chart(N, N_g, N_c, E, A, D, mcs_nodes)
     p = plot(title="Node Map with CEV Assignments", xlabel="X", ylabel="Y", aspect_ratio=:equal, legend=:right)
     coords = Dict()
     n_nodes = length(N)
@@ -703,65 +1054,187 @@ function plot_node_map_with_cev(N, N_g, N_c, E, A, model, M, T, D)
     end
     # Show MCS location at first and last time step (one label each)
     mcs_labeled = false
-    for (m_idx, m) in enumerate(M)
-        for (t_idx, t) in enumerate([first(T), last(T)])
-            for node in N
-                if value(model[:z][m,node,t]) > 0.5
-                    # Shift MCS icon slightly away from the node
-                    offset = 0.3
-                    x_shift = coords[node][1] + offset
-                    y_shift = coords[node][2] + offset
-                    scatter!(p, [x_shift], [y_shift], color=:black, marker=:diamond, markersize=14, label=(mcs_labeled ? nothing : (t_idx==1 ? "MCS at start" : "MCS at end")))
-                    mcs_labeled = true
-                end
-            end
+    for ends in mcs_nodes
+        for (t_idx, node) in enumerate(ends)
+            node === nothing && continue
+            # Shift MCS icon slightly away from the node
+            offset = 0.3
+            x_shift = coords[node][1] + offset
+            y_shift = coords[node][2] + offset
+            scatter!(p, [x_shift], [y_shift], color=:black, marker=:diamond, markersize=14, label=(mcs_labeled ? nothing : (t_idx==1 ? "MCS at start" : "MCS at end")))
+            mcs_labeled = true
         end
     end
     return p
 end
 
-function plot_price_emission_factors(lambda_whl_elec, lambda_CO2, T, time_labels)
-    # Create separate plots for better visualization
-    readable_T, readable_times = create_readable_time_labels(T, time_labels)
-    
-    # Create CSV data
-    csv_data = DataFrame(
-        Time_Period = T,
-        Time_Label = time_labels,
-        Electricity_Price_USD_per_kWh = [lambda_whl_elec[t] for t in T],
-        CO2_Emission_Factor_kg_CO2_per_kWh = [lambda_CO2[t] for t in T]
-    )
-    
-    # Electricity Price Plot
-    p_electricity = plot(
-        title="Electricity Prices Over Time",
-        xlabel="Time",
-        ylabel="Electricity Price (\$/kWh)",
-        legend=:topright,
-        grid=true,
-        xticks=(readable_T, readable_times),
-        size=(900, 500), xrotation=45, bottom_margin=5Plots.mm
-    )
+"""
+First and last node of every MCS in a trajectory table, for `node_map_chart`
+"""
+function trajectory_endpoints(table)
+    return [(first(table[!, "MCS_$(m)_Location"]), last(table[!, "MCS_$(m)_Location"]))
+            for m in series_ids(table, r"^MCS_(.+)_Location$")]
+end
+
+function optimization_summary_chart(M, E, N, N_g, N_c, T, SOE_MCS_max_wide, SOE_MCS_min_wide,
+                                    CH_MCS, DCH_MCS, C_MCS_plug, delta_T)
+    summary_text = """
+    Optimization Summary
+    -------------------
+    Number of MCSs: $(length(M))
+    Number of CEVs: $(length(E))
+    Number of nodes: $(length(N)) (Grid: $(length(N_g)), Construction: $(length(N_c)))
+    MCS Max Energy: $SOE_MCS_max_wide kWh
+    MCS Min Energy: $SOE_MCS_min_wide kWh
+    MCS Charging Rate: $CH_MCS kW
+    MCS Discharging Rate: $DCH_MCS kW
+    Plugs per MCS: $C_MCS_plug
+    Time interval: $delta_T h
+    Number of periods: $(length(T))
+    """
+    # The summary is a dummy plot holding the text
+    p_summary = plot(legend=false, grid=false, framestyle=:none, xticks=false, yticks=false)
+    annotate!(p_summary, 0, 0.5, text(summary_text, :black, 12, :left))
+    return p_summary
+end
+
+"""
+Draw and save the PNG charts of a run into `run_dir` from its result `tables` (the
+`result_tables` fields, as solved or read back from the CSV files).
+
+`network` = `(N=, N_g=, N_c=, E=, A=, D=)` and `summary_chart` (a plot) come from the
+dataset; without them the node map, summary and combined view are skipped. `only`
+restricts the output to the given file names. Returns the names of the files written.
+
+Each PNG is written under a temporary name and renamed into place, so a chart being
+served while it is (re)rendered is never read half-written.
+"""
+function save_result_charts(run_dir, tables; network=nothing, summary_chart=nothing,
+                            now_str=Dates.format(now(), "yyyy-mm-dd HH:MM:SS"), only=nothing)
+    wanted(file) = only === nothing || file in only
+    written = String[]
+    function save(p, file)
+        partial = joinpath(run_dir, ".$(getpid()).$(file)")  # keeps the .png extension for savefig
+        savefig(p, partial)
+        mv(partial, joinpath(run_dir, file); force=true)
+        push!(written, file)
+        return p
+    end
+
+    for (m, table) in enumerate(tables.mcs_power)
+        wanted("mcs_$(m)_power_profile.png") && save(mcs_power_chart(m, table), "mcs_$(m)_power_profile.png")
+    end
+
+    combined = network !== nothing && summary_chart !== nothing && wanted("mcs_optimization_results.png")
+    charts = [
+        ("01_total_grid_power_profile.png", () -> total_grid_chart(tables.total_grid)),
+        ("02_work_profiles_by_site.png", () -> work_chart(tables.work)),
+        ("03_mcs_state_of_energy.png", () -> mcs_soe_chart(tables.mcs_soe, now_str)),
+        ("04_cev_state_of_energy.png", () -> cev_soe_chart(tables.cev_soe, now_str)),
+        ("05_electricity_prices.png", () -> price_emission_chart(tables.price_emission)),
+        ("06_mcs_location_trajectory.png", () -> network === nothing ?
+            mcs_trajectory_chart(tables.mcs_trajectory) :
+            mcs_trajectory_chart(tables.mcs_trajectory, network.N, network.N_g)),
+        ("07_node_map_with_cev_assignments.png", () -> network === nothing ? nothing :
+            node_map_chart(network.N, network.N_g, network.N_c, network.E, network.A, network.D,
+                trajectory_endpoints(tables.mcs_trajectory))),
+        ("08_optimization_summary.png", () -> summary_chart)
+    ]
+    panels = []
+    for (file, draw) in charts
+        (combined || wanted(file)) || continue
+        p = draw()
+        p === nothing && continue
+        wanted(file) && save(p, file)
+        push!(panels, p)
+    end
+
+    # Combined view of the 8 charts (individual MCS power profiles are saved separately)
+    if combined
+        save(plot(panels..., layout = (4,2), size = (1800, 2200)), "mcs_optimization_results.png")
+    end
+    return written
+end
+
+# Plotting functions on a solved model (chart, table)
+function plot_power_profiles(model, M, N, T, delta_T, time_labels)
+    mcs_csv_data = [mcs_power_table(model, m, T, time_labels) for m in M]
+    mcs_plots = [mcs_power_chart(m, table) for (m, table) in zip(M, mcs_csv_data)]
+    return mcs_plots, mcs_csv_data
+end
+
+# Total grid power profile showing the SUM of all MCSs
+function plot_total_grid_power_profile(model, M, N, T, delta_T, time_labels)
+    csv_data = total_grid_table(model, M, T, time_labels)
+    return total_grid_chart(csv_data), csv_data
+end
+
+function plot_soe_profiles(model, M, T, delta_T, time_labels, SOE_MCS_max, SOE_MCS_min, now_str)
+    csv_data = mcs_soe_table(model, M, T, time_labels, SOE_MCS_max, SOE_MCS_min)
+    return mcs_soe_chart(csv_data, now_str), csv_data
+end
+
+function plot_cev_soe_profiles(model, E, T, delta_T, time_labels, SOE_CEV_max, SOE_CEV_min, SOE_CEV_min_dict, SOE_CEV_max_dict, now_str)
+    csv_data = cev_soe_table(model, E, T, time_labels, SOE_CEV_max_dict, SOE_CEV_min_dict)
+    return cev_soe_chart(csv_data, now_str), csv_data
+end
+
+function plot_work_profiles(model, N, N_c, E, T, delta_T, time_labels)
+    csv_data = work_table(model, N_c, E, T, time_labels)
+    return work_chart(csv_data), csv_data
+end
+
+function plot_mcs_routes(model, M, N, T, D)
+    p = plot(title="MCS Routes", xlabel="X", ylabel="Y", aspect_ratio=:equal)
     
-    # CO2 Emission Factor Plot
-    p_emissions = plot(
-        title="CO2 Emission Factors Over Time",
-        xlabel="Time",
-        ylabel="Emission Factor (kg CO2/kWh)",
-        legend=:topright,
-        grid=true,
-        xticks=(readable_T, readable_times)
-    )
+    # Create simple 2D coordinates for nodes
+    coords = Dict()
+    n_nodes = length(N)
+    for (i, node) in enumerate(N)
+        angle = 2π * (i-1) / n_nodes
+        coords[node] = (5 * cos(angle), 5 * sin(angle))
+    end
     
-    # Plot data
-    price_values = [lambda_whl_elec[t] for t in T]
-    emission_values = [lambda_CO2[t] for t in T]
+    # Plot nodes
+    for node in N
+        scatter!(p, [coords[node][1]], [coords[node][2]], 
+                label="Node $node", markersize=10)
+        annotate!(p, coords[node][1], coords[node][2], text("Node $node", :black, 10))
+    end
     
-    plot!(p_electricity, T, price_values, label="Electricity Price", color=:blue, linewidth=2)
-    plot!(p_emissions, T, emission_values, label="CO2 Emission Factor", color=:red, linewidth=2)
+    # Plot routes
+    colors = [:red, :blue, :green, :purple]
+    for (m_idx, m) in enumerate(M)
+        for (i, j, t) in model[:travel_arcs]
+            if value(model[:x][m,i,j,t]) > 0.5
+                plot!(p, [coords[i][1], coords[j][1]], 
+                      [coords[i][2], coords[j][2]],
+                      arrow=true, color=colors[mod1(m_idx,4)],
+                      label=nothing, linewidth=2)
+            end
+        end
+    end
     
-    # Return the electricity price plot as the main one (for backward compatibility)
-    return p_electricity, csv_data
+    return p
 end
 
+function plot_mcs_time_trajectory(model, M, N, N_g, N_c, T, time_labels)
+    csv_data = mcs_trajectory_table(model, M, N, N_g, T, time_labels)
+    return mcs_trajectory_chart(csv_data, N, N_g), csv_data
+end
+
+function plot_node_map_with_cev(N, N_g, N_c, E, A, model, M, T, D)
+    node_at(m, t) = (k = findfirst(node -> value(model[:z][m,node,t]) > 0.5, N); k === nothing ? nothing : N[k])
+    return node_map_chart(N, N_g, N_c, E, A, D, [(node_at(m, first(T)), node_at(m, last(T))) for m in M])
+end
+
+function plot_price_emission_factors(lambda_whl_elec, lambda_CO2, T, time_labels)
+    csv_data = price_emission_table(lambda_whl_elec, lambda_CO2, T, time_labels)
+    # The electricity price chart is the main one (for backward compatibility)
+    return price_emission_chart(csv_data), csv_data
+end
+
+include("Decomposition.jl")
+include("WeightSweep.jl")
+
 end # module 
\ No newline at end of file
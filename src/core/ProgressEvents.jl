@@ -0,0 +1,51 @@
+"""
+Newline-delimited JSON progress events for the optimization backend.
+
+Events are written to the file descriptor named by the MCS_PROGRESS_FD environment
+variable (the backend opens fd 3 for this), one JSON object per line, so they never
+mix with the human-readable stdout log. Without MCS_PROGRESS_FD nothing is written.
+Every event has "event" and "elapsed" (seconds since the run started) fields.
+"""
+module ProgressEvents
+
+export emit_progress, reset_progress_clock
+
+const START_TIME = Ref(time())
+const CHANNEL = Ref{Union{IO,Nothing}}(nothing)
+
+function progress_channel()
+    if CHANNEL[] === nothing
+        fd = get(ENV, "MCS_PROGRESS_FD", "")
+        CHANNEL[] = isempty(fd) ? devnull : fdio(parse(Int, fd))
+    end
+    return CHANNEL[]
+end
+
+json_value(x::Bool) = x ? "true" : "false"
+json_value(x::Real) = isfinite(x) ? string(x) : "null"
+json_value(x::Nothing) = "null"
+json_value(x::AbstractString) = "\"" * escape_string(x) * "\""
+json_value(x) = json_value(string(x))
+
+"""
+Restart the elapsed-time clock (call once at the start of a run)
+"""
+function reset_progress_clock()
+    START_TIME[] = time()
+end
+
+"""
+Write one progress event, e.g. emit_progress("phase"; phase="solving")
+"""
+function emit_progress(event::AbstractString; fields...)
+    io = progress_channel()
+    io === devnull && return
+    parts = ["\"event\": $(json_value(event))", "\"elapsed\": $(round(time() - START_TIME[]; digits=3))"]
+    for (key, value) in fields
+        push!(parts, "\"$(key)\": $(json_value(value))")
+    end
+    println(io, "{", join(parts, ", "), "}")
+    flush(io)
+end
+
+end # module
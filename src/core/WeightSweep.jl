@@ -0,0 +1,114 @@
+# Objective-weight sweeps on one built MCS-CEV model (included by MCSOptimizer).
+#
+# The objective is linear in three terms (electricity cost, carbon emissions cost and the
+# missed-work penalty) and the weights only scale their coefficients, so the model is
+# built once. Between solves only the objective coefficients of P_ch_tot and P_miss_work
+# are rewritten, and each solve starts from the previous incumbent.
+
+"""
+Evenly spaced electricity/CO2 trade-off weights: `(elec=1-a, co2=a, miss=1)` for
+`a` from 0 to 1 in `num_points` steps.
+"""
+function pareto_weights(num_points; miss=1.0)
+    return [(elec=1.0 - a, co2=a, miss=miss) for a in range(0.0, 1.0; length=num_points)]
+end
+
+"""
+Rewrite the objective of a `build_model` model in place for the given term weights
+"""
+function set_objective_weights!(model, M, N, E, T, lambda_whl_elec, lambda_CO2, rho_miss, delta_T, weights)
+    P_ch_tot = model[:P_ch_tot]
+    P_miss_work = model[:P_miss_work]
+    for m in M, t in T
+        set_objective_coefficient(model, P_ch_tot[m,t],
+            (weights.elec * lambda_whl_elec[t] + weights.co2 * lambda_CO2[t]) * delta_T)
+    end
+    for i in N, e in E, t in T
+        set_objective_coefficient(model, P_miss_work[i,e,t], weights.miss * rho_miss * delta_T)
+    end
+end
+
+"""
+For each point, whether its (electricity cost, carbon emissions cost) pair is not
+dominated by another solved point
+"""
+function pareto_front(electricity_cost, carbon_cost; atol=1e-6)
+    n = length(electricity_cost)
+    return [isfinite(electricity_cost[k]) && !any(
+        isfinite(electricity_cost[j]) &&
+        electricity_cost[j] <= electricity_cost[k] + atol && carbon_cost[j] <= carbon_cost[k] + atol &&
+        (electricity_cost[j] < electricity_cost[k] - atol || carbon_cost[j] < carbon_cost[k] - atol)
+        for j in 1:n) for k in 1:n]
+end
+
+"""
+Solve the MCS-CEV model for a series of objective weightings on one built model.
+
+`weights` is a vector of `(elec, co2, miss)` named tuples that scale the electricity cost,
+carbon emissions cost and missed-work penalty terms (`pareto_weights(n)` gives an evenly
+spaced electricity/CO2 trade-off). The model is built once; every point only rewrites
+the objective coefficients and warm-starts from the previous incumbent. `time_limit`
+(seconds per point) and `mip_gap` are passed to HiGHS when given.
+
+Returns a DataFrame with one row per weighting: the weights, status, weighted objective,
+unweighted electricity cost, carbon emissions cost and missed work, solve time, MIP gap
+and whether the point is on the cost-vs-CO2 Pareto front.
+"""
+function solve_weight_sweep(
+    M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+    D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+    SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+    weights=pareto_weights(11), grid_power_cap=nothing, time_limit=nothing, mip_gap=nothing
+)
+    emit_progress("phase"; phase="building", mcs=length(M), cevs=length(E), nodes=length(N), periods=length(T))
+    build_start = time()
+    model = build_model(
+        M, T, N, N_g, N_c, E, A, C_MCS_plug, CH_MCS, CH_CEV, DCH_MCS, DCH_MCS_plug,
+        D, k_trv, R_work, SOE_CEV_ini, SOE_CEV_max, SOE_CEV_min, SOE_MCS_ini, SOE_MCS_max,
+        SOE_MCS_min, tau_trv, lambda_whl_elec, lambda_CO2, rho_miss, eta_ch_dch, delta_T;
+        grid_power_cap=grid_power_cap, verbose=false
+    )
+    time_limit === nothing || set_time_limit_sec(model, time_limit)
+    mip_gap === nothing || set_optimizer_attribute(model, "mip_rel_gap", mip_gap)
+    @printf("Built model once in %.1fs (%d variables); sweeping %d weightings\n",
+        time() - build_start, num_variables(model), length(weights))
+
+    P_ch_tot = model[:P_ch_tot]
+    P_miss_work = model[:P_miss_work]
+    variables = all_variables(model)
+    rows = NamedTuple[]
+    for (k, w) in enumerate(weights)
+        set_objective_weights!(model, M, N, E, T, lambda_whl_elec, lambda_CO2, rho_miss, delta_T, w)
+        optimize!(model)
+        status = termination_status(model)
+        solved = has_values(model)
+        row = (
+            point = k,
+            weight_elec = w.elec,
+            weight_co2 = w.co2,
+            weight_miss = w.miss,
+            status = string(status),
+            objective = solved ? objective_value(model) : NaN,
+            electricity_cost = solved ? sum(value(P_ch_tot[m,t]) * lambda_whl_elec[t] * delta_T for m in M, t in T) : NaN,
+            carbon_emissions_cost = solved ? sum(value(P_ch_tot[m,t]) * lambda_CO2[t] * delta_T for m in M, t in T) : NaN,
+            missed_work_kWh = solved ? sum(value(P_miss_work[i,e,t]) * delta_T for i in N, e in E, t in T; init=0.0) : NaN,
+            solve_time = solve_time(model),
+            mip_gap = solved ? relative_gap(model) : NaN
+        )
+        push!(rows, row)
+        @printf("  [%d/%d] elec %.3f co2 %.3f miss %.3f: %s, cost %.2f, CO2 %.2f (%.1fs)\n",
+            k, length(weights), w.elec, w.co2, w.miss, row.status, row.electricity_cost, row.carbon_emissions_cost, row.solve_time)
+        emit_progress("sweep_point"; point=k, points=length(weights), status=status,
+            electricity_cost=row.electricity_cost, carbon_emissions_cost=row.carbon_emissions_cost,
+            solve_time=row.solve_time)
+
+        # The next weighting starts from this incumbent, which stays feasible
+        if solved
+            set_start_value.(variables, value.(variables))
+        end
+    end
+
+    table = DataFrame(rows)
+    table.pareto = pareto_front(table.electricity_cost, table.carbon_emissions_cost)
+    return table
+end
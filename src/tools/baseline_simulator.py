@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Baseline Charging Simulator
+Discrete-event replay of a charging policy under the same physical limits as MCSOptimizer,
+so the peaks and costs of a baseline strategy are comparable with the MILP results:
+  - a CEV only charges while it is not working, from an MCS parked at its own site,
+    at most DCH_MCS_plug per plug, C_MCS_plug plugs and DCH_MCS in total per MCS
+  - MCSs start at the grid node with MCS_ini, recharge there at CH_MCS, stay within
+    [MCS_min, MCS_max] and need max(1, ceil(travel_time)) periods per move
+  - MCSs only charge and discharge inside the 6am-9pm operating window (of every day)
+  - SOE_CEV stays within [SOE_min, SOE_max]; work the battery cannot cover is missed
+A policy decides when a CEV asks for a plug after each shift and its place in the site's
+plug queue; MCSs go wherever the queues are not covered and recharge at the grid when
+empty or idle.
+Shift ends, plug-ins, MCS arrivals and per-period MCS activity are processed from one
+priority queue, so idle stretches cost nothing. Results are written in the CSV schema of
+mcs_optimization_main.jl (01-06, mcs_<m>_power_profile.csv and solution_status.csv).
+"""
+
+import heapq
+import json
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from feasibility_prescreen import load_prescreen_inputs, mcs_operating_window
+from time_series import periods_per_day
+from validate_dataset import ValidationReport, load_matrix, load_time_series, read_csv_rows
+from work_tensor import read_place_matrix, work_runs
+
+# Heap event kinds, in the order they are processed within a period (after shift ends)
+PLUG_IN, ARRIVE, ACTIVE = range(3)
+
+GRID = 0  # Node 1 (0-based), the only grid node
+EPS = 1e-9
+
+
+class SimulationInputs:
+    """Dataset arrays used by the simulator (node and period indices are 0-based)"""
+
+    def __init__(self, data_dir):
+        self.params, self.soe_min, self.soe_max, self.soe_ini, self.work = load_prescreen_inputs(data_dir)
+        report = ValidationReport()
+        self.travel_time = load_matrix(data_dir, 'travel_time.csv', report)
+        _, self.lambda_co2, self.lambda_buy = load_time_series(data_dir, report)
+        self.num_nodes = read_place_matrix(os.path.join(data_dir, 'place.csv')).shape[0]
+        self.time_labels = self._time_labels(data_dir)
+
+    def _time_labels(self, data_dir):
+        # Same label column as mcs_optimization_main.jl; period numbers when there is none
+        header, rows = read_csv_rows(os.path.join(data_dir, 'time_data.csv'))
+        column = 'time' if 'time' in header else 'Unnamed: 0'
+        labels = [row[header.index(column)] for row in rows] if column in header else []
+        return labels + [str(t) for t in range(len(labels) + 1, self.num_periods + 1)]
+
+    @property
+    def num_periods(self):
+        return self.work.num_periods
+
+    @property
+    def num_mcs(self):
+        return int(self.params.get('num_mcs', self.params.get('num_MCS', 1)))
+
+
+def daily_operating_window(delta_T, num_periods):
+    """Periods (0-based mask) inside the MCS operating window, repeated every day"""
+    day = periods_per_day(delta_T)
+    start, end = mcs_operating_window(delta_T, day)
+    mask = np.zeros(day, dtype=bool)
+    mask[start - 1:end] = True
+    return np.resize(mask, num_periods)
+
+
+def immediate_policy(sim, ev, ready, deadline):
+    """Plug in as soon as the shift ends; first come, first served"""
+    return ready, ready
+
+
+def deadline_policy(sim, ev, ready, deadline):
+    """Plug in as soon as the shift ends; CEVs that go back to work first are served first"""
+    return ready, deadline
+
+
+def cheapest_policy(sim, ev, ready, deadline):
+    """Plug in at the start of the cheapest block of operating periods that still refills
+    the battery before the next shift"""
+    needed = sim.plug_periods_needed(ev)
+    latest = deadline - needed
+    if latest <= ready:
+        return ready, ready
+    block_cost = sim.cost_sum[ready + needed:latest + needed + 1] - sim.cost_sum[ready:latest + 1]
+    start = ready + int(np.argmin(block_cost))
+    return start, start
+
+
+POLICIES = {
+    'immediate': immediate_policy,
+    'deadline': deadline_policy,
+    'cheapest': cheapest_policy
+}
+
+
+class BaselineSimulator:
+    """
+    Event-driven replay of one charging policy.
+
+    A policy is a callable policy(sim, ev, ready, deadline) -> (plug_period, priority),
+    called when CEV ev ends a shift: ready is the first idle period and deadline the start
+    of its next shift (periods are 0-based). The CEV joins its site's plug queue at
+    plug_period; lower priorities are plugged first.
+    """
+
+    def __init__(self, inputs, policy=immediate_policy):
+        self.inputs = inputs
+        self.policy = policy
+        params = inputs.params
+        self.delta_T = params['delta_T']
+        self.eta = params['eta_ch_dch']
+        self.plugs = int(np.floor(params['C_MCS_plug']))
+        self.plug_power = params['DCH_MCS_plug']
+        self.T = inputs.num_periods
+        self.sites = (np.asarray(inputs.work.sites) - 1).tolist()
+        self.soe_min = np.asarray(inputs.soe_min, dtype=float).tolist()
+        self.soe_max = np.asarray(inputs.soe_max, dtype=float).tolist()
+        travel = np.maximum(1, np.ceil(inputs.travel_time)).astype(int)
+        self.travel = travel.tolist()
+        # Nodes ordered by travel time to each node, for the nearest idle MCS
+        self.nearest = np.argsort(travel, axis=0, kind='stable').T.tolist()
+
+        window = daily_operating_window(self.delta_T, self.T)
+        self.window = window.tolist()
+        # First operating period at or after each period (T when there is none left)
+        open_periods = np.append(np.flatnonzero(window), self.T)
+        self.next_open = open_periods[np.searchsorted(open_periods, np.arange(self.T + 1))].tolist()
+        # Cumulative objective price per kWh; closed periods are priced out of policy choices
+        unit_cost = (inputs.lambda_buy + inputs.lambda_co2)[:self.T]
+        unit_cost = np.where(window, unit_cost, unit_cost.max(initial=0.0) * self.T + 1.0)
+        self.cost_sum = np.concatenate([[0.0], np.cumsum(unit_cost)])
+
+    def plug_periods_needed(self, ev):
+        """Full plug periods to refill CEV ev to SOE_max"""
+        need = self.soe_max[ev] - self.cev_soe[ev]
+        return int(np.ceil(need / (self.plug_power * self.eta * self.delta_T) - EPS))
+
+    def run(self):
+        """Simulate the horizon and return the per-period results (see results())"""
+        inputs, T = self.inputs, self.T
+        num_mcs = inputs.num_mcs
+        num_cevs = len(self.sites)
+
+        # Shifts drain the battery; as in the model, work in the last period drains nothing
+        drain = np.asarray(inputs.work.work[:, :T - 1], dtype=float) * self.delta_T
+        self.shift_rows, self.shift_starts, self.shift_ends = work_runs(drain)
+        self.drain_totals = np.zeros((num_cevs, T))
+        np.cumsum(drain, axis=1, out=self.drain_totals[:, 1:])
+        rows, starts, ends = self.shift_rows, self.shift_starts, self.shift_ends
+        shift_energy = self.drain_totals[rows, ends + 1] - self.drain_totals[rows, starts]
+        next_start = np.full(len(rows), T - 1)
+        same_row = rows[1:] == rows[:-1]
+        next_start[:-1][same_row] = starts[1:][same_row]
+        shift_served = [0.0] * len(rows)
+
+        self.cev_soe = np.asarray(inputs.soe_ini, dtype=float).tolist()
+        self.mcs_soe = [float(inputs.params['MCS_ini'])] * num_mcs
+        self.mcs_node = [GRID] * num_mcs
+        self.idle_at = [set() for _ in range(inputs.num_nodes)]   # idle MCSs per node
+        self.num_idle = 0
+        self.plugged = [[] for _ in range(num_mcs)]                # [priority, seq, ev, deadline]
+        self.queues = [[] for _ in range(inputs.num_nodes)]
+        self.covering = [0] * inputs.num_nodes                     # MCSs at or heading to a site
+        self.mcs_ch = np.zeros((num_mcs, T))
+        self.mcs_dch = np.zeros((num_mcs, T))
+        self.moves = []                                            # (mcs, arrival period, node)
+        self.deliveries = ([], [], [])                             # ev, period, MCS-side power
+        self.events = [(0, ACTIVE, m, m, 0) for m in range(num_mcs)]
+        self.seq = num_mcs
+
+        # Shift ends are known upfront: they are streamed in time order next to the heap
+        # (and before its events of the same period) instead of being pushed into it
+        order = np.argsort(ends, kind='stable')
+        shift_times = (ends[order] + 1).tolist()
+        order = order.tolist()
+        rows, shift_energy, next_start = rows.tolist(), shift_energy.tolist(), next_start.tolist()
+        soe_min, soe_max = self.soe_min, self.soe_max
+        k, num_shifts = 0, len(order)
+
+        while k < num_shifts or self.events:
+            if k < num_shifts and (not self.events or shift_times[k] <= self.events[0][0]):
+                t, shift = shift_times[k], order[k]
+                k += 1
+                ev = rows[shift]
+                served = max(0.0, min(shift_energy[shift], self.cev_soe[ev] - soe_min[ev]))
+                shift_served[shift] = served
+                self.cev_soe[ev] -= served
+                deadline = next_start[shift]
+                if t < deadline and self.cev_soe[ev] < soe_max[ev] - EPS:
+                    plug_period, priority = self.policy(self, ev, t, deadline)
+                    self.push(max(t, int(plug_period)), PLUG_IN, ev, (priority, deadline))
+                continue
+            t, kind, _, a, b = heapq.heappop(self.events)
+            if t >= T:
+                break
+            if kind == PLUG_IN:
+                self.enqueue(t, a, *b)
+            elif kind == ARRIVE:
+                self.mcs_node[a] = b
+                self.push(t, ACTIVE, a)
+            elif self.mcs_node[a] == GRID:
+                self.recharge(t, a)
+            else:
+                self.serve(t, a)
+
+        self.shift_served = np.asarray(shift_served)
+        return self.results()
+
+    def push(self, t, kind, a, b=0):
+        self.seq += 1
+        heapq.heappush(self.events, (t, kind, self.seq, a, b))
+
+    def enqueue(self, t, ev, priority, deadline):
+        """Put a CEV in its site's plug queue and make sure an MCS will serve the site"""
+        site = self.sites[ev]
+        self.seq += 1
+        heapq.heappush(self.queues[site], [priority, self.seq, ev, deadline])
+        if self.idle_at[site]:
+            self.num_idle -= 1
+            self.push(t, ACTIVE, self.idle_at[site].pop())
+        else:
+            self.wake(t, site)
+
+    def depart(self, t, m, node):
+        """Move an MCS to node; until it arrives the trajectory shows its last node, like the
+        optimizer's"""
+        origin = self.mcs_node[m]
+        if origin != GRID:
+            self.covering[origin] -= 1
+        if node != GRID:
+            self.covering[node] += 1
+        if origin == node:
+            self.push(t, ACTIVE, m)
+            return
+        arrival = t + self.travel[origin][node]
+        self.moves.append((m, arrival, node))
+        self.push(arrival, ARRIVE, m, node)
+        # Nobody may be left to serve the origin's queue
+        if origin != GRID and self.queues[origin]:
+            self.wake(t, origin)
+
+    def wake(self, t, site):
+        """Send the nearest idle MCS to a site whose queue is not covered"""
+        if self.num_idle and len(self.queues[site]) > self.plugs * self.covering[site]:
+            for node in self.nearest[site]:
+                if self.idle_at[node]:
+                    self.num_idle -= 1
+                    self.depart(t, self.idle_at[node].pop(), site)
+                    return
+
+    def next_site(self, m):
+        """Site with the most uncovered queued CEVs (nearest first on ties), or None"""
+        best, best_key = None, (0, 0)
+        for site in range(1, len(self.queues)):
+            uncovered = len(self.queues[site]) - self.plugs * self.covering[site]
+            if uncovered > 0 and (uncovered, -self.travel[self.mcs_node[m]][site]) > best_key:
+                best, best_key = site, (uncovered, -self.travel[self.mcs_node[m]][site])
+        return best
+
+    def go_idle(self, t, m):
+        """An MCS without work: move to an uncovered queue, top up at the grid, or wait
+        where it is once full"""
+        site = self.next_site(m)
+        if site is not None:
+            self.depart(t, m, site)
+        elif self.mcs_node[m] != GRID and self.mcs_soe[m] < self.inputs.params['MCS_max'] - EPS:
+            self.depart(t, m, GRID)
+        else:
+            self.num_idle += 1
+            self.idle_at[self.mcs_node[m]].add(m)
+
+    def recharge(self, t, m):
+        soe_max = self.inputs.params['MCS_max']
+        if self.mcs_soe[m] >= soe_max - EPS:
+            self.go_idle(t, m)
+            return
+        if not self.window[t]:
+            self.push(self.next_open[t], ACTIVE, m)
+            return
+        power = min(self.inputs.params['CH_MCS'], (soe_max - self.mcs_soe[m]) / (self.eta * self.delta_T))
+        self.mcs_soe[m] += power * self.eta * self.delta_T
+        self.mcs_ch[m, t] = power
+        self.push(t + 1, ACTIVE, m)
+
+    def serve(self, t, m):
+        site, cev_soe, soe_max = self.mcs_node[m], self.cev_soe, self.soe_max
+        # Unplug CEVs that are full or back at work, then fill the free plugs from the queue
+        plugged = [p for p in self.plugged[m] if p[3] > t and cev_soe[p[2]] < soe_max[p[2]] - EPS]
+        queue = self.queues[site]
+        while len(plugged) < self.plugs and queue:
+            entry = heapq.heappop(queue)
+            if entry[3] > t and cev_soe[entry[2]] < soe_max[entry[2]] - EPS:
+                plugged.append(entry)
+        self.plugged[m] = plugged
+
+        reserve = self.mcs_soe[m] - self.inputs.params['MCS_min']
+        if reserve <= EPS:
+            # Empty: hand the CEVs back to the queue and recharge at the grid
+            for entry in plugged:
+                heapq.heappush(queue, entry)
+            self.plugged[m] = []
+            self.depart(t, m, GRID)
+            return
+        if not plugged:
+            self.go_idle(t, m)
+            return
+        if not self.window[t]:
+            self.push(self.next_open[t], ACTIVE, m)
+            return
+
+        budget = min(self.inputs.params['DCH_MCS'], reserve * self.eta / self.delta_T)
+        total = 0.0
+        delivered_evs, periods, powers = self.deliveries
+        for _, _, ev, _ in plugged:
+            power = min(self.plug_power, budget - total, (soe_max[ev] - cev_soe[ev]) / (self.eta * self.delta_T))
+            if power <= EPS:
+                continue
+            total += power
+            cev_soe[ev] += power * self.eta * self.delta_T
+            delivered_evs.append(ev)
+            periods.append(t)
+            powers.append(power)
+        self.mcs_dch[m, t] = total
+        self.mcs_soe[m] -= total * self.delta_T / self.eta
+        self.push(t + 1, ACTIVE, m)
+
+    def results(self):
+        """
+        Per-period arrays in the units of the optimizer's result tables: MCS grid charging
+        and discharging power, MCS and CEV SOE, MCS node per period (0-based), CEV work
+        served per period (kW) and the totals the optimizer reports.
+        """
+        inputs, T, dT, eta = self.inputs, self.T, self.delta_T, self.eta
+        num_cevs = len(self.sites)
+
+        cev_power = np.zeros((num_cevs, T))
+        evs, periods, powers = self.deliveries
+        np.add.at(cev_power, (np.asarray(evs, dtype=int), np.asarray(periods, dtype=int)), powers)
+
+        # Spread every shift's served energy over its periods in order: the battery covers
+        # the first periods of a shift and the remainder is missed
+        rows, starts, ends = self.shift_rows, self.shift_starts, self.shift_ends
+        lengths = ends - starts + 1
+        run = np.repeat(np.arange(len(rows)), lengths)
+        first = np.cumsum(lengths) - lengths
+        cols = starts[run] + np.arange(len(run)) - first[run]
+        cum = self.drain_totals[rows[run], cols + 1] - self.drain_totals[rows[run], starts[run]]
+        capped = np.minimum(cum, self.shift_served[run])
+        served = np.diff(capped, prepend=0.0)
+        served[first] = capped[first]
+        drained = np.zeros((num_cevs, T))
+        drained[rows[run], cols] = served
+        work_served = drained / dT
+        work_served[:, T - 1] = inputs.work.work[:, T - 1]
+
+        cev_soe = np.empty((num_cevs, T))
+        cev_soe[:, 0] = inputs.soe_ini
+        cev_soe[:, 1:] = inputs.soe_ini[:, None] + np.cumsum(
+            cev_power[:, :-1] * eta * dT - drained[:, :-1], axis=1)
+        mcs_soe = np.empty_like(self.mcs_ch)
+        mcs_soe[:, 0] = inputs.params['MCS_ini']
+        mcs_soe[:, 1:] = inputs.params['MCS_ini'] + np.cumsum(
+            self.mcs_ch[:, :-1] * eta * dT - self.mcs_dch[:, :-1] * dT / eta, axis=1)
+
+        mcs_node = np.full(self.mcs_ch.shape, -1)
+        mcs_node[:, 0] = GRID
+        for m, arrival, node in self.moves:
+            if arrival < T:
+                mcs_node[m, arrival] = node
+        for t in range(1, T):
+            unchanged = mcs_node[:, t] < 0
+            mcs_node[unchanged, t] = mcs_node[unchanged, t - 1]
+
+        grid_power = self.mcs_ch.sum(axis=0)
+        grid_energy = grid_power * dT
+        required = self.drain_totals[:, -1].sum()
+        missed = required - self.shift_served.sum()
+        electricity_cost = float(grid_energy @ inputs.lambda_buy[:T])
+        carbon_cost = float(grid_energy @ inputs.lambda_co2[:T])
+        totals = {
+            'total_energy_from_grid_kWh': float(grid_energy.sum()),
+            'peak_grid_power_kW': float(grid_power.max(initial=0.0)),
+            'electricity_cost': electricity_cost,
+            'carbon_cost': carbon_cost,
+            'missed_work_kWh': float(missed),
+            'missed_work_penalty': float(inputs.params['rho_miss'] * missed),
+            'objective': electricity_cost + carbon_cost + float(inputs.params['rho_miss'] * missed),
+            'work_completion_percent': float(100.0 * (1.0 - missed / required)) if required > 0 else 100.0,
+            'mcs_final_soe_shortfall_kWh': float(np.maximum(0.0, inputs.params['MCS_ini'] - mcs_soe[:, -1]).sum()),
+            'cev_final_soe_shortfall_kWh': float(np.maximum(0.0, inputs.soe_ini - cev_soe[:, -1]).sum())
+        }
+        return {
+            'mcs_ch': self.mcs_ch, 'mcs_dch': self.mcs_dch, 'mcs_soe': mcs_soe, 'mcs_node': mcs_node,
+            'cev_soe': cev_soe, 'work_served': work_served, 'totals': totals
+        }
+
+
+def write_table(path, time_labels, columns):
+    """
+    Write a result table: Time_Period, Time_Label, then `columns` as (name, values) pairs
+    where values is a per-period array or a constant. Constants are rendered into the row
+    format once, so wide tables with fixed bound columns format one value per cell.
+    """
+    formats, arrays = [], []
+    for _, values in columns:
+        if np.ndim(values) == 0:
+            formats.append(str(values).replace('%', '%%'))
+        else:
+            values = np.asarray(values)
+            formats.append('%.4f' if values.dtype.kind == 'f' else '%s')
+            arrays.append(values)
+    if all(values.dtype.kind == 'f' for values in arrays):
+        matrix = np.column_stack(arrays) if arrays else np.empty((len(time_labels), 0))
+    else:
+        matrix = np.empty((len(time_labels), len(arrays)), dtype=object)
+        for k, values in enumerate(arrays):
+            matrix[:, k] = values
+    row_format = ','.join(['%d', '%s'] + formats) + '\n'
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(['Time_Period', 'Time_Label'] + [name for name, _ in columns]) + '\n')
+        for t, (label, row) in enumerate(zip(time_labels, matrix.tolist())):
+            f.write(row_format % (t + 1, label, *row))
+
+
+def write_results(run_dir, inputs, results, policy_name):
+    """Write the simulation in the CSV schema of mcs_optimization_main.jl"""
+    os.makedirs(run_dir, exist_ok=True)
+    T = inputs.num_periods
+    labels = inputs.time_labels[:T]
+    params = inputs.params
+    mcs_ch, mcs_dch = results['mcs_ch'], results['mcs_dch']
+    sites = np.asarray(inputs.work.sites)
+
+    write_table(os.path.join(run_dir, '01_total_grid_power_profile.csv'), labels, [
+        ('Total_Charging_Power_kW', mcs_ch.sum(axis=0)),
+        ('Total_Discharging_Power_kW', mcs_dch.sum(axis=0)),
+        ('Net_Power_kW', mcs_ch.sum(axis=0) - mcs_dch.sum(axis=0))
+    ])
+    site_work = [(f'Site_{i}_Work_Power_kW', results['work_served'][sites == i].sum(axis=0))
+                 for i in range(2, inputs.num_nodes + 1)]
+    write_table(os.path.join(run_dir, '02_work_profiles_by_site.csv'), labels,
+                site_work + [('Total_Work_Power_kW', results['work_served'].sum(axis=0))])
+    # Same wide bounds (+-10%) as the optimizer's SOE tables
+    mcs_max = params['MCS_max'] + 0.1 * abs(params['MCS_max'])
+    mcs_min = params['MCS_min'] - 0.1 * abs(params['MCS_min'])
+    write_table(os.path.join(run_dir, '03_mcs_state_of_energy.csv'), labels, [
+        column for m, soe in enumerate(results['mcs_soe'], start=1)
+        for column in ((f'MCS_{m}_SOE_kWh', soe), (f'MCS_{m}_Max_SOE_kWh', mcs_max), (f'MCS_{m}_Min_SOE_kWh', mcs_min))
+    ])
+    write_table(os.path.join(run_dir, '04_cev_state_of_energy.csv'), labels, [
+        column for e, soe in enumerate(results['cev_soe'])
+        for column in ((f'CEV_{e + 1}_SOE_kWh', soe),
+                       (f'CEV_{e + 1}_Max_SOE_kWh', inputs.soe_max[e] + 0.1 * abs(inputs.soe_max[e])),
+                       (f'CEV_{e + 1}_Min_SOE_kWh', inputs.soe_min[e] - 0.1 * abs(inputs.soe_min[e])))
+    ])
+    write_table(os.path.join(run_dir, '05_electricity_prices.csv'), labels, [
+        ('Electricity_Price_USD_per_kWh', inputs.lambda_buy[:T]),
+        ('CO2_Emission_Factor_kg_CO2_per_kWh', inputs.lambda_co2[:T])
+    ])
+    nodes = results['mcs_node'] + 1
+    write_table(os.path.join(run_dir, '06_mcs_location_trajectory.csv'), labels, [
+        column for m, node in enumerate(nodes, start=1)
+        for column in ((f'MCS_{m}_Location', node),
+                       (f'MCS_{m}_Location_Type', np.where(node == GRID + 1, 'Grid', 'Construction')))
+    ])
+    for m in range(len(mcs_ch)):
+        write_table(os.path.join(run_dir, f'mcs_{m + 1}_power_profile.csv'), labels, [
+            ('Charging_Power_kW', mcs_ch[m]),
+            ('Discharging_Power_kW', mcs_dch[m]),
+            ('Net_Power_kW', mcs_ch[m] - mcs_dch[m])
+        ])
+
+    totals = results['totals']
+    with open(os.path.join(run_dir, 'solution_status.csv'), 'w', newline='') as f:
+        f.write('solve_mode,termination_status,primal_status,objective,best_bound,relative_gap,'
+                'proven_optimal,time_limit_s,mip_gap_target\n')
+        f.write(f"simulation_{policy_name},SIMULATED,FEASIBLE_POINT,{totals['objective']},NaN,NaN,false,NaN,NaN\n")
+    with open(os.path.join(run_dir, 'simulation_summary.json'), 'w') as f:
+        json.dump({'policy': policy_name, **totals}, f, indent=2)
+
+
+def simulate(data_dir, policy='immediate', results_dir=None):
+    """Load a csv_files directory, replay a policy (name or callable) and write a run directory.
+    Returns (run_dir, totals)."""
+    policy_name = policy if isinstance(policy, str) else policy.__name__
+    inputs = SimulationInputs(data_dir)
+    results = BaselineSimulator(inputs, POLICIES[policy] if isinstance(policy, str) else policy).run()
+    results_dir = results_dir or os.path.join(os.path.dirname(os.path.abspath(data_dir)), 'results_baseline')
+    run_dir = os.path.join(results_dir, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    write_results(run_dir, inputs, results, policy_name)
+    return run_dir, results['totals']
+
+
+def main():
+    """Simulate a baseline policy for a dataset directory from the command line"""
+    if len(sys.argv) < 2:
+        print("Usage: python baseline_simulator.py <csv_files_dir> [--policy immediate|deadline|cheapest] "
+              "[--out <results_dir>] [--json]")
+        sys.exit(2)
+
+    args = sys.argv[2:]
+    policy = args[args.index('--policy') + 1] if '--policy' in args else 'immediate'
+    if policy not in POLICIES:
+        print(f"Unknown policy '{policy}' (choose from {', '.join(POLICIES)})")
+        sys.exit(2)
+    results_dir = args[args.index('--out') + 1] if '--out' in args else None
+
+    started = datetime.now()
+    run_dir, totals = simulate(sys.argv[1], policy, results_dir)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    if '--json' in args:
+        print(json.dumps({'run_dir': run_dir, 'policy': policy, 'elapsed_s': elapsed, **totals}))
+    else:
+        print(f"Simulated '{policy}' policy in {elapsed:.1f}s -> {run_dir}")
+        print(f"Energy from grid: {totals['total_energy_from_grid_kWh']:.2f} kWh, "
+              f"peak {totals['peak_grid_power_kW']:.2f} kW")
+        print(f"Electricity cost: ${totals['electricity_cost']:.2f}, CO2 cost: {totals['carbon_cost']:.2f}")
+        print(f"Missed work: {totals['missed_work_kWh']:.2f} kWh "
+              f"({totals['work_completion_percent']:.1f}% completed, penalty {totals['missed_work_penalty']:.2f})")
+        print(f"Objective (optimizer terms): {totals['objective']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Feasibility Pre-screen
+Fast energy and plug-time bounds for a dataset before it is submitted to the MILP.
+Flags instances MCSOptimizer cannot solve and estimates the missed work (P_miss_work)
+that no schedule can avoid, using the same constraints as the model:
+  - CEVs only charge in periods without work, inside the MCS operating window
+  - each MCS delivers at most DCH_MCS_plug per connected CEV and DCH_MCS in total
+  - SOE_CEV stays within [SOE_min, SOE_max] and returns to SOE_ini at the end
+  - at most C_MCS_plug CEVs per MCS are connected in a period
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+from validate_dataset import ValidationReport, load_parameters, read_csv_rows, to_float_array
+from work_tensor import load_work_matrix
+
+
+def mcs_operating_window(delta_T, num_periods):
+    """Allowed MCS charge/discharge periods (1-based, inclusive), as in MCSOptimizer"""
+    if delta_T == 0.5:
+        start, end = 13, 42
+    elif delta_T == 0.25:
+        start, end = 25, 84
+    else:
+        start, end = int(np.ceil(6.0 / delta_T)) + 1, int(np.floor(21.0 / delta_T))
+    return max(1, start), min(num_periods, end)
+
+
+def load_prescreen_inputs(data_dir):
+    """Parameters, CEV limits and the (CEV x period) work matrix for a csv_files directory"""
+    report = ValidationReport()
+    params = load_parameters(data_dir, report)
+    header, rows = read_csv_rows(os.path.join(data_dir, 'ev_data.csv'))
+    cols = [header.index(c) for c in ('SOE_min', 'SOE_max', 'SOE_ini')]
+    ev = to_float_array([[row[c] for c in cols] for row in rows], 'ev_data.csv', 'numeric', report)
+    work = load_work_matrix(data_dir)
+    return params, ev[:, 0], ev[:, 1], ev[:, 2], work
+
+
+def prescreen(params, soe_min, soe_max, soe_ini, work):
+    """
+    Compute per-CEV and per-site bounds.
+
+    Returns a dict with 'feasible', 'issues' (hard infeasibilities), 'warnings',
+    'per_cev', 'per_site' and 'totals'. Energies are in kWh.
+    """
+    delta_T = params['delta_T']
+    eta = params['eta_ch_dch']
+    num_mcs = int(params.get('num_mcs', params.get('num_MCS', 1)))
+    plugs = int(np.floor(params['C_MCS_plug']))
+    plug_power = min(params['DCH_MCS_plug'], params['DCH_MCS'])
+    R = np.asarray(work.work, dtype=float)
+    num_cevs, num_periods = R.shape
+    sites = np.asarray(work.sites)
+
+    issues, warnings = [], []
+
+    # Hard infeasibilities: the initial SOE is also the required final SOE
+    bad_cev = np.flatnonzero((soe_ini < soe_min) | (soe_ini > soe_max))
+    if bad_cev.size:
+        issues.append(f"SOE_ini outside [SOE_min, SOE_max] for CEVs {(bad_cev + 1).tolist()}")
+    if not params['MCS_min'] <= params['MCS_ini'] <= params['MCS_max']:
+        issues.append("MCS_ini outside [MCS_min, MCS_max]")
+
+    # Chargeable periods: inside the operating window and not working
+    start, end = mcs_operating_window(delta_T, num_periods)
+    in_window = np.zeros(num_periods, dtype=bool)
+    in_window[start - 1:end] = True
+    if start > end:
+        warnings.append(f"MCS operating window (6am-9pm) does not overlap the {num_periods}-period "
+                        f"horizon, no CEV can be recharged")
+    working = R > 0
+    chargeable = ~working & in_window
+
+    # SOE transitions only exist for t = 1..T-1 (work in the last period never drains a battery)
+    work_energy = R[:, :-1] * delta_T
+    charge_energy = chargeable[:, :-1] * (num_mcs * plug_power * eta * delta_T)
+
+    # Optimistic per-CEV fluid relaxation, vectorized across CEVs:
+    # work as much as the battery allows, recharge as early as possible
+    soe = soe_ini.astype(float).copy()
+    missed = np.zeros(num_cevs)
+    for t in range(num_periods - 1):
+        done = np.minimum(work_energy[:, t], soe - soe_min)
+        missed += work_energy[:, t] - done
+        soe = np.minimum(soe_max, soe - done + charge_energy[:, t])
+    # Whatever cannot be recharged before the horizon ends must be given up as missed work
+    missed += np.maximum(0.0, soe_ini - soe)
+
+    # Cumulative bound: total work in [1, t] cannot exceed the battery window plus all
+    # charge available before t, which catches long unbroken shifts without simulation
+    cum_gap = np.cumsum(work_energy - charge_energy, axis=1)
+    peak_shortfall = np.maximum(0.0, cum_gap.max(axis=1, initial=0.0) - (soe_ini - soe_min))
+    missed = np.maximum(missed, peak_shortfall)
+
+    total_work = work_energy.sum(axis=1)
+    served = total_work - missed
+    plug_periods_needed = np.ceil(served / (plug_power * eta * delta_T) - 1e-9)
+
+    per_cev = [
+        {
+            'ev': e + 1,
+            'site': int(sites[e]),
+            'work_energy_kWh': round(float(total_work[e]), 4),
+            'chargeable_periods': int(chargeable[e, :-1].sum()),
+            'estimated_missed_work_kWh': round(float(missed[e]), 4),
+            'plug_periods_needed': int(plug_periods_needed[e])
+        }
+        for e in range(num_cevs)
+    ]
+
+    # Per-site plug-time bound: plug-periods needed vs. plug slots while CEVs can charge
+    per_site = []
+    for site in np.unique(sites):
+        members = sites == site
+        chargeable_cevs = chargeable[members, :-1].sum(axis=0)
+        available = np.minimum(chargeable_cevs, plugs * num_mcs).sum()
+        needed = plug_periods_needed[members].sum()
+        per_site.append({
+            'site': int(site),
+            'cevs': int(members.sum()),
+            'plug_periods_needed': int(needed),
+            'plug_periods_available': int(available),
+            'max_simultaneous_chargeable': int(chargeable_cevs.max(initial=0))
+        })
+        if needed > available:
+            warnings.append(f"Site {site}: {int(needed)} plug-periods needed but only "
+                            f"{int(available)} available with C_MCS_plug={plugs}")
+
+    # Fleet-level MCS time budget: discharging at sites plus recharging at the grid
+    delivered = served.sum() / eta                      # sum of P_MCS_CEV * delta_T
+    recharge = delivered / eta                          # MCS energy drawn, restored by final SOE
+    discharge_periods = delivered / (params['DCH_MCS'] * delta_T)
+    grid_periods = recharge / (params['CH_MCS'] * eta * delta_T)
+    window_periods = (end - start + 1) * num_mcs
+    if discharge_periods + grid_periods > window_periods:
+        warnings.append(f"MCS fleet needs ~{discharge_periods + grid_periods:.1f} operating periods "
+                        f"but the window only has {window_periods}")
+
+    total_missed = float(missed.sum())
+    return {
+        'feasible': not issues,
+        'issues': issues,
+        'warnings': warnings,
+        'operating_window': [start, end],
+        'per_cev': per_cev,
+        'per_site': per_site,
+        'totals': {
+            'work_energy_kWh': round(float(total_work.sum()), 4),
+            'estimated_missed_work_kWh': round(total_missed, 4),
+            'estimated_missed_work_penalty': round(total_missed * params['rho_miss'], 4),
+            'mcs_operating_periods_needed': round(float(discharge_periods + grid_periods), 2),
+            'mcs_operating_periods_available': int(window_periods)
+        }
+    }
+
+
+def main():
+    """Pre-screen a dataset directory from the command line"""
+    if len(sys.argv) < 2:
+        print("Usage: python feasibility_prescreen.py <csv_files_dir> [--json]")
+        sys.exit(2)
+
+    data_dir = sys.argv[1]
+    result = prescreen(*load_prescreen_inputs(data_dir))
+
+    if '--json' in sys.argv[2:]:
+        print(json.dumps(result))
+    else:
+        totals = result['totals']
+        print(f"Feasible: {result['feasible']}")
+        for issue in result['issues']:
+            print(f"   ❌ {issue}")
+        for warning in result['warnings']:
+            print(f"   ⚠️  {warning}")
+        print(f"Work energy: {totals['work_energy_kWh']:.2f} kWh")
+        print(f"Estimated unavoidable missed work: {totals['estimated_missed_work_kWh']:.2f} kWh "
+              f"(penalty {totals['estimated_missed_work_penalty']:.2f})")
+        for cev in result['per_cev']:
+            if cev['estimated_missed_work_kWh'] > 0:
+                print(f"   CEV {cev['ev']} at site {cev['site']}: {cev['estimated_missed_work_kWh']:.2f} kWh missed")
+
+    sys.exit(0 if result['feasible'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Chunked Time-Series Reader
+Streams time_data.csv (lambda_buy, lambda_CO2, intensity_tons_emissions) in fixed-size
+day or window chunks so multi-week and multi-month CAISO feeds can be processed in
+constant memory, plus running accumulators for the savings and baseline calculators.
+"""
+
+import heapq
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+SERIES_COLUMNS = ['lambda_buy', 'lambda_CO2', 'intensity_tons_emissions']
+
+
+def periods_per_day(delta_T):
+    """Number of periods in 24 hours for a time step of delta_T hours"""
+    return int(round(24.0 / delta_T))
+
+
+def iter_time_chunks(path, chunk_periods=96):
+    """
+    Yield consecutive DataFrame chunks of time_data.csv with chunk_periods rows each.
+
+    Every chunk has a global 1-based 'period' column plus whichever of
+    lambda_buy / lambda_CO2 / intensity_tons_emissions are present.
+    """
+    offset = 0
+    for chunk in pd.read_csv(path, chunksize=chunk_periods):
+        columns = [c for c in SERIES_COLUMNS if c in chunk.columns]
+        out = chunk[columns].reset_index(drop=True)
+        out.insert(0, 'period', range(offset + 1, offset + len(out) + 1))
+        offset += len(out)
+        yield out
+
+
+def carbon_column(chunk):
+    # Same preference as DataLoader.load_all_data: real CAISO intensity when available
+    return 'intensity_tons_emissions' if 'intensity_tons_emissions' in chunk.columns else 'lambda_CO2'
+
+
+class RunningStats:
+    """Count, sum, min/max, mean and variance of a series streamed chunk by chunk,
+    plus the k lowest and k highest (value, period) pairs"""
+
+    def __init__(self, k=0):
+        self.k = k
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._lowest = []   # max-heap of (-value, -period)
+        self._highest = []  # min-heap of (value, -period)
+
+    def update(self, values, periods):
+        values = np.asarray(values, dtype=float)
+        periods = np.asarray(periods)
+        n = len(values)
+        if n == 0:
+            return
+        # Merge chunk moments into the running ones (Chan et al. parallel variance)
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        delta = chunk_mean - self._mean
+        total = self.count + n
+        self._mean += delta * n / total
+        self._m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.total += values.sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        if self.k:
+            # Only the chunk's own k extremes can enter the running top-k; ties keep the earliest period
+            order = np.lexsort((periods, values))
+            for i in order[:self.k]:
+                self._push(self._lowest, (-values[i], -int(periods[i])))
+            for i in np.lexsort((periods, -values))[:self.k]:
+                self._push(self._highest, (values[i], -int(periods[i])))
+
+    def _push(self, heap, item):
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+
+    @property
+    def mean(self):
+        return self._mean if self.count else math.nan
+
+    @property
+    def std(self):
+        # Sample standard deviation, matching pandas Series.std()
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    def lowest(self):
+        """k lowest (period, value) pairs, lowest value first"""
+        return sorted(((-p, -float(v)) for v, p in self._lowest), key=lambda x: (x[1], x[0]))
+
+    def highest(self):
+        """k highest (period, value) pairs, highest value first"""
+        return sorted(((-p, float(v)) for v, p in self._highest), key=lambda x: (-x[1], x[0]))
+
+
+class CostAccumulator:
+    """Running energy, electricity cost and CO2 totals for a per-period energy schedule"""
+
+    def __init__(self, energy_by_period, co2_column='lambda_CO2'):
+        self.energy_by_period = energy_by_period
+        self.co2_column = co2_column
+        self.total_energy = 0.0
+        self.electricity_cost = 0.0
+        self.co2_cost = 0.0
+
+    def update(self, chunk):
+        energy = chunk['period'].map(self.energy_by_period).fillna(0.0)
+        self.total_energy += energy.sum()
+        self.electricity_cost += (energy * chunk['lambda_buy']).sum()
+        self.co2_cost += (energy * chunk[self.co2_column]).sum()
+
+
+def main():
+    """Print streamed per-chunk and overall statistics for a time_data.csv file"""
+    if len(sys.argv) < 2:
+        print("Usage: python time_series.py <time_data.csv> [chunk_periods]")
+        sys.exit(2)
+
+    path = sys.argv[1]
+    chunk_periods = int(sys.argv[2]) if len(sys.argv) > 2 else 96
+    price_stats, carbon_stats = RunningStats(), RunningStats()
+
+    for index, chunk in enumerate(iter_time_chunks(path, chunk_periods), start=1):
+        carbon = carbon_column(chunk)
+        price_stats.update(chunk['lambda_buy'], chunk['period'])
+        carbon_stats.update(chunk[carbon], chunk['period'])
+        print(f"Chunk {index}: periods {chunk['period'].iloc[0]}-{chunk['period'].iloc[-1]}, "
+              f"mean price {chunk['lambda_buy'].mean():.4f}, mean {carbon} {chunk[carbon].mean():.4f}")
+
+    print(f"\nPeriods: {price_stats.count}")
+    print(f"Electricity price: min {price_stats.min:.4f}, max {price_stats.max:.4f}, mean {price_stats.mean:.4f}")
+    print(f"Carbon intensity: min {carbon_stats.min:.4f}, max {carbon_stats.max:.4f}, mean {carbon_stats.mean:.4f}")
+
+
+if __name__ == "__main__":
+    main()
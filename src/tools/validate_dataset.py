@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Dataset Validator
+Checks a csv_files/ directory against the same invariants as DataLoader.validate_data
+before any Julia process is started, and reports every violation instead of the first one.
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from work_tensor import has_compact_work, load_compact_work
+
+REQUIRED_FILES = [
+    'parameters.csv', 'ev_data.csv', 'place.csv', 'distance.csv',
+    'travel_time.csv', 'time_data.csv', 'work.csv'
+]
+
+REQUIRED_PARAMETERS = [
+    'eta_ch_dch', 'MCS_max', 'MCS_min', 'MCS_ini', 'CH_MCS', 'DCH_MCS',
+    'DCH_MCS_plug', 'C_MCS_plug', 'k_trv', 'delta_T', 'rho_miss'
+]
+
+EV_COLUMNS = ['SOE_min', 'SOE_max', 'SOE_ini', 'ch_rate']
+
+
+class ValidationReport:
+    """Collects violations grouped by file so all of them can be reported at once"""
+
+    def __init__(self):
+        self.violations = []
+
+    def add(self, file, check, message, count=None):
+        violation = {'file': file, 'check': check, 'message': message}
+        if count is not None:
+            violation['count'] = int(count)
+        self.violations.append(violation)
+
+    def require(self, condition, file, check, message):
+        """Record a violation when a boolean array (or scalar) is not all True"""
+        failed = np.size(condition) - np.count_nonzero(condition)
+        if failed:
+            self.add(file, check, message, failed if np.ndim(condition) else None)
+        return failed == 0
+
+    @property
+    def ok(self):
+        return not self.violations
+
+    def to_dict(self):
+        return {'valid': self.ok, 'violations': self.violations}
+
+
+def read_csv_rows(path):
+    """Read a CSV file into (header, rows) using the stdlib reader"""
+    with open(path, newline='') as f:
+        rows = [row for row in csv.reader(f) if row]
+    if not rows:
+        return [], []
+    return rows[0], rows[1:]
+
+
+def to_float_array(rows, file, check, report, width=0):
+    """Convert a list of string rows to a float matrix, flagging non-numeric cells.
+    Always 2-D: an empty file gives a (0, width) matrix"""
+    if not rows:
+        return np.zeros((0, width))
+    try:
+        return np.array(rows, dtype=float).reshape(len(rows), -1)
+    except ValueError:
+        # Fall back to cell-by-cell parsing; ragged rows are padded with NaN
+        width = max((len(row) for row in rows), default=0)
+        cleaned = np.full((len(rows), width), np.nan)
+        for i, row in enumerate(rows):
+            cleaned[i, :len(row)] = [_parse_float(v) for v in row]
+        report.add(file, check, 'Non-numeric or missing values found', np.isnan(cleaned).sum())
+        return np.nan_to_num(cleaned)
+
+
+def _parse_float(value):
+    # Mirrors DataLoader.safe_convert: trailing commas are tolerated
+    try:
+        return float(re.sub(r',+$', '', str(value).strip()))
+    except ValueError:
+        return np.nan
+
+
+def _index_from_label(value):
+    # Mirrors DataLoader.get_numeric_value: "n3" / "i3" / "3.0" -> 3
+    try:
+        return int(float(value))
+    except ValueError:
+        match = re.search(r'\d+', str(value))
+        return int(match.group()) if match else 1
+
+
+def load_parameters(data_dir, report):
+    header, rows = read_csv_rows(os.path.join(data_dir, 'parameters.csv'))
+    params = {}
+    if 'Parameter' not in header or 'Value' not in header:
+        report.add('parameters.csv', 'columns', "Missing 'Parameter' or 'Value' column")
+        return params
+    key_idx, value_idx = header.index('Parameter'), header.index('Value')
+    for row in rows:
+        if len(row) > max(key_idx, value_idx):
+            params[row[key_idx]] = _parse_float(row[value_idx])
+
+    missing = [p for p in REQUIRED_PARAMETERS if p not in params]
+    if missing:
+        report.add('parameters.csv', 'required', f"Missing parameters: {', '.join(missing)}", len(missing))
+    non_numeric = [p for p in REQUIRED_PARAMETERS if p in params and np.isnan(params[p])]
+    if non_numeric:
+        report.add('parameters.csv', 'numeric', f"Non-numeric parameters: {', '.join(non_numeric)}", len(non_numeric))
+    return params
+
+
+def load_matrix(data_dir, filename, report):
+    """Load a square node matrix (first column holds row labels)"""
+    _, rows = read_csv_rows(os.path.join(data_dir, filename))
+    return to_float_array([row[1:] for row in rows], filename, 'numeric', report)
+
+
+def load_time_series(data_dir, report):
+    header, rows = read_csv_rows(os.path.join(data_dir, 'time_data.csv'))
+    # Same column preference as DataLoader.load_all_data
+    co2_col = 'intensity_tons_emissions' if 'intensity_tons_emissions' in header else 'lambda_CO2'
+    columns = {}
+    for name in (co2_col, 'lambda_buy'):
+        if name not in header:
+            report.add('time_data.csv', 'columns', f"Missing '{name}' column")
+            columns[name] = np.zeros(len(rows))
+            continue
+        idx = header.index(name)
+        columns[name] = to_float_array([[row[idx]] for row in rows], 'time_data.csv', 'numeric', report).ravel()
+    return len(rows), columns[co2_col], columns['lambda_buy']
+
+
+def load_work(data_dir, report):
+    """Build the dense R_work tensor exactly like DataLoader.load_all_data"""
+    header, rows = read_csv_rows(os.path.join(data_dir, 'work.csv'))
+    if header[:2] != ['Location', 'EV']:
+        report.add('work.csv', 'columns', "First two columns must be 'Location' and 'EV'")
+        return np.zeros((0, 0, 0))
+    rows = [row for row in rows if len(row) > 2 and not row[2].startswith('t')]
+    n_periods = len(header) - 2
+    if not rows:
+        return np.zeros((0, 0, n_periods))
+
+    loc_idx = np.array([_index_from_label(row[0]) for row in rows])
+    ev_idx = np.array([_index_from_label(row[1]) for row in rows])
+    values = to_float_array([row[2:] for row in rows], 'work.csv', 'numeric', report)
+
+    R_work = np.zeros((loc_idx.max(), ev_idx.max(), n_periods))
+    R_work[loc_idx - 1, ev_idx - 1, :values.shape[1]] = values
+    return R_work
+
+
+def validate_dataset(data_dir):
+    """Validate all CSV files in data_dir and return a ValidationReport"""
+    report = ValidationReport()
+
+    # The solver always reads work.csv, so the compact files are only checked in its absence
+    compact = has_compact_work(data_dir) and not os.path.exists(os.path.join(data_dir, 'work.csv'))
+    required = [f for f in REQUIRED_FILES if not (compact and f == 'work.csv')]
+    missing = [f for f in required if not os.path.exists(os.path.join(data_dir, f))]
+    for f in missing:
+        report.add(f, 'exists', f"Required file '{f}' not found")
+    if missing:
+        return report
+
+    params = load_parameters(data_dir, report)
+
+    # EV data
+    ev_header, ev_rows = read_csv_rows(os.path.join(data_dir, 'ev_data.csv'))
+    missing_ev_cols = [c for c in EV_COLUMNS if c not in ev_header]
+    if missing_ev_cols:
+        report.add('ev_data.csv', 'columns', f"Missing columns: {', '.join(missing_ev_cols)}", len(missing_ev_cols))
+        ev = np.zeros((len(ev_rows), len(EV_COLUMNS)))
+    else:
+        cols = [ev_header.index(c) for c in EV_COLUMNS]
+        # Short (ragged) rows get empty cells, which are reported as missing values
+        ev = to_float_array([[row[c] if c < len(row) else '' for c in cols] for row in ev_rows],
+                            'ev_data.csv', 'numeric', report, width=len(EV_COLUMNS))
+    n_ev = ev.shape[0]
+    report.require(n_ev > 0, 'ev_data.csv', 'empty', 'No CEVs defined')
+    soe_min, soe_max, soe_ini = ev[:, 0], ev[:, 1], ev[:, 2]
+
+    # Place / assignment matrix
+    _, place_rows = read_csv_rows(os.path.join(data_dir, 'place.csv'))
+    A = to_float_array([row[1:] for row in place_rows], 'place.csv', 'numeric', report, width=n_ev)
+    n_nodes = A.shape[0]
+    report.require(n_nodes > 0, 'place.csv', 'empty', 'No locations defined')
+
+    D = load_matrix(data_dir, 'distance.csv', report)
+    tau_trv = load_matrix(data_dir, 'travel_time.csv', report)
+    n_periods, lambda_CO2, lambda_buy = load_time_series(data_dir, report)
+    if compact:
+        work = load_compact_work(data_dir)
+        R_work = work.work
+        work_shape, expected_shape = work.work.shape, (n_ev, n_periods)
+    else:
+        R_work = load_work(data_dir, report)
+        work_shape, expected_shape = R_work.shape, (n_nodes, n_ev, n_periods)
+
+    # Dimensions
+    report.require(D.shape == (n_nodes, n_nodes), 'distance.csv', 'dimensions',
+                   f"Distance matrix dimensions mismatch: {D.shape} vs ({n_nodes}, {n_nodes})")
+    report.require(tau_trv.shape == (n_nodes, n_nodes), 'travel_time.csv', 'dimensions',
+                   f"Travel time matrix dimensions mismatch: {tau_trv.shape} vs ({n_nodes}, {n_nodes})")
+    report.require(work_shape == expected_shape, 'work.csv', 'dimensions',
+                   f"Work requirements dimensions mismatch: {work_shape} vs {expected_shape}")
+    report.require(A.shape == (n_nodes, n_ev), 'place.csv', 'dimensions',
+                   f"Location matrix dimensions mismatch: {A.shape} vs ({n_nodes}, {n_ev})")
+
+    # Scalar parameters
+    get = lambda name: params.get(name, np.nan)
+    report.require(0 < get('eta_ch_dch') <= 1, 'parameters.csv', 'eta_ch_dch',
+                   'Efficiency must be between 0 and 1')
+    report.require(get('MCS_min') <= get('MCS_ini') <= get('MCS_max'), 'parameters.csv', 'MCS_limits',
+                   'Invalid MCS energy limits (MCS_min <= MCS_ini <= MCS_max)')
+    report.require(get('rho_miss') >= 0, 'parameters.csv', 'rho_miss',
+                   'Negative missed work penalty not allowed')
+    report.require(get('delta_T') > 0, 'parameters.csv', 'delta_T',
+                   'Non-positive time interval not allowed')
+    report.require(get('C_MCS_plug') >= 1, 'parameters.csv', 'C_MCS_plug',
+                   'At least one plug per MCS is required')
+
+    # Per-element checks
+    report.require((soe_min <= soe_ini) & (soe_ini <= soe_max), 'ev_data.csv', 'SOE_limits',
+                   'Invalid CEV energy limits (SOE_min <= SOE_ini <= SOE_max)')
+    report.require(D >= 0, 'distance.csv', 'non_negative', 'Negative distances not allowed')
+    report.require(tau_trv >= 0, 'travel_time.csv', 'non_negative', 'Negative travel times not allowed')
+    report.require(R_work >= 0, 'work.csv', 'non_negative', 'Negative work requirements not allowed')
+    report.require(A >= 0, 'place.csv', 'non_negative', 'Negative location values not allowed')
+    report.require(lambda_CO2 >= 0, 'time_data.csv', 'non_negative', 'Negative CO2 prices not allowed')
+    report.require(lambda_buy >= 0, 'time_data.csv', 'non_negative', 'Negative electricity prices not allowed')
+
+    # Matrix structure
+    for name, M in (('distance.csv', D), ('travel_time.csv', tau_trv)):
+        if M.ndim == 2 and M.shape[0] == M.shape[1]:
+            report.require(np.diag(M) == 0, name, 'diagonal', 'Matrix diagonal must be zero')
+            report.require(M == M.T, name, 'symmetry', 'Matrix must be symmetric')
+
+    # One-hot CEV assignments
+    if A.size:
+        report.require(np.isin(A, (0, 1)), 'place.csv', 'binary', 'Assignment values must be 0 or 1')
+        report.require(A.sum(axis=0) == 1, 'place.csv', 'one_hot',
+                       'Each CEV must be assigned to exactly one location')
+        report.require(A[0, :] == 0, 'place.csv', 'grid_node', 'No CEVs should be assigned to grid node')
+        if compact and work.sites.shape == (A.shape[1],):
+            report.require(work.sites == np.argmax(A, axis=0) + 1, 'work_sites.npy', 'assignment',
+                           'Compact work site index must match place.csv')
+
+    return report
+
+
+def main():
+    """Validate a dataset directory from the command line"""
+    if len(sys.argv) < 2:
+        print("Usage: python validate_dataset.py <csv_files_dir> [--json]")
+        sys.exit(2)
+
+    data_dir = sys.argv[1]
+    try:
+        report = validate_dataset(data_dir)
+    except Exception as e:
+        # A file the checks cannot even read (bad encoding, unexpected layout) fails validation
+        report = ValidationReport()
+        report.add('', 'readable', f"Dataset could not be read: {e}")
+
+    if '--json' in sys.argv[2:]:
+        print(json.dumps(report.to_dict()))
+    elif report.ok:
+        print(f"✅ Dataset in {data_dir} passed all checks")
+    else:
+        print(f"❌ Dataset in {data_dir} has {len(report.violations)} violation(s):")
+        for v in report.violations:
+            count = f" ({v['count']} entries)" if 'count' in v else ''
+            print(f"   [{v['file']}] {v['check']}: {v['message']}{count}")
+
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Compact Work Tensor
+Stores R_work as one site index per CEV plus a (CEV x period) float32 work matrix.
+Every CEV works at exactly one site (one-hot place.csv), so the dense
+(locations x EVs x periods) tensor built by DataLoader is almost entirely zeros.
+
+Files written next to work.csv:
+    work_sites.npy    int32  (E,)    1-based site index per CEV (same numbering as work.csv)
+    work_matrix.npy   float32 (E, T) work requirement in kW, memory-mapped on load
+    work_periods.txt  one time-column label per line
+"""
+
+import csv
+import os
+import re
+import sys
+
+import numpy as np
+
+SITES_FILE = 'work_sites.npy'
+MATRIX_FILE = 'work_matrix.npy'
+PERIODS_FILE = 'work_periods.txt'
+
+
+def _index_from_label(value):
+    # Same rule as DataLoader.get_numeric_value: "i3" / "e3" / "3.0" -> 3
+    try:
+        return int(float(value))
+    except ValueError:
+        match = re.search(r'\d+', str(value))
+        return int(match.group()) if match else 1
+
+
+class CompactWork:
+    """Per-CEV site index plus (CEV x period) work matrix"""
+
+    def __init__(self, sites, work, periods):
+        self.sites = np.asarray(sites, dtype=np.int32)
+        self.work = work
+        self.periods = list(periods)
+
+    @property
+    def num_cevs(self):
+        return self.work.shape[0]
+
+    @property
+    def num_periods(self):
+        return self.work.shape[1]
+
+    def to_dense(self, num_nodes=None):
+        """Rebuild the dense R_work[i, e, t] tensor (only for small instances)"""
+        num_nodes = num_nodes or int(self.sites.max())
+        R_work = np.zeros((num_nodes, self.num_cevs, self.num_periods))
+        R_work[self.sites - 1, np.arange(self.num_cevs), :] = self.work
+        return R_work
+
+    def to_work_frame(self):
+        """Return a work.csv-shaped DataFrame with one row per CEV (its assigned site)"""
+        import pandas as pd
+        frame = pd.DataFrame(np.asarray(self.work), columns=self.periods)
+        frame.insert(0, 'EV', np.arange(1, self.num_cevs + 1))
+        frame.insert(0, 'Location', self.sites)
+        return frame
+
+    def save(self, directory):
+        """Write the compact files; the work matrix is written through a memmap"""
+        np.save(os.path.join(directory, SITES_FILE), self.sites)
+        out = np.lib.format.open_memmap(os.path.join(directory, MATRIX_FILE), mode='w+',
+                                        dtype=np.float32, shape=self.work.shape)
+        out[:] = self.work
+        out.flush()
+        with open(os.path.join(directory, PERIODS_FILE), 'w') as f:
+            f.write('\n'.join(self.periods) + '\n')
+
+    def write_work_csv(self, path, num_nodes=None):
+        """Expand back to the dense work.csv layout expected by DataLoader.load_all_data"""
+        num_nodes = num_nodes or int(self.sites.max())
+        zeros = ['0'] * self.num_periods
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Location', 'EV'] + self.periods)
+            for i in range(1, num_nodes + 1):
+                for e in range(self.num_cevs):
+                    values = [f'{v:g}' for v in self.work[e]] if self.sites[e] == i else zeros
+                    writer.writerow([i, e + 1] + values)
+
+
+def has_compact_work(directory):
+    return os.path.exists(os.path.join(directory, MATRIX_FILE))
+
+
+def load_compact_work(directory, mmap_mode='r'):
+    """Load compact work files; the matrix stays on disk until it is accessed"""
+    sites = np.load(os.path.join(directory, SITES_FILE))
+    work = np.load(os.path.join(directory, MATRIX_FILE), mmap_mode=mmap_mode)
+    with open(os.path.join(directory, PERIODS_FILE)) as f:
+        periods = [line.rstrip('\n') for line in f if line.strip()]
+    return CompactWork(sites, work, periods)
+
+
+def read_place_matrix(path):
+    """Assignment matrix A[i, e] from place.csv"""
+    with open(path, newline='') as f:
+        rows = [row[1:] for row in list(csv.reader(f))[1:] if row]
+    return np.array(rows, dtype=float)
+
+
+def sites_from_place_csv(path):
+    """Site index per CEV from the one-hot place.csv (1-based node numbering)"""
+    A = read_place_matrix(path)
+    return (np.argmax(A, axis=0) + 1).astype(np.int32)
+
+
+def _fill_work_matrix(reader, sites, work):
+    """Copy each CEV's row at its assigned site from a work.csv reader into work"""
+    num_cevs = len(sites)
+    for row in reader:
+        if len(row) < 3 or row[2].startswith('t'):
+            continue
+        i, e = _index_from_label(row[0]), _index_from_label(row[1])
+        # DataLoader multiplies R_work by A[i,e], so only the assigned site matters
+        if e <= num_cevs and sites[e - 1] == i:
+            work[e - 1] = np.asarray(row[2:], dtype=np.float32)
+
+
+def read_work_csv(data_dir):
+    """Parse work.csv into an in-memory CompactWork"""
+    sites = sites_from_place_csv(os.path.join(data_dir, 'place.csv'))
+    with open(os.path.join(data_dir, 'work.csv'), newline='') as f:
+        reader = csv.reader(f)
+        periods = next(reader)[2:]
+        work = np.zeros((len(sites), len(periods)), dtype=np.float32)
+        _fill_work_matrix(reader, sites, work)
+    return CompactWork(sites, work, periods)
+
+
+def load_work_matrix(data_dir):
+    """Compact files when present, otherwise work.csv"""
+    return load_compact_work(data_dir) if has_compact_work(data_dir) else read_work_csv(data_dir)
+
+
+def work_runs(work):
+    """
+    Run-length segmentation of every row of a (CEV x period) work matrix at once.
+
+    Returns (rows, starts, ends) int arrays with one entry per shift, i.e. per maximal run
+    of periods with work > 0. Periods are 0-based and ends inclusive; entries are ordered
+    by row, then start, so the gaps of a row lie between its consecutive entries.
+    """
+    active = np.asarray(work) > 0
+    # Zero padding on both sides turns every run into exactly one +1 and one -1 edge
+    padded = np.zeros((active.shape[0], active.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = active
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends - 1
+
+
+def run_sums(work, rows, starts, ends):
+    """Sum of each row's work over [start, end] for the runs from work_runs"""
+    totals = np.zeros((work.shape[0], work.shape[1] + 1))
+    np.cumsum(work, axis=1, out=totals[:, 1:])
+    return totals[rows, ends + 1] - totals[rows, starts]
+
+
+def convert_work_csv(data_dir, out_dir=None):
+    """Stream work.csv into compact files without building the dense tensor"""
+    out_dir = out_dir or data_dir
+    sites = sites_from_place_csv(os.path.join(data_dir, 'place.csv'))
+
+    with open(os.path.join(data_dir, 'work.csv'), newline='') as f:
+        reader = csv.reader(f)
+        periods = next(reader)[2:]
+        work = np.lib.format.open_memmap(os.path.join(out_dir, MATRIX_FILE), mode='w+',
+                                         dtype=np.float32, shape=(len(sites), len(periods)))
+        _fill_work_matrix(reader, sites, work)
+        work.flush()
+
+    np.save(os.path.join(out_dir, SITES_FILE), sites)
+    with open(os.path.join(out_dir, PERIODS_FILE), 'w') as f:
+        f.write('\n'.join(periods) + '\n')
+    return load_compact_work(out_dir)
+
+
+def main():
+    """Convert between work.csv and the compact work tensor"""
+    if len(sys.argv) < 2:
+        print("Usage: python work_tensor.py <csv_files_dir> [--to-csv]")
+        sys.exit(2)
+
+    data_dir = sys.argv[1]
+    if '--to-csv' in sys.argv[2:]:
+        compact = load_compact_work(data_dir)
+        num_nodes = read_place_matrix(os.path.join(data_dir, 'place.csv')).shape[0]
+        compact.write_work_csv(os.path.join(data_dir, 'work.csv'), num_nodes)
+        print(f"Expanded {compact.num_cevs} CEVs x {compact.num_periods} periods to {data_dir}/work.csv")
+    else:
+        compact = convert_work_csv(data_dir)
+        print(f"Converted work.csv to {MATRIX_FILE} ({compact.num_cevs} CEVs x {compact.num_periods} periods)")
+
+
+if __name__ == "__main__":
+    main()